@@ -1,19 +1,42 @@
 #JSON 출력형 - 파싱수정 및 any~등 디테일 보완
+import asyncio
 import json
 
+import torch
+
+from ai.orchestrator.executor import run_cpu, run_llm
+from infra.usage import record_tokens
+
 class EvidenceGeneration:
-    def __init__(self, model, tokenizer, final_profiles=None, products=None):
+    def __init__(self, model, tokenizer, final_profiles=None, products=None, generation_kwargs=None, draft_model=None):
         self.llm = model # For LangChain compatibility if needed, though not used in generate_prompt current logic
         self.model = model
         self.tokenizer = tokenizer
         # 데이터를 클래스 속성으로 저장
         self.final_profiles = final_profiles if final_profiles is not None else {}
         self.products = products if products is not None else {}
+        # 에이전트별 temperature 등은 모델을 따로 로드하지 않고 generate 파라미터로만 적용
+        self.generation_kwargs = generation_kwargs or {}
+        # (opt-in) speculative decoding 용 소형 draft 모델 (같은 토크나이저 계열, 예: Qwen2.5-0.5B)
+        self.draft_model = draft_model
+
+    @classmethod
+    def from_agent_model(cls, agent_model, final_profiles=None, products=None):
+        """ModelLoader.get_agent_model() 핸들(공유 모델 + 에이전트별 생성 파라미터)로 생성"""
+        return cls(
+            agent_model.model,
+            agent_model.tokenizer,
+            final_profiles=final_profiles,
+            products=products,
+            generation_kwargs=agent_model.generation_kwargs(),
+            draft_model=agent_model.draft_model,
+        )
 
 # 1. 당뇨, 고혈압, 신부전 분석
-    def evaluate_threshold(self, state: dict) -> dict:
+    def threshold_update(self, state: dict) -> dict:
         """
-        영양성분 임계값 초과 여부를 분석하여 state(overallState)를 업데이트하여 반환합니다.
+        영양성분 임계값 초과 여부를 분석하여 변경된 키(any_exceed, exceeded_nutrients)만 반환합니다.
+        (state 는 읽기만 함)
         """
         user_id = state.get("user_id")
         product_id = state.get("product_id")
@@ -22,9 +45,8 @@ class EvidenceGeneration:
         profile = state.get("final_profile", self.final_profiles.get(str(user_id), {}))
         product = self.products.get(str(product_id), {})
 
-        # 결과 저장소 초기화 (기존 state 보존)
-        state["any_exceed"] = False
-        state["exceeded_nutrients"] = []
+        # 결과 저장소 초기화 (state 는 건드리지 않음)
+        update = {"any_exceed": False, "exceeded_nutrients": []}
 
         # 2. 분석 제외 키 설정
         exclude_keys = ['user_id', 'restricted_ingredients']
@@ -50,8 +72,8 @@ class EvidenceGeneration:
                     #print(f"  지방 비율 계산: {fat_calories}kcal / {total_calories}kcal = {actual_ratio:.3f}")
                     if actual_ratio > limit:
                         #print(f"  ❌ 비율 초과: {actual_ratio:.3f} > {limit}")
-                        state["any_exceed"] = True
-                        state["exceeded_nutrients"].append(nutrient)
+                        update["any_exceed"] = True
+                        update["exceeded_nutrients"].append(nutrient)
                     else:
                         pass
                         #print(f"  ✅ 비율 적정")
@@ -59,32 +81,41 @@ class EvidenceGeneration:
             else:
                 if actual > limit:
                     #print(f"  ❌ 기준 초과: {actual} > {limit}")
-                    state["any_exceed"] = True
-                    state["exceeded_nutrients"].append(nutrient)
+                    update["any_exceed"] = True
+                    update["exceeded_nutrients"].append(nutrient)
                 else:
                     pass
                     #print(f"  ✅ 기준 이하")
         
         #print(f"\n=== 최종 결과 ===")
-        #print(f"any_exceed: {state['any_exceed']}")
-        #print(f"exceeded_nutrients: {state['exceeded_nutrients']}")
+        #print(f"any_exceed: {update['any_exceed']}")
+        #print(f"exceeded_nutrients: {update['exceeded_nutrients']}")
         #print(f"==================\n")
 
+        return update
+
+    def evaluate_threshold(self, state: dict) -> dict:
+        """
+        영양성분 임계값 초과 여부를 분석하여 state(overallState)를 업데이트하여 반환합니다.
+        """
+        state.update(self.threshold_update(state))
         return state
 
 
 # 2. 알러지 분석
 
 
-    def generate_allergy_prompt(self, state: dict, tone_key=None, max_new_tokens=512) -> dict:
+    def build_allergy_messages(self, state: dict):
         """
-        정의된 모듈의 Key 값을 받아 최적화된 시스템 프롬프트를 생성하고 state를 업데이트합니다.
+        알러지 분석용 chat messages(system + user)를 구성합니다.
+        상품/프로필 정보가 없으면 None 을 반환합니다.
         """
         user_id = state.get("user_id")
         product_id = state.get("product_id")
 
         # 2.1. 클래스 외부 변수 데이터 가져오기 (데이터가 없을 경우를 대비해 get 사용)
-        p = self.products.get(str(product_id), {})
+        # API 서버에서는 상품 상세가 state["product_data"] 로 들어옴
+        p = self.products.get(str(product_id)) or state.get("product_data") or {}
         f = state.get("final_profile", self.final_profiles.get(str(user_id), {}))
         # sub_rules = self.allergy_substitution_rules  # (필요시 클래스 속성으로 접근)
         
@@ -94,9 +125,7 @@ class EvidenceGeneration:
         # 2.2. 예외 처리: 데이터가 없는 경우 기존 state 반환
         if not p or not f:
             print(f"Error: 정보를 찾을 수 없습니다. (Product: {product_id}, Profile: {user_id})")
-            state["any_allergen"] = False
-            state["substitute"] = []
-            return state
+            return None
 
         # 2.3. 시스템 프롬프트
         system_msg = f"""당신은 식품 성분 및 화학 분석 전문가입니다.
@@ -170,13 +199,40 @@ class EvidenceGeneration:
 
 
 
+        return messages
+
+    def _generation_kwargs(self) -> dict:
+        # 알러지 JSON 추출은 낮은 temperature 고정 -> 에이전트 설정(temp 등)은 여기서 정하지 않은 키만 채움
+        gen_kwargs = {
+            **self.generation_kwargs,
+            "temperature": 0.1,
+            "top_p": 0.9,
+            "do_sample": True,
+            "pad_token_id": self.tokenizer.pad_token_id,
+            "eos_token_id": self.tokenizer.eos_token_id,
+        }
+
+        # speculative decoding: draft 모델이 제안 -> 본 모델이 검증 (greedy 에서 출력 동일)
+        if self.draft_model is not None:
+            gen_kwargs["assistant_model"] = self.draft_model
+            gen_kwargs["do_sample"] = False
+
+        # greedy 에서는 샘플링 파라미터 제거 (generate 경고 방지)
+        if not gen_kwargs.get("do_sample"):
+            gen_kwargs.pop("temperature", None)
+            gen_kwargs.pop("top_p", None)
+        return gen_kwargs
+
+    def generate_text(self, messages, max_new_tokens=512) -> str:
+        """chat messages -> 모델 생성 결과(프롬프트 제외) 문자열"""
         # 3. llm 토크나이징
         # chat template 적용 → BatchEncoding 반환
         inputs = self.tokenizer.apply_chat_template(
             messages,
             tokenize=True,
             add_generation_prompt=True,
-            return_tensors="pt"
+            return_tensors="pt",
+            return_dict=True
         ).to(self.model.device)
 
         attention_mask = inputs.get("attention_mask", None)
@@ -188,22 +244,32 @@ class EvidenceGeneration:
                 input_ids=inputs["input_ids"],
                 attention_mask=attention_mask,
                 max_new_tokens=max_new_tokens,
-                temperature=0.1,
-                top_p=0.9,
-                do_sample=True,
-                pad_token_id=self.tokenizer.pad_token_id,
-                eos_token_id=self.tokenizer.eos_token_id
+                **self._generation_kwargs()
         )
 
         # 프롬프트 길이 이후만 디코딩
         # 3.1. 질문의 길이를 잽니다.
         prompt_length = inputs["input_ids"].shape[-1]
+        record_tokens(prompt_length, outputs.shape[-1] - prompt_length)
 
         # 3.2. 슬라이싱: 전체 결과에서 10번째 이후부터만 가져옵니다.
         generated_ids = outputs[0][prompt_length:]
 
         # 3.3. 답변만 남은 generated_ids를 글자로 바꿉니다.
-        raw_response = self.tokenizer.decode(generated_ids, skip_special_tokens=True)
+        return self.tokenizer.decode(generated_ids, skip_special_tokens=True)
+
+    def allergy_update(self, state: dict, tone_key=None, max_new_tokens=512) -> dict:
+        """
+        알러지 분석 후 변경된 키(any_allergen, allergen, substitute)만 반환합니다.
+        (state 는 읽기만 함)
+        """
+        messages = self.build_allergy_messages(state)
+
+        # 2.2. 예외 처리: 데이터가 없는 경우 기본값만 반환
+        if messages is None:
+            return {"any_allergen": False, "allergen": [], "substitute": []}
+
+        raw_response = self.generate_text(messages, max_new_tokens=max_new_tokens)
         
         # 디버깅: 원본 응답 출력
         #print(f"\n=== 원본 LLM 응답 ===")
@@ -211,8 +277,7 @@ class EvidenceGeneration:
         #print(f"===================\n")
 
         # overallState 기존 필드 보존을 위해 일부 필드만 업데이트
-        state["any_allergen"] = False
-        state["substitute"] = []
+        update = {"any_allergen": False, "allergen": [], "substitute": []}
 
         try:
             # JSON 추출: 마크다운 코드 블록 제거 및 JSON 부분만 추출
@@ -234,7 +299,7 @@ class EvidenceGeneration:
             
             if start_idx == -1 or end_idx == -1:
                 print("Error: JSON 형식을 찾을 수 없습니다.")
-                return state
+                return update
             
             json_text = response_text[start_idx:end_idx+1]
             
@@ -253,7 +318,7 @@ class EvidenceGeneration:
             analysis = data.get("ingredient_analysis", [])
 
             # any_allergen 추출: 분석 결과 중 하나라도 true가 있으면 true
-            state["any_allergen"] = any(item.get("is_allergen", False) for item in analysis)
+            update["any_allergen"] = any(item.get("is_allergen", False) for item in analysis)
 
             # any_allergen 추출: 분석 결과 중 하나라도 true가 있으면 true
             alle_list = []
@@ -265,7 +330,7 @@ class EvidenceGeneration:
                         # "생선, 두부" 처럼 문자열로 올 경우를 대비해 분리
                         alle_list.extend([s.strip() for s in alle.split(',')])
 
-            state["allergen"] = list(set(alle_list))  # 중복 제거
+            update["allergen"] = list(set(alle_list))  # 중복 제거
 
             # substitute 추출: is_allergen이 true인 항목의 대체재만 수집 (중복 제거)
             sub_list = []
@@ -277,17 +342,46 @@ class EvidenceGeneration:
                         # "생선, 두부" 처럼 문자열로 올 경우를 대비해 분리
                         sub_list.extend([s.strip() for s in sub.split(',')])
 
-            state["substitute"] = list(set(sub_list))  # 중복 제거
+            update["substitute"] = list(set(sub_list))  # 중복 제거
             
             #print(f"\n=== 최종 파싱 결과 ===")
-            #print(f"any_allergen: {state['any_allergen']}")
-            #print(f"allergen: {state['allergen']}")
-            #print(f"substitute: {state['substitute']}")
+            #print(f"any_allergen: {update['any_allergen']}")
+            #print(f"allergen: {update['allergen']}")
+            #print(f"substitute: {update['substitute']}")
             #print(f"===================\n")
 
         except json.JSONDecodeError as e:
             print(f"Parsing Error: {e}")
             print(f"문제가 된 텍스트 (앞 200자): {json_text[:200] if 'json_text' in locals() else raw_response[:200]}")
-            # 실패 시 기본 state 반환
+            # 실패 시 기본값 반환
 
-        return state
\ No newline at end of file
+        return update
+
+    def generate_allergy_prompt(self, state: dict, tone_key=None, max_new_tokens=512) -> dict:
+        """
+        정의된 모듈의 Key 값을 받아 최적화된 시스템 프롬프트를 생성하고 state를 업데이트합니다.
+        """
+        state.update(self.allergy_update(state, tone_key, max_new_tokens))
+        return state
+
+
+# 3. async 변형 (FastAPI / app.ainvoke 용)
+
+    async def aevaluate_threshold(self, state: dict) -> dict:
+        """threshold_update 의 async 변형 (CPU executor, 변경 키만 반환)"""
+        return await run_cpu(self.threshold_update, state)
+
+    async def agenerate_allergy_prompt(self, state: dict, tone_key=None, max_new_tokens=512) -> dict:
+        """allergy_update 의 async 변형 (LLM executor, 변경 키만 반환)"""
+        return await run_llm(self.allergy_update, state, tone_key, max_new_tokens)
+
+    async def arun(self, state: dict) -> dict:
+        """
+        임계값 체크와 알러지 분석을 동시에 실행하고 결과 키만 합쳐서 반환합니다.
+        (두 작업 모두 state 를 읽기만 하므로 복사본이 필요 없음)
+        """
+        threshold, allergy = await asyncio.gather(
+            self.aevaluate_threshold(state),
+            self.agenerate_allergy_prompt(state),
+        )
+        return {**threshold, **allergy}
@@ -1,6 +1,8 @@
 import math
 from typing import Dict, Any, List, Set, Optional, TypedDict
 
+from ai.orchestrator.executor import run_cpu
+
 
 # =========================
 # ✅ sub에게 넘길 스키마
@@ -260,6 +262,15 @@ class RecoEngine:
 
         return reco_to_sub, reco_debug
 
+    async def arun(
+        self,
+        clicked_product_id: int,
+        k: int = 5,
+        weights: List[float] = [0.6, 0.3, 0.1],
+    ) -> tuple[RecoToSubPayload, Dict[str, Any]]:
+        """run 의 async 변형 (후보 검색은 CPU executor 에서 실행)"""
+        return await run_cpu(self.run, clicked_product_id, k=k, weights=weights)
+
 
 # =========================
 # ✅ 사용 예시
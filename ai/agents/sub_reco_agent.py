@@ -11,6 +11,8 @@ import json
 from typing import TypedDict, List, Dict, Any, Optional
 from dataclasses import dataclass, field
 
+from ai.orchestrator.executor import run_cpu
+
 # ============================================================================
 # 1. STATE 타입 정의
 # ============================================================================
@@ -547,11 +549,10 @@ class SubstitutionReco:
         
         return recommendations
 
-    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    def recommend(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """
-        LangGraph 파이프라인에서 호출할 수 있는 Node 래퍼 메서드.
-        state 객체 내부의 값이나 reco_agent에서 생성된 후보 리스트 등을 
-        추출하여 generate_recommendations를 실행하고 결과를 state에 병합하여 반환합니다.
+        state 에서 후보 리스트/프로필을 읽어 generate_recommendations 를 실행하고
+        변경된 키(sub_recommendations, next_step)만 반환합니다. (state 는 읽기만 함)
         """
         # reco_agent에서 만든 후보 상품 추출 (가정: state["candidates"])
         # 만약 state 구조에서 다른 키를 사용한다면 그에 맞게 수정 필요
@@ -559,8 +560,7 @@ class SubstitutionReco:
         
         if not candidates:
             print("⚠️ [Sub-Reco] 전달받은 Candidate가 없어 추천을 생성할 수 없습니다.")
-            state["sub_recommendations"] = []
-            return state
+            return {"sub_recommendations": []}
 
         # user_profile이 state에 없다면 직접 state를 사용하도록 fallback
         user_profile = state.get("user_profile", state)
@@ -578,14 +578,25 @@ class SubstitutionReco:
             is_processed_food=is_processed_food,
             weight=weight
         )
-        
-        # 결과를 state에 저장
-        state["sub_recommendations"] = recos
-        state["next_step"] = "resp_agent"  # 다음으로 넘어갈 에이전트 지정
         print(f"✅ [Sub-Reco] 대안 상품 추천 완료 (총 {len(recos)}개)")
-        
+
+        return {
+            "sub_recommendations": recos,
+            "next_step": "resp_agent",  # 다음으로 넘어갈 에이전트 지정
+        }
+
+    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        LangGraph 파이프라인에서 호출할 수 있는 Node 래퍼 메서드.
+        recommend 결과를 state에 병합하여 반환합니다.
+        """
+        state.update(self.recommend(state))
         return state
 
+    async def arun(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """recommend 의 async 변형 (점수 계산은 CPU executor 에서 실행, 변경 키만 반환)"""
+        return await run_cpu(self.recommend, state)
+
 
 # ============================================================================
 # 5. LLM 프롬프트 생성
@@ -1,7 +1,11 @@
 from typing import List, Dict, Any, TypedDict
+from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.pydantic_v1 import BaseModel, Field
 from langchain_core.runnables import RunnableConfig
 
+from ai.orchestrator.executor import run_llm
+from ai.orchestrator.state import changed_keys
+
 
 
 # 1. LLM 구조화 출력을 위한 Pydantic 모델
@@ -21,7 +25,8 @@ class ProfileRetrieval:
     def __init__(self, model):
         """
         Args:
-            model: 구조화된 출력을 지원하는 LLM 객체 (예: ChatOpenAI)
+            model: 구조화된 출력을 지원하는 LLM 객체
+                   (예: ChatOpenAI, infra.llm.backends.get_backend("USERagent"))
         """
         self.llm = model
         # LLM이 Pydantic 모델에 맞춰 답하도록 설정
@@ -67,7 +72,7 @@ class ProfileRetrieval:
             "diabetes_detail": "None", "hypertension_detail": "None", "kidneydisease_detail": "None", "allergy_list": []
         })
 
-    def run(self, state: OverallState, config: RunnableConfig = None) -> Dict[str, Any]:
+    def run(self, state: dict, config: RunnableConfig = None) -> Dict[str, Any]:
         """LangGraph 노드 실행 함수"""
 
         # 1. State에서 user_id 꺼내기 (이미 있는 정보 활용)
@@ -95,34 +100,40 @@ class ProfileRetrieval:
 
         print(f"✅ [User-Agent] 분석 완료: {analysis_result.target_ingredients}")
 
-        # 4. State 업데이트 (스키마에 맞춰서 반환)
-        return {
+        # 4. State 업데이트 (스키마에 맞춰서, 값이 바뀐 키만 반환)
+        return changed_keys(state, {
             # (1) 백엔드에서 가져온 Raw Data
+            # 키 이름은 overallState / RouterLogic 이 읽는 *_flag, *_detail 과 동일해야 함
+            # (다르면 orch_agent 가 플래그 누락으로 보고 user_agent 를 반복 호출)
             "name": user_profile["name"],
-            "diabetes": user_profile["diabetes_flag"],
-            "hypertension": user_profile["hypertension_flag"],
-            "kidneydisease": user_profile["kidneydisease_flag"],
-            "allergy": user_profile["allergy_flag"],
-
-            "diabetes_type": user_profile["diabetes_detail"],
-            "hypertension_type": user_profile["hypertension_detail"],
-            "kidneydisease_type": user_profile["kidneydisease_detail"],
+            "diabetes_flag": user_profile["diabetes_flag"],
+            "hypertension_flag": user_profile["hypertension_flag"],
+            "kidneydisease_flag": user_profile["kidneydisease_flag"],
+            "allergy_flag": user_profile["allergy_flag"],
+
+            "diabetes_detail": user_profile["diabetes_detail"],
+            "hypertension_detail": user_profile["hypertension_detail"],
+            "kidney_detail": user_profile["kidneydisease_detail"],
             "allergy_list": user_profile["allergy_list"],
 
             "final_profile": user_profile, # 임계값
 
             # (4) 흐름 제어 (오케스트레이터에게 턴을 넘김)
             "next_step": "orch_agent"
-        }
+        })
+
+    async def arun(self, state: dict, config: RunnableConfig = None) -> Dict[str, Any]:
+        """run 의 async 변형 (백엔드 조회 + LLM 호출을 LLM executor 로 offload, state 는 읽기만 함)"""
+        return await run_llm(self.run, state, config)
 
 # --- 사용 예시 ---
 
-# 1. LLM 정의 (앞서 만든 router_llm과 같은 모델 사용 가능)
-# from langchain_openai import ChatOpenAI
-# retrieval_llm = ChatOpenAI(model="gpt-4o", temperature=0)
+# 1. LLM 정의 (settings.LLM_BACKEND 에 따라 HF 또는 OpenAI 호환 HTTP)
+# from infra.llm.backends import get_backend
+# retrieval_llm = get_backend("USERagent")
 
 # 2. 클래스 인스턴스 생성
-useragent = ProfileRetrieval(retrieval_llm)
+# useragent = ProfileRetrieval(retrieval_llm)
 
 # 3. LangGraph에 노드 추가 시
 # workflow.add_node("user_agent", useragent.run)
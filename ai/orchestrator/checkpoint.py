@@ -0,0 +1,57 @@
+# 역할: 분석 그래프 체크포인트 (로컬 SQLite 파일)
+# - thread_id = (user, product, 프로필 버전) -> 같은 분석은 같은 스레드
+#     * 중간 노드 실패(예: 알러지 LLM JSON 파싱 오류) 후 재시도 -> 실패한 노드부터 재개
+#       (같은 step 에서 성공한 병렬 노드 결과는 pending write 로 저장돼 다시 실행하지 않음)
+#     * 이미 끝난 스레드 -> 마지막 체크포인트 state 를 그대로 반환 (에이전트 실행 없음)
+#     * 프로필이 바뀌면 버전 해시가 달라져 새 스레드에서 처음부터 실행
+#     * AnalysisState 입력 채널이 바뀌면 STATE_VERSION 을 올림 -> 이전 스키마로 끝난 스레드의 결과를 재사용하지 않음
+# - 의존성: langgraph-checkpoint-sqlite (+ async 실행 시 aiosqlite)
+
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import Any, Dict, Optional
+
+from app.settings import settings
+from infra.cache.decision_cache import profile_hash
+
+# v2: product_data 채널 추가 (이전 스레드는 상품 없이 알러지 분석을 건너뛴 결과)
+STATE_VERSION = "v2"
+
+
+def profile_version(profile: Optional[Dict[str, Any]]) -> str:
+    """프로필 내용 해시 (판단 캐시와 같은 hash)"""
+    return profile_hash(profile)
+
+
+def analysis_thread_id(user_id, product_id, profile: Optional[Dict[str, Any]]) -> str:
+    return f"analysis:{STATE_VERSION}:{user_id}:{product_id}:{profile_version(profile)}"
+
+
+def thread_config(thread_id: str) -> Dict[str, Any]:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def build_checkpointer(path: Optional[str] = None, *, use_async: bool = False):
+    """
+    SQLite 체크포인트 saver 생성.
+    - use_async=False: SqliteSaver (app.invoke 용)
+    - use_async=True : AsyncSqliteSaver (app.ainvoke 용, 연결은 첫 사용 시 이벤트 루프에서 열림)
+    path 가 없으면 settings.AGENT_CHECKPOINT_PATH, 그것도 없으면 None (체크포인트 사용 안 함)
+    """
+    path = path or settings.AGENT_CHECKPOINT_PATH
+    if not path:
+        return None
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if use_async:
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        return AsyncSqliteSaver(aiosqlite.connect(path))
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False))
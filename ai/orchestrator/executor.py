@@ -0,0 +1,39 @@
+# 역할: 에이전트 async 변형(arun)용 공용 executor
+# - CPU 작업(임계값 체크, 후보 검색, 점수 계산)과 LLM 작업(generate / HTTP 호출)을 분리
+#   -> GPU 1장에서 generate 가 몰려 thrash 나는 것을 LLM executor 크기로 제한
+# - 이벤트 루프는 막지 않고, 한 워커가 여러 분석을 동시에 들고 있을 수 있음
+# - 호출 시점의 contextvar(트레이싱 Usage)를 워커 스레드로 전달하고 스레드 CPU 시간을 기록
+
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.settings import settings
+from infra.usage import record_cpu
+
+CPU_EXECUTOR = ThreadPoolExecutor(max_workers=settings.AGENT_CPU_WORKERS, thread_name_prefix="agent-cpu")
+LLM_EXECUTOR = ThreadPoolExecutor(max_workers=settings.AGENT_LLM_WORKERS, thread_name_prefix="agent-llm")
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.thread_time()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        record_cpu(time.thread_time() - t0)
+
+
+async def _submit(executor, fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    return await loop.run_in_executor(executor, functools.partial(ctx.run, _timed, fn, *args, **kwargs))
+
+
+async def run_cpu(fn, *args, **kwargs):
+    return await _submit(CPU_EXECUTOR, fn, *args, **kwargs)
+
+
+async def run_llm(fn, *args, **kwargs):
+    return await _submit(LLM_EXECUTOR, fn, *args, **kwargs)
@@ -0,0 +1,176 @@
+# 역할: 상품 분석 LangGraph 워크플로우 조립
+# - 프로필 확보(user_agent) 후 3개 단계를 동시에 실행 (fan-out)
+#     chat_agent    : 영양성분 임계값 체크 (결정적, threshold_update)
+#     allergy_agent : LLM 알러지 분석 (allergy_update)
+#     reco_agent    : 대체 후보 검색 (분석 결과와 무관하므로 미리 실행)
+# - analysis_join 에서 합류 후 RouterLogic 으로 최종 분기
+#     WARN -> sub_reco_agent (후보는 이미 준비됨) / PASS -> END
+# - 전체 지연 = 세 단계의 합이 아니라 최댓값
+#
+# 병렬 노드가 같은 state 키를 동시에 쓰면 LangGraph 가 InvalidUpdateError 를 내므로
+# 각 노드는 자기가 바꾼 키만 반환한다 (threshold_update / allergy_update / recommend, 스키마는 state.py).
+#
+# orch_agent 는 RoutingEngine.route: 판단 메모 + 노드별 방문 한도 (user_agent 무한 반복 방지)
+#
+# use_async=True 면 에이전트의 arun 변형을 노드로 등록 -> app.ainvoke 로 이벤트 루프에서 실행
+# (CPU/LLM 작업은 ai.orchestrator.executor 의 executor 로 offload)
+
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from langgraph.graph import StateGraph, START, END
+
+from ai.orchestrator.policy import RouterLogic
+from ai.orchestrator.routing import RoutingEngine
+from ai.orchestrator.state import AnalysisState
+from ai.orchestrator.tracing import GraphTracer
+
+ANALYSIS_NODES = ["chat_agent", "allergy_agent", "reco_agent"]
+
+
+def _reco_update(reco_to_sub, reco_debug) -> dict:
+    return {"candidates": reco_to_sub["candidates"], "reco_debug": reco_debug}
+
+
+def _reco_failed(e: Exception) -> dict:
+    print(f"⚠️ [Reco-Agent] 후보 검색 실패: {type(e).__name__}: {e}")
+    return {"candidates": [], "reco_debug": {"error": str(e)}}
+
+
+def make_reco_node(recoagent, k: int = 5, use_async: bool = False) -> Callable[[dict], dict]:
+    """RecoEngine.run(clicked_product_id) -> state 업데이트 노드"""
+
+    if use_async:
+        async def areco_node(state: dict) -> dict:
+            try:
+                reco_to_sub, reco_debug = await recoagent.arun(clicked_product_id=int(state["product_id"]), k=k)
+            except Exception as e:
+                return _reco_failed(e)
+            return _reco_update(reco_to_sub, reco_debug)
+
+        return areco_node
+
+    def reco_node(state: dict) -> dict:
+        try:
+            reco_to_sub, reco_debug = recoagent.run(clicked_product_id=int(state["product_id"]), k=k)
+        except Exception as e:
+            return _reco_failed(e)
+        return _reco_update(reco_to_sub, reco_debug)
+
+    return reco_node
+
+
+def make_allergy_node(chatagent, use_async: bool = False) -> Callable[[dict], dict]:
+    """알러지 플래그가 없으면 LLM 호출 없이 바로 통과"""
+    no_allergy = {"any_allergen": False, "allergen": [], "substitute": []}
+
+    if use_async:
+        async def aallergy_node(state: dict) -> dict:
+            if not state.get("allergy_flag"):
+                return dict(no_allergy)
+            return await chatagent.agenerate_allergy_prompt(state)
+
+        return aallergy_node
+
+    def allergy_node(state: dict) -> dict:
+        if not state.get("allergy_flag"):
+            return dict(no_allergy)
+        return chatagent.allergy_update(state)
+
+    return allergy_node
+
+
+def build_workflow(
+    *,
+    useragent,
+    chatagent,
+    recoagent=None,
+    subsagent=None,
+    respagent=None,
+    router: Optional[RouterLogic] = None,
+    reco_k: int = 5,
+    use_async: bool = False,
+    tracer: Optional[GraphTracer] = None,
+    routing: Optional[RoutingEngine] = None,
+) -> StateGraph:
+    """
+    Args:
+        useragent: ProfileRetrieval (run / arun)
+        chatagent: EvidenceGeneration (threshold_update / allergy_update 및 a* 변형)
+        recoagent: RecoEngine (run / arun) - 없으면 후보 없음
+        subsagent: SubstitutionReco (recommend / arun) - 없으면 WARN 이어도 END
+        respagent: 응답 생성 에이전트 (run) - 없으면 sub_reco 후 END
+        use_async: True 면 arun 변형으로 노드 등록 (app.ainvoke 전용)
+        tracer: 노드 단위 트레이싱 (GraphRunner 에도 같은 tracer 를 넘겨야 루프 횟수가 집계됨)
+        routing: 판단 메모 / 방문 한도 / 완료 노드 skip (없으면 router 로 기본 생성)
+    """
+    routing = routing or RoutingEngine(router)
+    skip = routing.skip_if_done
+    workflow = StateGraph(AnalysisState)
+    if tracer is not None:
+        tracer.instrument(workflow)
+
+    # 1) 노드 등록 (출력이 이미 state 에 있는 노드는 실행 없이 통과)
+    workflow.add_node("orch_agent", routing.route)
+    workflow.add_node(
+        "user_agent",
+        skip("user_agent", useragent.arun if use_async else useragent.run, {"next_step": "orch_agent"}),
+    )
+
+    threshold_fn = chatagent.aevaluate_threshold if use_async else chatagent.threshold_update
+    workflow.add_node("chat_agent", skip("chat_agent", threshold_fn))
+    workflow.add_node("allergy_agent", skip("allergy_agent", make_allergy_node(chatagent, use_async=use_async)))
+    workflow.add_node(
+        "reco_agent",
+        skip("reco_agent", make_reco_node(recoagent, k=reco_k, use_async=use_async))
+        if recoagent is not None else (lambda state: {"candidates": []}),
+    )
+    workflow.add_node("analysis_join", lambda state: {})
+
+    if subsagent is not None:
+        workflow.add_node("sub_reco_agent", skip("sub_reco_agent", subsagent.arun if use_async else subsagent.recommend))
+    if respagent is not None:
+        workflow.add_node("resp_agent", respagent.run)
+
+    # 2) 프로필 확보 단계
+    workflow.add_edge(START, "orch_agent")
+    workflow.add_edge("user_agent", "orch_agent")
+
+    def route_from_orch(state: dict):
+        next_step = state.get("next_step", "end")
+        if next_step == "user_agent":
+            return "user_agent"
+        if next_step in ("chat_agent", "reco_agent"):
+            # 분석 3단계 동시 실행
+            return ANALYSIS_NODES
+        return END
+
+    workflow.add_conditional_edges("orch_agent", route_from_orch, ["user_agent", *ANALYSIS_NODES, END])
+
+    # 3) fan-in: 세 단계가 모두 끝나야 join 실행
+    workflow.add_edge(ANALYSIS_NODES, "analysis_join")
+
+    def route_from_join(state: dict):
+        # 분석이 끝난 뒤 RouterLogic 은 WARN 이면 reco_agent, 아니면 chat_agent/end 를 반환
+        # -> 후보는 이미 준비됐으므로 WARN 은 바로 sub_reco_agent, 나머지는 종료
+        decision = routing.decide(state)
+        if decision == "reco_agent" and subsagent is not None:
+            return "sub_reco_agent"
+        return END
+
+    join_targets = ["sub_reco_agent", END] if subsagent is not None else [END]
+    workflow.add_conditional_edges("analysis_join", route_from_join, join_targets)
+
+    # 4) 대체 추천 -> 응답
+    if subsagent is not None:
+        workflow.add_edge("sub_reco_agent", "resp_agent" if respagent is not None else END)
+    if respagent is not None:
+        workflow.add_edge("resp_agent", END)
+
+    return workflow
+
+
+def build_app(*, checkpointer=None, **agents):
+    """compile 된 LangGraph 앱 반환 (checkpointer: ai.orchestrator.checkpoint.build_checkpointer)"""
+    return build_workflow(**agents).compile(checkpointer=checkpointer)
@@ -0,0 +1,120 @@
+# 역할: orch_agent <-> agent 순환 제어 (RouterLogic 래퍼)
+# - decide: RouterLogic 이 실제로 읽는 키(플래그 4개 + any_exceed/any_allergen)만으로 fingerprint 를 만들어
+#   판단 결과를 LRU 메모 -> 같은 상황의 재판단/로그 출력 반복 없음
+# - visit: 요청 1건 동안 orch 가 각 노드로 보낸 횟수를 state["route_visits"] 에 누적,
+#   max_visits 초과 시 "end" 로 끊음 (플래그가 계속 누락돼 user_agent 로 무한 반복되는 경우 등)
+# - skip_if_done: 노드 출력 키가 이미 state 에 있으면 (재개/캐시/사전 입력) 실행 없이 통과
+#   -> 요청 1건의 최악 지연 = 각 노드 max_visits 회로 상한
+
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ai.orchestrator.policy import RouterLogic
+from app.settings import settings
+
+FLAG_KEYS = ("diabetes_flag", "hypertension_flag", "kidneydisease_flag", "allergy_flag")
+ROUTING_KEYS = (*FLAG_KEYS, "any_exceed", "any_allergen")
+
+# 노드 -> 노드가 채우는 state 키 (모두 있으면 이미 실행된 것으로 간주)
+NODE_OUTPUTS: Dict[str, Tuple[str, ...]] = {
+    "user_agent": FLAG_KEYS,
+    "chat_agent": ("any_exceed", "exceeded_nutrients"),
+    "allergy_agent": ("any_allergen", "allergen", "substitute"),
+    "reco_agent": ("candidates",),
+    "sub_reco_agent": ("sub_recommendations",),
+}
+
+
+class RoutingEngine:
+    def __init__(
+        self,
+        router: Optional[RouterLogic] = None,
+        *,
+        max_visits: Optional[int] = None,
+        cache_size: int = 1024,
+    ):
+        """
+        Args:
+            router: 실제 규칙 (RouterLogic.run)
+            max_visits: 요청 1건에서 orch 가 같은 노드로 보낼 수 있는 최대 횟수 (기본 settings.AGENT_MAX_NODE_VISITS)
+            cache_size: 판단 메모 LRU 크기 (fingerprint 조합 수는 작으므로 충분)
+        """
+        self.router = router or RouterLogic()
+        self.max_visits = max_visits if max_visits is not None else settings.AGENT_MAX_NODE_VISITS
+        self.cache_size = cache_size
+        self._memo: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(state: Dict[str, Any]) -> tuple:
+        # RouterLogic 은 None 여부와 truthy 여부만 보므로 그대로 정규화
+        flags = tuple(None if state.get(k) is None else int(state.get(k)) for k in FLAG_KEYS)
+        return (*flags, bool(state.get("any_exceed")), bool(state.get("any_allergen")))
+
+    def decide(self, state: Dict[str, Any]) -> str:
+        key = self.fingerprint(state)
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return self._memo[key]
+            self.misses += 1
+
+        decision = self.router.run(state)
+
+        with self._lock:
+            self._memo[key] = decision
+            if len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+        return decision
+
+    @staticmethod
+    def has_outputs(state: Dict[str, Any], node: str) -> bool:
+        keys = NODE_OUTPUTS.get(node)
+        return bool(keys) and all(state.get(k) is not None for k in keys)
+
+    def route(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        orch_agent 노드 본체: 다음 단계 + 방문 횟수 업데이트 반환
+        - user_agent 방문이 max_visits 에 도달하면 "end" + route_error
+        """
+        decision = self.decide(state)
+
+        if decision in ("end", "__end__"):
+            return {"next_step": "end"}
+
+        visited = (state.get("route_visits") or {}).get(decision, 0)
+        if visited >= self.max_visits:
+            print(f"⛔ [Orch-Agent] {decision} 방문 한도({self.max_visits}) 초과 -> 종료")
+            return {"next_step": "end", "route_error": f"{decision.upper()}_VISIT_LIMIT"}
+
+        # route_visits 는 merge_dict 채널 -> 바뀐 항목만 전송
+        return {"next_step": decision, "route_visits": {decision: visited + 1}}
+
+    def skip_if_done(self, node: str, fn: Callable, passthrough: Optional[Dict[str, Any]] = None) -> Callable:
+        """노드 출력이 이미 state 에 있으면 fn 을 실행하지 않고 passthrough 만 반환"""
+        passthrough = passthrough or {}
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def aguarded(state, *args, **kwargs):
+                if self.has_outputs(state, node):
+                    return dict(passthrough)
+                return await fn(state, *args, **kwargs)
+
+            return aguarded
+
+        @functools.wraps(fn)
+        def guarded(state, *args, **kwargs):
+            if self.has_outputs(state, node):
+                return dict(passthrough)
+            return fn(state, *args, **kwargs)
+
+        return guarded
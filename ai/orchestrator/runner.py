@@ -0,0 +1,131 @@
+# 역할: compile 된 분석 그래프 실행기 (FastAPI 에서 await 가능)
+# - arun: app.ainvoke -> 이벤트 루프를 막지 않음 (async 노드 + executor offload)
+# - run : app.invoke  -> 스크립트/노트북용 동기 실행
+# - max_in_flight: 동시에 진행 중인 그래프 실행 수 상한 (초과 요청은 대기)
+# - tracer: 실행 1건 단위 노드 방문 횟수(orch <-> agent 루프) 집계
+# - thread_id: app 에 checkpointer 가 있으면 스레드 단위로 재개/재사용 (checkpoint.py)
+#     끝난 스레드 -> 마지막 state 반환 / 중간 실패 스레드 -> 실패 노드부터 재개 / 없으면 새로 실행
+#
+# 앱 기동(app.main lifespan) 시 LLM warm-up 이 끝나면 configure_runner(build_service_runner()) 로 등록하고
+# 라우트는 api.deps.get_graph_runner 로 주입받는다. (등록 전 / CHATagent 미사용 배포에서는 503)
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from typing import Any, Dict, Optional
+
+from ai.orchestrator.checkpoint import thread_config
+from ai.orchestrator.tracing import GraphTracer
+
+
+class GraphRunner:
+    def __init__(self, app, *, max_in_flight: Optional[int] = None, tracer: Optional[GraphTracer] = None):
+        """
+        Args:
+            app: workflow.compile() 결과 (build_app)
+            max_in_flight: None 이면 제한 없음
+            tracer: build_workflow 에 넘긴 것과 같은 tracer
+        """
+        self.app = app
+        self.tracer = tracer or GraphTracer()
+        self._slots = asyncio.Semaphore(max_in_flight) if max_in_flight else None
+        self.stats = {"fresh": 0, "resumed": 0, "cached": 0}
+
+    def _plan(self, snapshot, state: Dict[str, Any]):
+        """체크포인트 snapshot -> (종류, 입력) : cached / resumed / fresh"""
+        if snapshot is None or not snapshot.values:
+            return "fresh", state
+        if snapshot.next:
+            return "resumed", None  # 입력 None = 마지막 체크포인트에서 이어서 실행
+        return "cached", None
+
+    def _config(self, config: Optional[dict], thread_id: Optional[str]) -> Optional[dict]:
+        if thread_id is None or getattr(self.app, "checkpointer", None) is None:
+            return config
+        return {**(config or {}), **thread_config(thread_id)}
+
+    def run(
+        self,
+        state: Dict[str, Any],
+        config: Optional[dict] = None,
+        *,
+        thread_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        config = self._config(config, thread_id)
+        snapshot = self.app.get_state(config) if config and "configurable" in config else None
+        kind, payload = self._plan(snapshot, state)
+        self.stats[kind] += 1
+        if kind == "cached":
+            return snapshot.values
+
+        with self.tracer.run():
+            return self.app.invoke(payload, config=config)
+
+    async def arun(
+        self,
+        state: Dict[str, Any],
+        config: Optional[dict] = None,
+        *,
+        thread_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        config = self._config(config, thread_id)
+        snapshot = await self.app.aget_state(config) if config and "configurable" in config else None
+        kind, payload = self._plan(snapshot, state)
+        self.stats[kind] += 1
+        if kind == "cached":
+            return snapshot.values
+
+        if self._slots is None:
+            with self.tracer.run():
+                return await self.app.ainvoke(payload, config=config)
+        async with self._slots:
+            with self.tracer.run():
+                return await self.app.ainvoke(payload, config=config)
+
+    async def aclose(self) -> None:
+        """체크포인트 연결 정리 (앱 종료 시)"""
+        conn = getattr(getattr(self.app, "checkpointer", None), "conn", None)
+        if conn is not None:
+            closed = conn.close()
+            if inspect.isawaitable(closed):
+                await closed
+
+
+def build_service_runner(*, max_in_flight: Optional[int] = None) -> GraphRunner:
+    """
+    API 서버용 실행기 (ainvoke + 프로세스 전역 TRACER + settings.AGENT_CHECKPOINT_PATH 체크포인트)
+    - 에이전트: USERagent(get_backend) / CHATagent(ModelLoader 공유 모델) -> warm-up 으로 로드된 뒤 호출
+    - 질환 flag 와 임계값 결과(any_exceed / exceeded_nutrients)는 라우트가 state 에 채워서 넘기므로
+      user_agent / chat_agent 는 skip 되고, 그래프는 LLM 알러지 분석 + 최종 분기를 담당
+    - 후보 검색/대체 추천(RecoEngine / SubstitutionReco)은 서버용 상품 인덱스가 없어 등록하지 않음
+    """
+    from ai.agents.chat_core_agent import EvidenceGeneration
+    from ai.agents.user_agent import ProfileRetrieval
+    from ai.orchestrator.checkpoint import build_checkpointer
+    from ai.orchestrator.graph import build_app
+    from ai.orchestrator.tracing import TRACER
+    from infra.llm.backends import get_backend
+    from infra.llm.loader import ModelLoader
+
+    app = build_app(
+        useragent=ProfileRetrieval(get_backend("USERagent")),
+        chatagent=EvidenceGeneration.from_agent_model(ModelLoader.get_agent_model("CHATagent")),
+        use_async=True,
+        tracer=TRACER,
+        checkpointer=build_checkpointer(use_async=True),
+    )
+    return GraphRunner(app, max_in_flight=max_in_flight, tracer=TRACER)
+
+
+_runner: Optional[GraphRunner] = None
+
+
+def configure_runner(runner: Optional[GraphRunner]) -> None:
+    """프로세스 전역 그래프 실행기 등록 (None 이면 해제)"""
+    global _runner
+    _runner = runner
+
+
+def get_runner() -> Optional[GraphRunner]:
+    return _runner
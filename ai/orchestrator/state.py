@@ -0,0 +1,63 @@
+# 역할: 분석 그래프 state 스키마 + 채널 reducer
+# - 노드는 state 전체가 아니라 "바뀐 키"만 반환 -> LangGraph 가 채널 단위로 병합
+#   (hop 마다 state 전체 복사/병합 없음)
+# - 기본 채널은 LastValue (같은 step 에서 두 노드가 같은 키를 쓰면 InvalidUpdateError -> 버그 조기 발견)
+# - 여러 노드/방문에 걸쳐 누적되는 dict 채널만 merge_dict reducer 사용
+
+from __future__ import annotations
+
+from typing import Annotated, Any, Dict, List, Optional, TypedDict
+
+
+def merge_dict(old: Optional[dict], new: Optional[dict]) -> dict:
+    """dict 채널 reducer: 바뀐 항목만 보내면 기존 값에 덮어씀"""
+    if not old:
+        return dict(new or {})
+    if not new:
+        return old
+    return {**old, **new}
+
+
+def changed_keys(state: Dict[str, Any], update: Dict[str, Any], always: tuple = ("next_step",)) -> Dict[str, Any]:
+    """update 중 state 와 값이 다른 키만 남김 (always 키는 항상 포함)"""
+    return {k: v for k, v in update.items() if k in always or state.get(k) != v}
+
+
+class AnalysisState(TypedDict, total=False):
+    user_id: str
+    product_id: str
+    name: str
+    # 상품 상세 (API 입력) - 스키마에 없는 키는 LangGraph 가 입력에서 버리므로 반드시 선언
+    product_data: dict
+
+    # [User-Agent]
+    diabetes_flag: int
+    hypertension_flag: int
+    kidneydisease_flag: int
+    allergy_flag: int
+    diabetes_detail: Optional[str]
+    hypertension_detail: Optional[str]
+    kidney_detail: Optional[str]
+    allergy_list: List[str]
+    final_profile: dict
+    user_profile: dict
+
+    # [Chat-Agent] 임계값
+    any_exceed: bool
+    exceeded_nutrients: List[str]
+
+    # [Allergy-Agent]
+    any_allergen: bool
+    allergen: List[str]
+    substitute: List[str]
+
+    # [Reco-Agent] / [Sub-Reco-Agent]
+    candidates: List[dict]
+    reco_debug: dict
+    sub_recommendations: List[dict]
+
+    # [흐름 제어]
+    next_step: str
+    final_answer: str
+    route_visits: Annotated[dict, merge_dict]  # orch 가 각 노드로 보낸 횟수 (RoutingEngine, 증가분만 전송)
+    route_error: Optional[str]                 # 방문 한도 초과 시 "<NODE>_VISIT_LIMIT"
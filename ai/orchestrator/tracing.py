@@ -0,0 +1,378 @@
+# 역할: 분석 그래프 노드 단위 트레이싱
+# - GraphTracer.instrument(workflow): 이후 workflow.add_node 로 등록되는 모든 노드를 감쌈
+# - 노드 1회 실행마다 NodeSpan 기록
+#     wall_s       : 벽시계 시간
+#     cpu_s        : 스레드 CPU 시간 (async 노드는 executor 로 offload 된 작업 합계)
+#     tokens_in/out: 노드 안에서 호출된 LLM 토큰 수 (infra.usage.record_tokens)
+#     state_bytes  : 노드 입력 state 직렬화 크기 / update_bytes: 노드가 반환한 업데이트 크기
+# - GraphTracer.run(): 요청 1건 동안 노드 방문 횟수 집계 -> RunSummary
+#     (orch_agent 방문 수 = orch <-> agent 루프 횟수)
+# - sink 는 교체 가능: LogSink(구조화 로그), HistogramSink(메모리 히스토그램 + Prometheus 텍스트)
+#
+# 사용 예)
+#   workflow = build_workflow(..., tracer=TRACER)
+#   runner = GraphRunner(workflow.compile(), tracer=TRACER)
+#   GET /metrics/agents -> TRACE_HISTOGRAM.render_prometheus()
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from app.settings import settings
+from infra.usage import track
+
+logger = logging.getLogger("ai.orchestrator.trace")
+
+_visits: contextvars.ContextVar[Optional[Counter]] = contextvars.ContextVar("graph_visits", default=None)
+# 병렬 sync 노드는 worker 스레드에서 같은 Counter 를 올리므로 증가/읽기는 lock 안에서
+_visits_lock = threading.Lock()
+
+
+@dataclass
+class NodeSpan:
+    node: str
+    wall_s: float
+    cpu_s: float
+    tokens_in: int
+    tokens_out: int
+    state_bytes: int
+    update_bytes: int
+    visit: int = 1
+    error: Optional[str] = None
+
+
+@dataclass
+class RunSummary:
+    wall_s: float
+    visits: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def loops(self) -> int:
+        return self.visits.get("orch_agent", 0)
+
+
+def _size(obj: Any) -> int:
+    try:
+        return len(json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return -1
+
+
+# -------------------------
+# sinks
+# -------------------------
+class TraceSink:
+    def on_span(self, span: NodeSpan) -> None:
+        pass
+
+    def on_run(self, run: RunSummary) -> None:
+        pass
+
+
+class LogSink(TraceSink):
+    """한 줄 JSON 구조화 로그"""
+
+    def __init__(self, log: Optional[logging.Logger] = None):
+        self.log = log or logger
+
+    def on_span(self, span: NodeSpan) -> None:
+        self.log.info(json.dumps({"event": "node", **asdict(span)}, ensure_ascii=False))
+
+    def on_run(self, run: RunSummary) -> None:
+        self.log.info(json.dumps(
+            {"event": "run", "wall_s": run.wall_s, "loops": run.loops, "visits": run.visits, "error": run.error},
+            ensure_ascii=False,
+        ))
+
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[int]:
+        out, acc = [], 0
+        for c in self.counts:
+            acc += c
+            out.append(acc)
+        return out
+
+
+class HistogramSink(TraceSink):
+    """노드별 메모리 히스토그램 (snapshot / Prometheus 텍스트 포맷 출력)"""
+
+    WALL_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+    VISIT_BUCKETS = (1, 2, 3, 5, 10)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._wall: Dict[str, _Histogram] = defaultdict(lambda: _Histogram(self.WALL_BUCKETS))
+            self._state: Dict[str, _Histogram] = defaultdict(lambda: _Histogram(self.BYTES_BUCKETS))
+            self._visits: Dict[str, _Histogram] = defaultdict(lambda: _Histogram(self.VISIT_BUCKETS))
+            self._cpu: Dict[str, float] = defaultdict(float)
+            self._tokens_in: Dict[str, int] = defaultdict(int)
+            self._tokens_out: Dict[str, int] = defaultdict(int)
+            self._update_bytes: Dict[str, int] = defaultdict(int)
+            self._errors: Dict[str, int] = defaultdict(int)
+            self._run_wall = _Histogram(self.WALL_BUCKETS)
+            self._run_loops = _Histogram(self.VISIT_BUCKETS)
+            self._run_errors = 0
+
+    def on_span(self, span: NodeSpan) -> None:
+        with self._lock:
+            self._wall[span.node].observe(span.wall_s)
+            if span.state_bytes >= 0:
+                self._state[span.node].observe(span.state_bytes)
+            self._cpu[span.node] += span.cpu_s
+            self._tokens_in[span.node] += span.tokens_in
+            self._tokens_out[span.node] += span.tokens_out
+            self._update_bytes[span.node] += max(span.update_bytes, 0)
+            if span.error:
+                self._errors[span.node] += 1
+
+    def on_run(self, run: RunSummary) -> None:
+        with self._lock:
+            self._run_wall.observe(run.wall_s)
+            self._run_loops.observe(run.loops)
+            for node, n in run.visits.items():
+                self._visits[node].observe(n)
+            if run.error:
+                self._run_errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """노드별 요약 (hot node 확인용, 총 wall time 내림차순)"""
+        with self._lock:
+            nodes = {
+                node: {
+                    "calls": h.count,
+                    "wall_s_total": round(h.sum, 6),
+                    "wall_s_avg": round(h.sum / h.count, 6) if h.count else 0.0,
+                    "cpu_s_total": round(self._cpu[node], 6),
+                    "tokens_in": self._tokens_in[node],
+                    "tokens_out": self._tokens_out[node],
+                    "state_bytes_avg": round(self._state[node].sum / self._state[node].count)
+                    if self._state[node].count else 0,
+                    "errors": self._errors[node],
+                    "visits_per_run_avg": round(self._visits[node].sum / self._visits[node].count, 3)
+                    if self._visits[node].count else 0.0,
+                }
+                for node, h in self._wall.items()
+            }
+            runs = self._run_wall.count
+            return {
+                "runs": runs,
+                "run_errors": self._run_errors,
+                "run_wall_s_avg": round(self._run_wall.sum / runs, 6) if runs else 0.0,
+                "loops_avg": round(self._run_loops.sum / runs, 3) if runs else 0.0,
+                "nodes": dict(sorted(nodes.items(), key=lambda kv: -kv[1]["wall_s_total"])),
+            }
+
+    def render_prometheus(self, prefix: str = "agent_graph") -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, series: Dict[str, _Histogram], label: str = "node"):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} histogram")
+            for key, h in series.items():
+                lbl = f'{label}="{key}",' if label else ""
+                for le, acc in zip([*h.buckets, "+Inf"], h.cumulative()):
+                    lines.append(f'{prefix}_{name}_bucket{{{lbl}le="{le}"}} {acc}')
+                tag = f'{{{lbl.rstrip(",")}}}' if label else ""
+                lines.append(f"{prefix}_{name}_sum{tag} {h.sum}")
+                lines.append(f"{prefix}_{name}_count{tag} {h.count}")
+
+        def counter(name: str, help_text: str, series: Dict[str, float], extra: str = ""):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for node, v in series.items():
+                lines.append(f'{prefix}_{name}{{node="{node}"{extra}}} {v}')
+
+        with self._lock:
+            histogram("node_wall_seconds", "Node wall time", self._wall)
+            histogram("node_state_bytes", "Serialized input state size", self._state)
+            histogram("node_visits_per_run", "Node visits per graph run", self._visits)
+            counter("node_cpu_seconds_total", "Node CPU time", self._cpu)
+            counter("node_llm_tokens_total", "LLM tokens", self._tokens_in, ',direction="in"')
+            lines.extend(
+                f'{prefix}_node_llm_tokens_total{{node="{node}",direction="out"}} {v}'
+                for node, v in self._tokens_out.items()
+            )
+            counter("node_update_bytes_total", "Serialized node update size", self._update_bytes)
+            counter("node_errors_total", "Node exceptions", self._errors)
+            histogram("run_wall_seconds", "Graph run wall time", {"": self._run_wall}, label="")
+            histogram("run_loops", "orch_agent visits per graph run", {"": self._run_loops}, label="")
+            lines.append(f"# TYPE {prefix}_run_errors_total counter")
+            lines.append(f"{prefix}_run_errors_total {self._run_errors}")
+
+        return "\n".join(lines) + "\n"
+
+
+# -------------------------
+# tracer
+# -------------------------
+class GraphTracer:
+    def __init__(self, sinks: Optional[Sequence[TraceSink]] = None, *, measure_state: bool = True):
+        """
+        Args:
+            sinks: span / run 요약을 받을 sink 목록 (비어 있으면 측정하지 않음)
+            measure_state: state 직렬화 크기 측정 여부 (큰 state 에서는 json 직렬화 비용이 듦)
+        """
+        self.sinks = list(sinks or [])
+        self.measure_state = measure_state
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def _emit_span(self, span: NodeSpan) -> None:
+        for sink in self.sinks:
+            sink.on_span(span)
+
+    def _emit_run(self, run: RunSummary) -> None:
+        for sink in self.sinks:
+            sink.on_run(run)
+
+    def _begin(self, name: str) -> int:
+        visits = _visits.get()
+        visit = 1
+        if visits is not None:
+            with _visits_lock:
+                visits[name] += 1
+                visit = visits[name]
+        return visit
+
+    def _finish(self, name, visit, state, out, usage, wall_s, cpu_s, error) -> None:
+        self._emit_span(NodeSpan(
+            node=name,
+            wall_s=wall_s,
+            cpu_s=cpu_s,
+            tokens_in=usage.tokens_in,
+            tokens_out=usage.tokens_out,
+            state_bytes=_size(state) if self.measure_state else -1,
+            update_bytes=_size(out) if self.measure_state and out is not None else -1,
+            visit=visit,
+            error=error,
+        ))
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        """노드 함수 1개를 감쌈 (sync/async 유지, config 인자 전달 여부는 원본 시그니처 그대로)"""
+        if not self.enabled:
+            return fn
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def atraced(state, *args, **kwargs):
+                visit = self._begin(name)
+                out, error = None, None
+                t0 = time.perf_counter()
+                with track() as usage:
+                    try:
+                        out = await fn(state, *args, **kwargs)
+                        return out
+                    except Exception as e:
+                        error = f"{type(e).__name__}: {e}"
+                        raise
+                    finally:
+                        # async 노드의 CPU 시간 = executor 로 offload 된 작업 합계
+                        self._finish(name, visit, state, out, usage, time.perf_counter() - t0, usage.cpu_s, error)
+
+            return atraced
+
+        @functools.wraps(fn)
+        def traced(state, *args, **kwargs):
+            visit = self._begin(name)
+            out, error = None, None
+            t0 = time.perf_counter()
+            c0 = time.thread_time()
+            with track() as usage:
+                try:
+                    out = fn(state, *args, **kwargs)
+                    return out
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    raise
+                finally:
+                    cpu_s = time.thread_time() - c0 + usage.cpu_s
+                    self._finish(name, visit, state, out, usage, time.perf_counter() - t0, cpu_s, error)
+
+        return traced
+
+    def instrument(self, workflow):
+        """workflow.add_node 를 감싸서 이후 등록되는 모든 노드를 트레이싱"""
+        if not self.enabled:
+            return workflow
+
+        add_node = workflow.add_node
+
+        def traced_add_node(node, action=None, **kwargs):
+            if action is None and callable(node):
+                action = node
+                node = getattr(action, "__name__", None) or action.__class__.__name__
+            return add_node(node, self.wrap(node, action), **kwargs)
+
+        workflow.add_node = traced_add_node
+        return workflow
+
+    @contextmanager
+    def run(self) -> Iterator[Counter]:
+        """그래프 실행 1건 범위 (노드 방문 횟수 집계 -> RunSummary)"""
+        if not self.enabled:
+            yield Counter()
+            return
+
+        visits: Counter = Counter()
+        token = _visits.set(visits)
+        t0 = time.perf_counter()
+        error = None
+        try:
+            yield visits
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _visits.reset(token)
+            with _visits_lock:
+                counts = dict(visits)
+            self._emit_run(RunSummary(wall_s=time.perf_counter() - t0, visits=counts, error=error))
+
+
+def build_tracer(sink_names: Sequence[str], *, measure_state: bool = True) -> GraphTracer:
+    """settings.AGENT_TRACE_SINKS ("log" / "histogram") -> GraphTracer"""
+    sinks: List[TraceSink] = []
+    for sink_name in sink_names:
+        if sink_name == "log":
+            sinks.append(LogSink())
+        elif sink_name == "histogram":
+            sinks.append(TRACE_HISTOGRAM)
+        else:
+            raise ValueError(f"UNSUPPORTED_TRACE_SINK: {sink_name}")
+    return GraphTracer(sinks, measure_state=measure_state)
+
+
+TRACE_HISTOGRAM = HistogramSink()
+TRACER = build_tracer(settings.AGENT_TRACE_SINKS, measure_state=settings.AGENT_TRACE_STATE_SIZE)
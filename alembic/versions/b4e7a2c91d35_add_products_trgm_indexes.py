@@ -0,0 +1,59 @@
+"""add products trigram search indexes
+
+Revision ID: b4e7a2c91d35
+Revises: 792bb0e54847
+Create Date: 2026-10-19 10:12:31.482113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4e7a2c91d35"
+down_revision: Union[str, Sequence[str], None] = "792bb0e54847"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (인덱스 이름, 컬럼)
+TRGM_INDEXES = (
+    ("ix_products_name_trgm", "name"),
+    ("ix_products_brand_trgm", "brand"),
+    ("ix_products_rawmtrl_trgm", "rawmtrl"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    ✅ 목표: 상품 검색(ILIKE '%q%')이 인덱스를 타도록 pg_trgm GIN 인덱스 추가
+       - name / brand / rawmtrl(원재료) 3컬럼, 랭킹은 word_similarity (ProductRepository)
+       - 한글 음절도 trigram 으로 잘림 (DB 가 UTF-8 + C 가 아닌 locale 일 때, 예: en_US.UTF-8 / ko_KR.UTF-8)
+       - 2글자 이하 검색어는 trigram 이 없어 인덱스 대신 전체 인덱스 스캔으로 처리됨
+    ⚠️ CONCURRENTLY 로 생성 (운영 중 products 쓰기 잠금 없음) -> 트랜잭션 밖(autocommit)에서 실행
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for index_name, column in TRGM_INDEXES:
+            op.create_index(
+                index_name,
+                "products",
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    pg_trgm 확장은 다른 곳에서 쓸 수 있으니 남겨 둠 (인덱스만 제거)
+    """
+    with op.get_context().autocommit_block():
+        for index_name, _ in reversed(TRGM_INDEXES):
+            op.drop_index(index_name, table_name="products", postgresql_concurrently=True, if_exists=True)
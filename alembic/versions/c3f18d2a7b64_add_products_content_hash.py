@@ -0,0 +1,46 @@
+"""add products content_hash
+
+Revision ID: c3f18d2a7b64
+Revises: b4e7a2c91d35
+Create Date: 2026-10-19 15:40:07.213958
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f18d2a7b64"
+down_revision: Union[str, Sequence[str], None] = "b4e7a2c91d35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# scripts/load_products_from_original_csv.py 가 적재하는 컬럼 (product_id 제외, 같은 순서)
+HASHED_COLUMNS = (
+    "name", "brand", "category_id", "image_url",
+    "is_active", "quantity",
+    "rawmtrl", "allergymtrl",
+    "kcal", "protein_g", "fat_g", "ash_g", "carb_g", "sugar_g", "sodium_mg",
+    "cholesterol_mg", "sat_fat_g", "trans_fat_g",
+    "nutrient_basis_g", "serving_ref_g", "food_weight_g",
+    "gi", "gl",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    ✅ 목표: 상품 내용 해시 컬럼 추가 -> CSV 재적재 시 내용이 바뀐 행만 upsert (updated_at 유지)
+       - 해시 = md5(ROW(적재 컬럼...)::text), 로더의 staging 테이블과 같은 식
+       - 기존 행도 같은 식으로 채워 둠 -> 업그레이드 직후 첫 적재에서 전체 행이 바뀐 것으로 잡히지 않음
+       - updated_at 은 트리거가 없어(ORM onupdate) 채우는 UPDATE 로 바뀌지 않음
+    """
+    op.add_column("products", sa.Column("content_hash", sa.String(length=32), nullable=True))
+    op.execute(f"UPDATE products SET content_hash = md5(ROW({', '.join(HASHED_COLUMNS)})::text)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("products", "content_hash")
@@ -0,0 +1,50 @@
+"""add products updated_at indexes
+
+Revision ID: d2a9c47e1f03
+Revises: c3f18d2a7b64
+Create Date: 2026-10-19 17:05:42.618304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a9c47e1f03"
+down_revision: Union[str, Sequence[str], None] = "c3f18d2a7b64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (인덱스 이름, 컬럼)
+UPDATED_AT_INDEXES = (
+    ("ix_products_updated_at", ["updated_at"]),
+    ("ix_products_category_id_updated_at", ["category_id", "updated_at"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    ✅ 목표: 상품 목록 검증자(ProductRepository.list_version 의 max(updated_at))를 인덱스 끝 1건으로 조회
+       - 필터 없음: updated_at / 카테고리 필터: (category_id, updated_at)
+       - 검색어 필터는 trigram 인덱스로 범위를 좁힌 뒤 집계
+    ⚠️ CONCURRENTLY 로 생성 (운영 중 products 쓰기 잠금 없음) -> 트랜잭션 밖(autocommit)에서 실행
+    """
+    with op.get_context().autocommit_block():
+        for index_name, columns in UPDATED_AT_INDEXES:
+            op.create_index(
+                index_name,
+                "products",
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for index_name, _ in reversed(UPDATED_AT_INDEXES):
+            op.drop_index(index_name, table_name="products", postgresql_concurrently=True, if_exists=True)
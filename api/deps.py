@@ -5,20 +5,29 @@
 # # 중요:
 # # - /docs Authorize에는 토큰만 넣으면 됨 (HTTPBearer가 Bearer 자동)
 
+from functools import lru_cache
+
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from infra.db.session import get_db  # ✅ 하나로 통일
+from infra.db.session import get_db, get_read_db, get_async_db, get_async_read_db  # ✅ 하나로 통일 (async 라우트는 get_async_db)
 
-from infra.db.repositories.user_repo import UserRepository
-from infra.db.repositories.health_repo import HealthProfileRepository
-from infra.db.repositories.product_repo import ProductRepository
-from infra.db.repositories.cart_repo import CartRepository
+from infra.db.repositories.user_repo import UserRepository, AsyncUserRepository
+from infra.db.repositories.health_repo import HealthProfileRepository, AsyncHealthProfileRepository
+from infra.db.repositories.product_repo import ProductRepository, AsyncProductRepository, RequestProductCache
+from infra.db.repositories.cart_repo import AsyncCartRepository
+from infra.db.repositories.memory_product_repo import InMemoryProductRepository, AsyncInMemoryProductRepository
+from infra.db.store import STORE
 
 from domain.services.auth_service import AuthService
 from domain.services.user_service import UserService
 from domain.services.product_service import ProductService
 from domain.services.cart_service import CartService
+from domain.services.analysis_service import AnalysisService
+
+from ai.orchestrator.runner import GraphRunner, get_runner
+from infra.cache.count_cache import PRODUCT_COUNT_CACHE
+from infra.cache.detail_cache import PRODUCT_DETAIL_CACHE
 
 from app.security import decode_token, is_token_blacklisted
 from app.settings import settings
@@ -63,17 +72,67 @@ def get_current_user_id(
     return int(sub)
 
 # ✅ product도 get_db로 통일
-def get_product_repo(db=Depends(get_db)) -> ProductRepository:
-    return ProductRepository(db)
+@lru_cache(maxsize=1)
+def get_memory_product_repo() -> InMemoryProductRepository:
+    # 인덱스는 프로세스당 1번만 생성
+    if settings.PRODUCT_MEMORY_PATH:
+        return InMemoryProductRepository.from_file(settings.PRODUCT_MEMORY_PATH)
+    return InMemoryProductRepository.from_store(STORE)
+
+def get_product_repo(db=Depends(get_db), read_db=Depends(get_read_db)) -> ProductRepository:
+    # 요청당 1번 호출(FastAPI dependency 캐시) -> 같은 요청의 service 들이 RequestProductCache 공유
+    if settings.PRODUCT_BACKEND == "memory":
+        return get_memory_product_repo()
+    return RequestProductCache(ProductRepository(db, read_db))
 
 def get_product_service(repo: ProductRepository = Depends(get_product_repo)) -> ProductService:
-    return ProductService(repo)
-
-def get_cart_repo(db=Depends(get_db)) -> CartRepository:
-    return CartRepository(db)
-
-def get_cart_service(
-    cart_repo: CartRepository = Depends(get_cart_repo),
-    product_repo: ProductRepository = Depends(get_product_repo),
+    return ProductService(
+        repo,
+        count_strategy=settings.PRODUCT_COUNT_STRATEGY,
+        count_cache=PRODUCT_COUNT_CACHE,
+        detail_cache=PRODUCT_DETAIL_CACHE,
+    )
+
+def get_analysis_service(
+    user_service: UserService = Depends(get_user_service),
+    product_service: ProductService = Depends(get_product_service),
+) -> AnalysisService:
+    return AnalysisService(user_service, product_service)
+
+# ✅ async 스택 (async def 라우트 전용): 같은 service, repo 만 AsyncSession 기반
+def get_async_user_service(db=Depends(get_async_db)) -> UserService:
+    return UserService(AsyncUserRepository(db), AsyncHealthProfileRepository(db))
+
+def get_async_product_repo(db=Depends(get_async_db), read_db=Depends(get_async_read_db)) -> AsyncProductRepository:
+    if settings.PRODUCT_BACKEND == "memory":
+        return AsyncInMemoryProductRepository(get_memory_product_repo())
+    return AsyncProductRepository(db, read_db)
+
+def get_async_product_service(repo: AsyncProductRepository = Depends(get_async_product_repo)) -> ProductService:
+    return ProductService(
+        repo,
+        count_strategy=settings.PRODUCT_COUNT_STRATEGY,
+        count_cache=PRODUCT_COUNT_CACHE,
+        detail_cache=PRODUCT_DETAIL_CACHE,
+    )
+
+def get_async_cart_repo(db=Depends(get_async_db)) -> AsyncCartRepository:
+    return AsyncCartRepository(db)
+
+def get_async_cart_service(
+    cart_repo: AsyncCartRepository = Depends(get_async_cart_repo),
+    product_repo: AsyncProductRepository = Depends(get_async_product_repo),
 ) -> CartService:
-    return CartService(cart_repo, product_repo)
\ No newline at end of file
+    return CartService(cart_repo, product_repo)
+
+def get_async_analysis_service(
+    user_service: UserService = Depends(get_async_user_service),
+    product_service: ProductService = Depends(get_async_product_service),
+) -> AnalysisService:
+    return AnalysisService(user_service, product_service)
+
+def get_graph_runner() -> GraphRunner:
+    runner = get_runner()
+    if runner is None:
+        raise HTTPException(status_code=503, detail="AI_GRAPH_NOT_CONFIGURED")
+    return runner
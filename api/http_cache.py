@@ -0,0 +1,64 @@
+# 역할: HTTP 조건부 요청/캐시 헤더 helper (ETag / Last-Modified / Cache-Control)
+# - ETag 는 weak (W/"...") : 같은 데이터면 직렬화 방식이 달라도 같은 태그
+# - If-None-Match 가 있으면 그것만 보고, 없을 때만 If-Modified-Since 비교 (RFC 9110)
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return f'W/"{hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def cache_headers(
+    etag: str,
+    last_modified: Optional[datetime] = None,
+    *,
+    max_age: int = 60,
+    stale_while_revalidate: int = 0,
+) -> Dict[str, str]:
+    control = f"public, max-age={max_age}"
+    if stale_while_revalidate:
+        control += f", stale-while-revalidate={stale_while_revalidate}"
+    headers = {"ETag": etag, "Cache-Control": control}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {_strip_weak(t) for t in if_none_match.split(",")}
+        return "*" in tags or _strip_weak(etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP 날짜는 초 단위
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified(headers: Dict[str, str]) -> Response:
+    return Response(status_code=304, headers=headers)
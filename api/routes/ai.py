@@ -1,35 +1,69 @@
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from typing import Any, Dict
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List
 
-from api.deps import get_current_user_id, get_user_service, get_product_service
-from infra.db.repositories.generate_final_profile import generate_final_profile
-from ai.orchestrator.policy import RouterLogic
+from api.deps import (
+    get_current_user_id, get_user_service, get_product_service, get_graph_runner, get_analysis_service,
+    get_async_user_service, get_async_product_service, get_async_analysis_service,
+)
+from app.settings import settings
+from domain.services.analysis_service import AnalysisService, profile_flags, rule_decision
+from ai.orchestrator.checkpoint import analysis_thread_id
+from infra.cache.decision_cache import DECISION_CACHE, decision_key
 
 router = APIRouter(prefix="/api/v1/ai", tags=["AI"])
 
 class AnalyzeReq(BaseModel):
     product_id: int
 
+
+class AnalyzeBatchReq(BaseModel):
+    product_ids: List[int] = Field(min_length=1, max_length=settings.AI_ANALYZE_BATCH_MAX)
+
+
+def build_overall_state(user_id: int, product_id: int, health_profile: dict, product_detail: dict) -> Dict[str, Any]:
+    """분석 그래프/정책 입력 state 구성"""
+    return {
+        "user_id": str(user_id),
+        "product_id": str(product_id),
+        "name": product_detail.get("name", ""),
+        "user_profile": health_profile,
+        "product_data": product_detail,
+        
+        # 건강 정보 (diabetes_flag / hypertension_flag / kidneydisease_flag / allergy_flag)
+        **profile_flags(health_profile),
+        
+        # 분석 결과는 비워 둠 (그래프는 출력 키가 이미 있는 노드를 건너뜀)
+        "next_step": "",
+        "final_answer": ""
+    }
+
 @router.post("/analyze")
 def analyze(
     req: AnalyzeReq, 
     user_id: int = Depends(get_current_user_id),
     user_service = Depends(get_user_service),
-    product_service = Depends(get_product_service)
+    product_service = Depends(get_product_service),
+    analysis_service: AnalysisService = Depends(get_analysis_service),
 ) -> Dict[str, Any]:
     """
     사용자의 건강 프로필을 기반으로 상품을 AI 분석하는 엔드포인트
     
-    1. 사용자 건강 프로필 조회
-    2. 상품 정보 조회
-    3. Orchestrator 정책 실행
+    1. 사용자 건강 프로필 조회 (유저별 메모)
+    2. 판단 캐시 조회: (프로필 hash, 상품 id, 상품 updated_at, 규칙 버전)
+    3. miss 면 상품 정보 조회 + 규칙 판정 (/analyze/batch 와 같은 AnalysisService 판정) 후 캐시 저장
     4. 분석 결과 반환
     """
     
     try:
         # 1. 사용자 건강 프로필 조회
-        health_profile = user_service.get_my_profile(user_id=user_id)
+        cached_profile = DECISION_CACHE.get_profile(user_id)
+        if cached_profile is not None:
+            health_profile, p_hash = cached_profile
+        else:
+            health_profile = user_service.get_my_profile(user_id=user_id)
+            p_hash = DECISION_CACHE.remember_profile(user_id, health_profile) if health_profile else None
         
         if not health_profile:
             raise HTTPException(
@@ -37,79 +71,43 @@ def analyze(
                 detail="건강 프로필이 설정되지 않았습니다. 먼저 프로필을 완성해주세요."
             )
         
-        # 2. 상품 정보 조회
+        # 2. 판단 캐시 (상품 버전만 1컬럼 조회)
         try:
-            product_detail = product_service.get_product_detail(product_id=str(req.product_id))
+            updated_at = product_service.get_product_version(product_id=str(req.product_id))
         except ValueError as e:
             raise HTTPException(
                 status_code=404, 
                 detail="상품을 찾을 수 없습니다"
             )
+        cache_key = decision_key(p_hash, req.product_id, updated_at)
+        cached = DECISION_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # 3. Health Profile을 Flag 형식으로 변환
-        def convert_to_flag(value: str) -> int:
-            """질환 상태를 flag로 변환 (N/A 또는 없음 -> 0, 그 외 -> 1)"""
-            if not value or value.lower() in ["n/a", "none", ""]:
-                return 0
-            return 1
-        
-        diabetes_flag = convert_to_flag(health_profile.get("diabetes", "N/A"))
-        hypertension_flag = convert_to_flag(health_profile.get("hypertension", "N/A"))
-        kidneydisease_flag = convert_to_flag(health_profile.get("kidneydisease", "N/A"))
-        allergy_flag = convert_to_flag(health_profile.get("allergy", ""))
-        
-        # 4. Overall State 구성
-        overall_state = {
-            "user_id": str(user_id),
-            "product_id": str(req.product_id),
-            "name": product_detail.get("name", ""),
-            "user_profile": health_profile,
-            "product_data": product_detail,
-            
-            # 건강 정보
-            "diabetes_flag": diabetes_flag,
-            "hypertension_flag": hypertension_flag,
-            "kidneydisease_flag": kidneydisease_flag,
-            "allergy_flag": allergy_flag,
-            
-            # 분석 결과 (초기값)
-            "any_exceed": False,
-            "any_allergen": False,
-            "exceeded_nutrients": [],
-            "next_step": "",
-            "final_answer": ""
-        }
-        
-        # 5. Orchestrator 정책 실행
-        policy = RouterLogic()
-        next_step = policy.run(overall_state)
-        
-        # 6. 결과 구성
-        decision = "safe"  # 기본값
-        reason_summary = ""
-        alternatives = []
-        
-        # 정책에 따른 결과 해석
-        if next_step == "end" and not overall_state.get("any_exceed") and not overall_state.get("any_allergen"):
-            decision = "safe"
-            reason_summary = f"✅ {product_detail.get('name')}은(는) 건강 프로필상 안전한 상품입니다."
-        elif overall_state.get("any_exceed") or overall_state.get("any_allergen"):
-            decision = "warning"
-            exceed_list = overall_state.get("exceeded_nutrients", [])
-            allergen_info = " 알러지 유발 성분이 포함되어 있습니다." if overall_state.get("any_allergen") else ""
-            reason_summary = f"⚠️ 이 상품은 {', '.join(exceed_list) if exceed_list else '건강 기준'}에 맞지 않습니다.{allergen_info}"
-        else:
-            decision = "caution"
-            reason_summary = f"⚡ {product_detail.get('name')}을(를) 섭취할 때 주의가 필요합니다."
+        # 3. 상품 정보 조회
+        try:
+            product_detail = product_service.get_product_detail(product_id=str(req.product_id))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=404, 
+                detail="상품을 찾을 수 없습니다"
+            )
         
-        return {
+        # 4. 규칙 판정 (임계값 비교 + RouterLogic 분기, /analyze/batch 와 동일)
+        item = analysis_service.analyze_product(
+            user_id=user_id, health_profile=health_profile, product_detail=product_detail,
+        )
+
+        result = {
             "status": "ok",
-            "decision": decision,
-            "reason_summary": reason_summary,
-            "alternatives": alternatives,
-            "product_name": product_detail.get("name", ""),
-            "next_step": next_step
+            "decision": item["decision"],
+            "reason_summary": item["reason_summary"],
+            "alternatives": [],
+            "product_name": item["product_name"],
+            "next_step": item["next_step"],
         }
+        DECISION_CACHE.set(cache_key, p_hash, result)
+        return result
         
     except HTTPException:
         raise
@@ -118,3 +116,93 @@ def analyze(
             status_code=500,
             detail=f"분석 중 오류가 발생했습니다: {str(e)}"
         )
+
+
+@router.post("/analyze/batch")
+def analyze_batch(
+    req: AnalyzeBatchReq,
+    user_id: int = Depends(get_current_user_id),
+    service: AnalysisService = Depends(get_analysis_service),
+) -> ORJSONResponse:
+    """
+    상품 그리드용 일괄 분석 (규칙 기반: 질환 flag + 영양성분 임계값)
+    - 프로필 1번 조회, 상품 IN 쿼리 1번, 임계값 일괄 비교
+    - 없는 상품 id 는 missing 으로 반환
+    - 결과는 str/bool/list 뿐이라 jsonable_encoder 순회 없이 바로 orjson 직렬화
+    """
+    try:
+        result = service.analyze_batch(user_id=user_id, product_ids=[str(x) for x in req.product_ids])
+    except ValueError as e:
+        if str(e) == "HEALTH_PROFILE_REQUIRED":
+            raise HTTPException(
+                status_code=400,
+                detail="건강 프로필이 설정되지 않았습니다. 먼저 프로필을 완성해주세요."
+            )
+        if str(e) == "USER_NOT_FOUND":
+            raise HTTPException(status_code=404, detail="USER_NOT_FOUND")
+        raise HTTPException(status_code=400, detail=str(e))
+    return ORJSONResponse(result)
+
+
+@router.post("/analyze/graph")
+async def analyze_graph(
+    req: AnalyzeReq,
+    user_id: int = Depends(get_current_user_id),
+    user_service = Depends(get_async_user_service),
+    product_service = Depends(get_async_product_service),
+    analysis_service: AnalysisService = Depends(get_async_analysis_service),
+    runner = Depends(get_graph_runner),
+) -> Dict[str, Any]:
+    """
+    LangGraph 파이프라인(임계값 결과 + LLM 알러지 분석 -> 최종 분기)으로 분석하는 async 엔드포인트
+    - DB 조회는 AsyncSession, 그래프는 app.ainvoke 로 실행 -> threadpool 없이 이벤트 루프를 막지 않음
+    - 실행기는 앱 기동 시 warm-up 후 등록 (app.main), 등록 전에는 503 AI_GRAPH_NOT_CONFIGURED
+    """
+    try:
+        health_profile = await user_service.aget_my_profile(user_id=user_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="USER_NOT_FOUND")
+    if not health_profile:
+        raise HTTPException(
+            status_code=400,
+            detail="건강 프로필이 설정되지 않았습니다. 먼저 프로필을 완성해주세요."
+        )
+
+    try:
+        product_detail = await product_service.aget_product_detail(product_id=str(req.product_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다")
+
+    try:
+        # 같은 (user, product, 프로필 버전) -> 같은 스레드: 실패 시 재개, 완료 시 마지막 결과 재사용
+        state = {
+            **build_overall_state(user_id, req.product_id, health_profile, product_detail),
+            **analysis_service.graph_inputs(
+                user_id=user_id, health_profile=health_profile, product_detail=product_detail,
+            ),
+        }
+        final_state = await runner.arun(
+            state,
+            thread_id=analysis_thread_id(user_id, req.product_id, health_profile),
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"분석 중 오류가 발생했습니다: {str(e)}"
+        )
+
+    name = product_detail.get("name", "")
+    decision, reason_summary = rule_decision(
+        name,
+        final_state.get("exceeded_nutrients") or [],
+        any_allergen=bool(final_state.get("any_allergen")),
+    )
+
+    return {
+        "status": "ok",
+        "decision": decision,
+        "reason_summary": reason_summary,
+        "alternatives": final_state.get("sub_recommendations", []),
+        "product_name": name,
+        "next_step": final_state.get("next_step", "end"),
+    }
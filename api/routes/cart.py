@@ -1,21 +1,22 @@
 # 역할: 장바구니 API (HTTP 처리만)
 # - 실제 로직은 service로 위임
 # - 인증은 api/deps.py의 get_current_user_id 사용 (Bearer Token)
+# - async def + AsyncSession 스택 (get_async_cart_service) -> threadpool 없이 DB I/O 대기
 
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from api.schemas.cart import CartAddRequest, CartItemResponse, CartListResponse
-from api.deps import get_cart_service, get_current_user_id
+from api.deps import get_async_cart_service, get_current_user_id
 from domain.services.cart_service import CartService
 
 router = APIRouter(prefix="/api/v1/cart", tags=["cart"])
 
 
 @router.post("", response_model=CartItemResponse, status_code=status.HTTP_201_CREATED)
-def add_to_cart(
+async def add_to_cart(
     payload: CartAddRequest,
     user_id: int = Depends(get_current_user_id),
-    service: CartService = Depends(get_cart_service),
+    service: CartService = Depends(get_async_cart_service),
 ):
     # 1) 정규화: "0010" -> "10"
     try:
@@ -25,7 +26,7 @@ def add_to_cart(
 
     # 2) 서비스 호출 + 에러 매핑
     try:
-        item = service.add_item(
+        item = await service.aadd_item(
             user_id=user_id,
             product_id=product_id,
             analysis_snapshot=payload.analysis_snapshot,
@@ -40,22 +41,22 @@ def add_to_cart(
     
 
 @router.get("", response_model=CartListResponse)
-def list_cart(
+async def list_cart(
     user_id: int = Depends(get_current_user_id),
-    service: CartService = Depends(get_cart_service),
+    service: CartService = Depends(get_async_cart_service),
 ):
-    items = service.list_items(user_id=user_id)
+    items = await service.alist_items(user_id=user_id)
     return {"items": items}
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_cart_item(
+async def delete_cart_item(
     item_id: int,
     user_id: int = Depends(get_current_user_id),
-    service: CartService = Depends(get_cart_service),
+    service: CartService = Depends(get_async_cart_service),
 ):
     try:
-        service.remove_item(user_id=user_id, item_id=item_id)
+        await service.aremove_item(user_id=user_id, item_id=item_id)
     except ValueError as e:
         if str(e) == "CART_ITEM_NOT_FOUND":
             raise HTTPException(status_code=404, detail="CART_ITEM_NOT_FOUND")
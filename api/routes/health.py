@@ -0,0 +1,35 @@
+# 역할: 로드밸런서용 readiness 엔드포인트
+# - LLM warm-up 이 끝나기 전에는 503 -> cold worker 로 트래픽이 가지 않음
+# - 분석 그래프 노드별 지연/토큰/state 크기 (Prometheus 텍스트 + JSON 요약)
+# - DB 커넥션 풀 checkout / 대기 시간 / overflow (Prometheus 텍스트 + JSON 요약)
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from ai.orchestrator.tracing import TRACE_HISTOGRAM
+from infra.db.pool_metrics import POOL_METRICS
+from infra.llm.warmup import WARMUP
+
+router = APIRouter(tags=["health"])
+
+@router.get("/readyz")
+def readyz():
+    snapshot = WARMUP.snapshot()
+    status_code = 200 if WARMUP.is_ready else 503
+    return JSONResponse(status_code=status_code, content=snapshot)
+
+@router.get("/metrics/agents", response_class=PlainTextResponse)
+def agent_metrics():
+    return PlainTextResponse(TRACE_HISTOGRAM.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@router.get("/metrics/agents/summary")
+def agent_metrics_summary():
+    return TRACE_HISTOGRAM.snapshot()
+
+@router.get("/metrics/db", response_class=PlainTextResponse)
+def db_pool_metrics():
+    return PlainTextResponse(POOL_METRICS.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+@router.get("/metrics/db/summary")
+def db_pool_metrics_summary():
+    return POOL_METRICS.snapshot()
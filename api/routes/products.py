@@ -1,35 +1,79 @@
 # 역할: 상품 목록/상세 조회 API (HTTP 처리만)
 # - 실제 로직은 service에 위임
+# - ETag / Last-Modified (products.updated_at) + Cache-Control, If-None-Match 일치 시 304
+#   (목록은 집계 1번으로 검증자를 먼저 구해 304 면 페이지 조회 없음)
+# - 응답은 response_model 재검증 없이 스키마 필드만 골라 ORJSONResponse 로 반환
+# - 목록은 async def + AsyncSession 스택 (get_async_product_service)
 
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 
-from api.schemas.products import ProductListResponse, ProductDetailResponse
-from api.deps import get_product_service
+from api.http_cache import cache_headers, is_not_modified, make_etag, not_modified
+from api.schemas.products import ProductListResponse, ProductDetailResponse, detail_payload, list_payload
+from api.deps import get_product_service, get_async_product_service
+from app.settings import settings
 from domain.services.product_service import ProductService
 
 router = APIRouter(prefix="/api/v1/products", tags=["products"])
 
 @router.get("", response_model=ProductListResponse)
-def list_products(
+async def list_products(
+    request: Request,
     category: Optional[str] = Query(default=None),
     q: Optional[str] = Query(default=None),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    service: ProductService = Depends(get_product_service),
+    cursor: Optional[str] = Query(default=None, description="이전 응답의 next_cursor (있으면 offset 무시)"),
+    service: ProductService = Depends(get_async_product_service),
 ):
     # # 역할: 메인/카테고리 상품 리스트 (필터 포함)
-    return service.list_products(category=category, q=q, limit=limit, offset=offset)
+    try:
+        # 목록 버전 = 필터 범위 (max(updated_at), total) + 요청 파라미터 -> 페이지 조회 전에 304 판단
+        version = await service.alist_version(category=category, q=q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    last_modified = version["updated_at"]
+    etag = make_etag("products", category, q, limit, offset, cursor, last_modified, version["total"])
+    headers = cache_headers(
+        etag, last_modified,
+        max_age=settings.PRODUCT_CACHE_MAX_AGE_S,
+        stale_while_revalidate=settings.PRODUCT_CACHE_STALE_S,
+    )
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(headers)
+
+    try:
+        result = await service.alist_products(
+            category=category, q=q, limit=limit, offset=offset, cursor=cursor, version=version,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return ORJSONResponse(list_payload(result), headers=headers)
 
 @router.get("/{product_id}", response_model=ProductDetailResponse)
 def get_product_detail(
     product_id: str,
+    request: Request,
     service: ProductService = Depends(get_product_service),
 ):
     # # 역할: 상세 페이지 상품 조회 (영양성분/설명 포함)
     try:
-        return service.get_product_detail(product_id=product_id)
+        detail, updated_at = service.get_product_detail_versioned(product_id=product_id)
     except ValueError as e:
         if str(e) == "PRODUCT_NOT_FOUND":
             raise HTTPException(status_code=404, detail="PRODUCT_NOT_FOUND")
         raise HTTPException(status_code=400, detail=str(e))
+
+    etag = make_etag("product", detail["product_id"], updated_at)
+    headers = cache_headers(
+        etag, updated_at,
+        max_age=settings.PRODUCT_CACHE_MAX_AGE_S,
+        stale_while_revalidate=settings.PRODUCT_CACHE_STALE_S,
+    )
+    if is_not_modified(request, etag, updated_at):
+        return not_modified(headers)
+
+    return ORJSONResponse(detail_payload(detail), headers=headers)
@@ -3,6 +3,8 @@
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
+from api.schemas.products import ProductSummary
+
 class CartAddRequest(BaseModel):
     product_id: str = Field(..., min_length=1)
     analysis_snapshot: Optional[Dict[str, Any]] = None  # 없어도 됨(MVP)
@@ -11,6 +13,7 @@ class CartItemResponse(BaseModel):
     item_id: int
     product_id: str
     analysis_snapshot: Optional[Dict[str, Any]] = None
+    product: Optional[ProductSummary] = None  # 목록 조회 시 상품 요약 (담기 응답/삭제된 상품은 None)
 
 class CartListResponse(BaseModel):
     items: List[CartItemResponse] = Field(default_factory=list)
\ No newline at end of file
@@ -16,10 +16,13 @@ class ProductSummary(BaseModel):
 
 
 class ProductListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None      # count 전략이 "has_more" 면 None
+    total_estimated: bool = False    # True 면 통계 기반 추정치
+    has_more: bool = False
     limit: int
     offset: int
     items: List[ProductSummary]
+    next_cursor: Optional[str] = None  # 다음 페이지 요청 시 cursor 로 그대로 전달 (마지막 페이지면 None)
 
 
 class ProductDetailResponse(BaseModel):
@@ -50,4 +53,43 @@ class ProductDetailResponse(BaseModel):
 
     inferred_types: List[str] = Field(default_factory=list)
 
-    nutrients: Dict[str, Any] = Field(default_factory=dict)
\ No newline at end of file
+    nutrients: Dict[str, Any] = Field(default_factory=dict)
+
+
+# -------------------------
+# 응답 payload (재검증 없이 직렬화)
+# - repository 가 이미 스키마 모양 dict 를 만들므로 response_model 검증을 다시 거치지 않고
+#   스키마 필드만 골라 ORJSONResponse 로 바로 반환 (response_model 은 OpenAPI 문서용으로 유지)
+# -------------------------
+def _field_defaults(model) -> Dict[str, Any]:
+    return {name: field.get_default(call_default_factory=True) for name, field in model.model_fields.items()}
+
+
+SUMMARY_DEFAULTS = _field_defaults(ProductSummary)
+DETAIL_DEFAULTS = _field_defaults(ProductDetailResponse)
+
+
+def _project(data: dict, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    payload = {name: data.get(name, default) for name, default in defaults.items()}
+    payload["product_id"] = int(payload["product_id"])  # repository 는 str, 스키마는 int
+    return payload
+
+
+def summary_payload(item: dict) -> Dict[str, Any]:
+    return _project(item, SUMMARY_DEFAULTS)
+
+
+def detail_payload(detail: dict) -> Dict[str, Any]:
+    return _project(detail, DETAIL_DEFAULTS)
+
+
+def list_payload(result: dict) -> Dict[str, Any]:
+    return {
+        "total": result.get("total"),
+        "total_estimated": result.get("total_estimated", False),
+        "has_more": result.get("has_more", False),
+        "limit": result["limit"],
+        "offset": result["offset"],
+        "items": [summary_payload(it) for it in result["items"]],
+        "next_cursor": result.get("next_cursor"),
+    }
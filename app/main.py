@@ -1,19 +1,60 @@
  # 역할: FastAPI 앱 생성 + 라우터 연결(서버 시작점)
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from api.routes.auth import router as auth_router
 from api.routes.users import router as users_router
 from api.routes.products import router as products_router
 from api.routes.ai import router as ai_router
 from api.routes.cart import router as cart_router
+from api.routes.health import router as health_router
+from app.settings import settings
+from ai.orchestrator.runner import build_service_runner, configure_runner, get_runner
+from infra.llm.warmup import WARMUP
+
+
+async def register_graph_runner() -> None:
+    """warm-up 이 끝나면 분석 그래프 실행기 등록 (/analyze/graph). 로드 실패 시 등록하지 않음 (503 유지)"""
+    # 스레드 대기는 짧게 끊어서 (종료 시 task 취소 후 executor 스레드가 남지 않게)
+    while not await asyncio.to_thread(WARMUP.wait, 1.0):
+        pass
+    if not WARMUP.is_ready:
+        return
+    try:
+        configure_runner(build_service_runner(max_in_flight=settings.AGENT_GRAPH_MAX_IN_FLIGHT))
+    except Exception as e:
+        print(f"--- [Graph] 실행기 등록 실패: {type(e).__name__}: {e} ---")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 모델 로드 + warm-up 은 백그라운드 스레드에서 (서버는 바로 뜨고 /readyz 는 완료 후 200)
+    WARMUP.start(settings.LLM_WARMUP_AGENTS, max_new_tokens=settings.LLM_WARMUP_MAX_NEW_TOKENS)
+
+    # 그래프는 CHATagent(알러지 분석) 모델이 있어야 실행 가능
+    register_task = None
+    if "CHATagent" in settings.LLM_WARMUP_AGENTS:
+        register_task = asyncio.create_task(register_graph_runner())
 
-app = FastAPI(title="AI-NutriCurator API")
+    yield
+
+    if register_task is not None:
+        register_task.cancel()
+    runner = get_runner()
+    configure_runner(None)
+    if runner is not None:
+        await runner.aclose()
+
+
+# 기본 응답 직렬화는 orjson (stdlib json 대비 큰 목록/배치 응답에서 빠름)
+app = FastAPI(title="AI-NutriCurator API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.include_router(auth_router)
 app.include_router(users_router)
 app.include_router(products_router)
 app.include_router(ai_router)    
 app.include_router(cart_router)
-
-
-
+app.include_router(health_router)
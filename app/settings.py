@@ -34,6 +34,82 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: int = 5432
 
+    # 읽기 전용 replica (None 이면 읽기도 primary 사용, 계정/DB 이름은 primary 와 같음)
+    POSTGRES_REPLICA_HOST: str | None = None
+    POSTGRES_REPLICA_PORT: int | None = None   # None 이면 POSTGRES_PORT
+
+    # 커넥션 풀 (엔진마다 = 워커 프로세스마다 적용: 최대 연결 수 = 워커 수 x (SIZE + OVERFLOW))
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_S: float = 30.0      # 풀이 가득 찼을 때 checkout 대기 상한
+    DB_POOL_RECYCLE_S: int = 1800        # 이보다 오래된 연결은 checkout 시 교체 (-1: 사용 안 함)
+    # True: checkout 마다 ping 1회 (끊긴 연결 즉시 감지, 왕복 1회 추가)
+    # False: ping 없이 RECYCLE_S 로만 교체 (서버/프록시 idle timeout 보다 짧게 둘 것)
+    DB_POOL_PRE_PING: bool = True
+
+    # 상품 목록 total 계산 방식
+    # "exact": 매 요청 count(*) / "estimated": pg_class.reltuples 또는 EXPLAIN 추정치
+    # "cached": (category, q) 별 count(*) 를 TTL 동안 재사용 / "has_more": total 없이 다음 페이지 여부만
+    PRODUCT_COUNT_STRATEGY: str = "exact"
+    PRODUCT_COUNT_CACHE_TTL_S: float = 60.0
+
+    # 상품 API HTTP 캐시 (ETag / Last-Modified = products.updated_at)
+    PRODUCT_CACHE_MAX_AGE_S: int = 60           # 브라우저/CDN Cache-Control max-age
+    PRODUCT_CACHE_STALE_S: int = 300            # stale-while-revalidate
+    PRODUCT_DETAIL_CACHE_SIZE: int = 2048       # 프로세스 내 상세 응답 캐시 (hot 상품)
+    PRODUCT_DETAIL_CACHE_FRESH_S: float = 30.0  # 이 시간 동안은 DB 재확인 없이 캐시 사용
+
+    # 상품 저장소: "db"(Postgres) | "memory"(DB 없는 데모/오프라인, n-gram 검색 인덱스)
+    PRODUCT_BACKEND: str = "db"
+    PRODUCT_MEMORY_PATH: str | None = None   # 예) "infra/db/JSON_DB.json" (None 이면 InMemoryStore.products)
+
+    # =========================
+    # LLM 추론 (CPU 전용 replica 는 LLM_DEVICE=cpu + LLM_QUANTIZATION 지정)
+    # =========================
+    LLM_DEVICE: str = "auto"
+    LLM_DTYPE: str = "float16"
+    LLM_QUANTIZATION: str | None = None   # None | "int8" | "int4" | "dynamic"
+    LLM_NUM_THREADS: int | None = None    # None 이면 torch 기본값
+
+    # startup 에서 백그라운드 로드 + warm-up 할 에이전트 (예: ["CHATagent"])
+    # 비어 있으면 warm-up 없이 바로 ready
+    LLM_WARMUP_AGENTS: list[str] = []
+    LLM_WARMUP_MAX_NEW_TOKENS: int = 8
+
+    # (opt-in) speculative decoding: 같은 토크나이저 계열의 소형 draft 모델
+    # 예: "Qwen/Qwen2.5-0.5B-Instruct" / None 이면 비활성
+    LLM_DRAFT_MODEL: str | None = None
+    LLM_NUM_ASSISTANT_TOKENS: int = 5     # draft 가 한 번에 제안하는 토큰 수
+
+    # LLM 백엔드: "hf"(프로세스 내 model.generate) | "http"(OpenAI 호환 서버)
+    LLM_BACKEND: str = "hf"
+    LLM_HTTP_BASE_URL: str = "http://localhost:8001/v1"
+    LLM_HTTP_MODEL: str | None = None     # None 이면 에이전트 설정의 model_name
+    LLM_HTTP_API_KEY: str | None = None
+    LLM_HTTP_TIMEOUT_S: float = 30.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 8     # keep-alive 커넥션 풀 크기
+    LLM_HTTP_MAX_CONCURRENCY: int = 8     # 동시 요청 상한
+
+    # 에이전트 async(arun) executor 크기
+    AGENT_CPU_WORKERS: int = 8            # 임계값/후보 검색/점수 계산
+    AGENT_LLM_WORKERS: int = 2            # generate / LLM HTTP 호출 (GPU 1장이면 작게)
+
+    # 분석 그래프 노드 트레이싱 ("log": 구조화 로그, "histogram": 메모리 히스토그램 + /metrics/agents)
+    AGENT_TRACE_SINKS: list[str] = ["histogram"]
+    AGENT_TRACE_STATE_SIZE: bool = True   # 노드별 state 직렬화 크기 측정 (json 직렬화 비용 있음)
+    AGENT_MAX_NODE_VISITS: int = 2        # 요청 1건에서 orch_agent 가 같은 노드로 보낼 수 있는 최대 횟수
+    AGENT_CHECKPOINT_PATH: str | None = None  # 예) "data/agent_checkpoints.sqlite" (None 이면 체크포인트 없음)
+    # /analyze/graph 동시 실행 그래프 수 상한 (None 이면 제한 없음, 실행기는 LLM_WARMUP_AGENTS 에 CHATagent 가 있을 때만 등록)
+    AGENT_GRAPH_MAX_IN_FLIGHT: int | None = None
+
+    # POST /api/v1/ai/analyze/batch 한 번에 받을 최대 상품 수
+    AI_ANALYZE_BATCH_MAX: int = 50
+
+    # /api/v1/ai/analyze 판단 캐시 (LRU + 선택적 공유 테이블)
+    AI_DECISION_CACHE_SIZE: int = 10000
+    AI_DECISION_CACHE_URL: str | None = None   # 예) "sqlite:///data/decision_cache.sqlite" 또는 Postgres URL
+    AI_DECISION_PROFILE_TTL_S: float = 30.0    # 프로필 메모 유지 시간 (다른 워커의 프로필 변경 반영 지연 상한)
+
     @computed_field
     @property
     def DATABASE_URL(self) -> str:
@@ -42,4 +118,33 @@ class Settings(BaseSettings):
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @computed_field
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        # psycopg 3 async 드라이버 (create_async_engine 용)
+        return (
+            f"postgresql+psycopg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
+    @computed_field
+    @property
+    def DATABASE_REPLICA_URL(self) -> str | None:
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return (
+            f"postgresql+psycopg2://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_REPLICA_HOST}:{self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
+    @computed_field
+    @property
+    def ASYNC_DATABASE_REPLICA_URL(self) -> str | None:
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return (
+            f"postgresql+psycopg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_REPLICA_HOST}:{self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
 settings = Settings()
\ No newline at end of file
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from sqlalchemy import Integer, String, Boolean, DateTime, func, Text, UniqueConstraint,Float
+from sqlalchemy import Integer, String, Boolean, DateTime, func, Text, UniqueConstraint,Float, null
 from sqlalchemy.orm import Mapped, mapped_column
 from domain.models.base import Base
 
@@ -50,4 +50,8 @@ class Product(Base):
     food_weight_g: Mapped[float | None] = mapped_column(Float, nullable=True)
 
     gi: Mapped[float | None] = mapped_column(Float, nullable=True)
-    gl: Mapped[float | None] = mapped_column(Float, nullable=True)
\ No newline at end of file
+    gl: Mapped[float | None] = mapped_column(Float, nullable=True)
+
+    # 적재 컬럼 내용 해시 (md5 hex) - CSV 재적재 시 바뀐 행만 upsert
+    # ORM 으로 수정하면 NULL 로 비움 -> 다음 CSV 적재 때 해시가 달라 그 행은 다시 덮어씀 (stale 해시로 건너뛰지 않음)
+    content_hash: Mapped[str | None] = mapped_column(String(32), nullable=True, onupdate=null())
\ No newline at end of file
@@ -0,0 +1,158 @@
+# 역할: 상품 분석(규칙 기반) 유스케이스
+# - 프로필 -> 질환 flag -> final_profile(임계값) 은 요청당 1번만 계산
+# - 상품 여러 개는 IN 쿼리 1번으로 조회하고, 임계값은 영양성분 컬럼 단위로 한 번에 비교
+# - LLM 이 필요한 알러지 분석은 여기서 하지 않음 (/analyze/graph 담당)
+# - 판정(decision / reason_summary)은 rule_decision 하나로 /analyze, /analyze/batch, /analyze/graph 공통
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from ai.orchestrator.routing import RoutingEngine
+from infra.db.repositories.generate_final_profile import generate_final_profile
+
+# final_profile 키 -> 상품 상세 dict 키
+NUTRIENT_COLUMNS = {
+    "kcal": "calories",
+    "sugar": "sugar",
+    "sodium": "sodium",
+    "protein": "protein",
+    "phosphorus": "phosphorus",
+    "calcium": "calcium",
+    "potassium": "potassium",
+}
+# 상한이 아닌 기준 (권장 최소량 등) / 비교 대상이 아닌 키
+NON_LIMIT_KEYS = {"user_id", "restricted_ingredients", "potassium_min"}
+
+FLAG_SOURCES = {
+    "diabetes_flag": ("diabetes", "N/A"),
+    "hypertension_flag": ("hypertension", "N/A"),
+    "kidneydisease_flag": ("kidneydisease", "N/A"),
+    "allergy_flag": ("allergy", ""),
+}
+
+
+def convert_to_flag(value) -> int:
+    """질환 상태를 flag로 변환 (N/A / na / 없음 -> 0, 그 외 -> 1). Enum 컬럼 값도 허용"""
+    value = getattr(value, "value", value)
+    if not value or str(value).lower() in ["n/a", "na", "none", ""]:
+        return 0
+    return 1
+
+
+def profile_flags(health_profile: dict) -> Dict[str, int]:
+    return {flag: convert_to_flag(health_profile.get(key, default)) for flag, (key, default) in FLAG_SOURCES.items()}
+
+
+def _column(products: List[dict], nutrient: str) -> List[Optional[float]]:
+    if nutrient == "fat_ratio":
+        # 지방 칼로리 / 총 칼로리 (지방 1g = 9kcal)
+        return [
+            (p.get("fat") or 0) * 9 / p["calories"] if p.get("calories") else None
+            for p in products
+        ]
+    key = NUTRIENT_COLUMNS.get(nutrient, nutrient)
+    return [p.get(key) for p in products]
+
+
+def evaluate_thresholds(final_profile: dict, products: List[dict]) -> List[List[str]]:
+    """
+    상품 리스트 전체를 임계값별로 한 번에 비교 -> 상품별 초과 영양성분 리스트
+    (EvidenceGeneration.threshold_update 와 같은 기준, 값이 없는 성분 / 0 이하 기준은 제외)
+    """
+    exceeded: List[List[str]] = [[] for _ in products]
+    for nutrient, limit in final_profile.items():
+        if nutrient in NON_LIMIT_KEYS or not isinstance(limit, (int, float)) or limit <= 0:
+            continue
+        for i, value in enumerate(_column(products, nutrient)):
+            if value is not None and value > limit:
+                exceeded[i].append(nutrient)
+    return exceeded
+
+
+def rule_decision(
+    name: str,
+    exceeded_nutrients: List[str],
+    *,
+    any_allergen: bool = False,
+    next_step: str = "end",
+) -> Tuple[str, str]:
+    """
+    (decision, reason_summary) - /analyze, /analyze/batch, /analyze/graph 공통 판정
+    - 임계값 초과 또는 알러지 -> warning
+    - 질환은 있지만 초과 없음 (RouterLogic -> chat_agent) -> caution
+    - 그 외 -> safe
+    """
+    if exceeded_nutrients or any_allergen:
+        allergen_info = " 알러지 유발 성분이 포함되어 있습니다." if any_allergen else ""
+        target = ", ".join(exceeded_nutrients) if exceeded_nutrients else "건강 기준"
+        return "warning", f"⚠️ 이 상품은 {target}에 맞지 않습니다.{allergen_info}"
+    if next_step == "chat_agent":
+        return "caution", f"⚡ {name}을(를) 섭취할 때 주의가 필요합니다."
+    return "safe", f"✅ {name}은(는) 건강 프로필상 안전한 상품입니다."
+
+
+class AnalysisService:
+    def __init__(self, user_service, product_service, routing: Optional[RoutingEngine] = None):
+        self.user_service = user_service
+        self.product_service = product_service
+        self.routing = routing or RoutingEngine()
+
+    def final_profile(self, *, user_id: int, health_profile: dict, flags: Dict[str, int]) -> dict:
+        user_diseases = {flag.replace("_flag", ""): v for flag, v in flags.items()}
+        return generate_final_profile(user_id, user_diseases, health_profile.get("weight"))
+
+    def graph_inputs(self, *, user_id: int, health_profile: dict, product_detail: dict) -> Dict[str, Any]:
+        """
+        /analyze/graph 입력 state 에 넣을 임계값 결과 (chat_agent 출력 키와 같은 이름)
+        -> 그래프는 chat_agent 를 skip 하고 /analyze, /analyze/batch 와 같은 기준을 사용
+        """
+        flags = profile_flags(health_profile)
+        final_profile = self.final_profile(user_id=user_id, health_profile=health_profile, flags=flags)
+        exceeded = evaluate_thresholds(final_profile, [product_detail])[0]
+        return {"final_profile": final_profile, "any_exceed": bool(exceeded), "exceeded_nutrients": exceeded}
+
+    def _decide(self, flags: Dict[str, int], product: dict, exceeded_nutrients: List[str]) -> Dict[str, Any]:
+        """상품 1개 규칙 판정 (임계값 결과 + RouterLogic 분기)"""
+        state = {**flags, "any_exceed": bool(exceeded_nutrients), "any_allergen": False}
+        next_step = self.routing.decide(state)
+        name = product.get("name", "")
+        decision, reason_summary = rule_decision(name, exceeded_nutrients, next_step=next_step)
+        return {
+            "product_id": product["product_id"],
+            "product_name": name,
+            "decision": decision,
+            "reason_summary": reason_summary,
+            "exceeded_nutrients": exceeded_nutrients,
+            "next_step": next_step,
+        }
+
+    def analyze_product(self, *, user_id: int, health_profile: dict, product_detail: dict) -> Dict[str, Any]:
+        """/analyze: 상품 1개 (analyze_batch 와 같은 판정)"""
+        flags = profile_flags(health_profile)
+        final_profile = self.final_profile(user_id=user_id, health_profile=health_profile, flags=flags)
+        exceeded = evaluate_thresholds(final_profile, [product_detail])[0]
+        return self._decide(flags, product_detail, exceeded)
+
+    def analyze_batch(self, *, user_id: int, product_ids: List[str]) -> Dict[str, Any]:
+        # 1) 프로필은 1번만
+        health_profile = self.user_service.get_my_profile(user_id=user_id)
+        if not health_profile:
+            raise ValueError("HEALTH_PROFILE_REQUIRED")
+
+        flags = profile_flags(health_profile)
+        final_profile = self.final_profile(user_id=user_id, health_profile=health_profile, flags=flags)
+
+        # 2) 상품은 IN 쿼리 1번
+        ids = list(dict.fromkeys(str(x) for x in product_ids))
+        found = self.product_service.get_products_detail(product_ids=ids)
+        products = [found[pid] for pid in ids if pid in found]
+
+        # 3) 임계값 일괄 비교
+        exceeded = evaluate_thresholds(final_profile, products)
+
+        return {
+            "status": "ok",
+            "items": [self._decide(flags, p, e) for p, e in zip(products, exceeded)],
+            "missing": [pid for pid in ids if pid not in found],
+        }
@@ -1,10 +1,32 @@
 # 역할: 장바구니 유스케이스
 # - 중복 담기 방지(같은 product_id면 기존 item 반환)
 # - product_id 숫자 검증 + products 존재 검증
+# - 목록 조회 시 상품 요약을 한 번에 붙여 반환 (N+1 없음)
+# - a* 메서드: AsyncCartRepository / AsyncProductRepository 주입 시 (async def 라우트용, 같은 규칙)
 
 from typing import Optional, Dict, Any, List
 
 
+def _normalize_product_id(product_id: str) -> str:
+    # product_id 정규화 + 숫자 검증 ("0010" -> "10")
+    try:
+        return str(int(str(product_id).strip()))
+    except ValueError:
+        raise ValueError("PRODUCT_ID_MUST_BE_DIGITS")
+
+
+def _find_item(items: List[dict], product_id: str) -> Optional[dict]:
+    return next((it for it in items if str(it.get("product_id")) == product_id), None)
+
+
+def _summary_ids(items: List[dict]) -> List[str]:
+    return [str(it["product_id"]) for it in items if str(it.get("product_id", "")).isdigit()]
+
+
+def _with_products(items: List[dict], summaries: Dict[str, dict]) -> List[dict]:
+    return [{**it, "product": summaries.get(str(it["product_id"]))} for it in items]
+
+
 class CartService:
     def __init__(self, cart_repo, product_repo):
         self.cart_repo = cart_repo
@@ -18,20 +40,16 @@ class CartService:
         analysis_snapshot: Optional[Dict[str, Any]] = None,
     ) -> dict:
         # 1) product_id 정규화 + 숫자 검증 ("0010" -> "10")
-        try:
-            product_id = str(int(str(product_id).strip()))
-        except ValueError:
-            raise ValueError("PRODUCT_ID_MUST_BE_DIGITS")
+        product_id = _normalize_product_id(product_id)
 
-        # 2) products 존재 여부 검증
-        if self.product_repo.get_by_id(product_id) is None:
+        # 2) products 존재 여부 검증 (EXISTS 1건, 상세 매핑 없음)
+        if not self.product_repo.exists(product_id):
             raise ValueError("PRODUCT_NOT_FOUND")
 
         # 3) 중복 담기 방지(같은 product_id면 기존 item 반환)
-        items = self.cart_repo.list_items(user_id=user_id)
-        for it in items:
-            if str(it.get("product_id")) == product_id:
-                return it
+        existing = _find_item(self.cart_repo.list_items(user_id=user_id), product_id)
+        if existing is not None:
+            return existing
 
         # 4) 새로 담기
         return self.cart_repo.create_item(
@@ -41,9 +59,50 @@ class CartService:
         )
 
     def list_items(self, *, user_id: int) -> List[dict]:
-        return self.cart_repo.list_items(user_id=user_id)
+        """장바구니 항목 + 상품 요약 (상품은 IN 쿼리 1번, 삭제된 상품은 product=None)"""
+        items = self.cart_repo.list_items(user_id=user_id)
+        if not items:
+            return items
+        ids = _summary_ids(items)
+        summaries = self.product_repo.get_summaries(ids) if ids else {}
+        return _with_products(items, summaries)
 
     def remove_item(self, *, user_id: int, item_id: int) -> None:
         ok = self.cart_repo.delete_item(user_id=user_id, item_id=item_id)
+        if not ok:
+            raise ValueError("CART_ITEM_NOT_FOUND")
+
+    # async 버전 (Async*Repository 주입 시)
+    async def aadd_item(
+        self,
+        *,
+        user_id: int,
+        product_id: str,
+        analysis_snapshot: Optional[Dict[str, Any]] = None,
+    ) -> dict:
+        product_id = _normalize_product_id(product_id)
+        if not await self.product_repo.exists(product_id):
+            raise ValueError("PRODUCT_NOT_FOUND")
+
+        existing = _find_item(await self.cart_repo.list_items(user_id=user_id), product_id)
+        if existing is not None:
+            return existing
+
+        return await self.cart_repo.create_item(
+            user_id=user_id,
+            product_id=product_id,
+            analysis_snapshot=analysis_snapshot,
+        )
+
+    async def alist_items(self, *, user_id: int) -> List[dict]:
+        items = await self.cart_repo.list_items(user_id=user_id)
+        if not items:
+            return items
+        ids = _summary_ids(items)
+        summaries = await self.product_repo.get_summaries(ids) if ids else {}
+        return _with_products(items, summaries)
+
+    async def aremove_item(self, *, user_id: int, item_id: int) -> None:
+        ok = await self.cart_repo.delete_item(user_id=user_id, item_id=item_id)
         if not ok:
             raise ValueError("CART_ITEM_NOT_FOUND")
\ No newline at end of file
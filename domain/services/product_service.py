@@ -1,12 +1,42 @@
 
 from __future__ import annotations
 
-from typing import Optional, List, Dict, Any
+import base64
+from typing import Optional, List, Dict, Any, Tuple
+
+COUNT_STRATEGIES = ("exact", "estimated", "cached", "has_more")
+
+
+def encode_cursor(product_id: int | str) -> str:
+    """다음 페이지 cursor (클라이언트에는 불투명 문자열)"""
+    return base64.urlsafe_b64encode(f"p:{product_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, value = raw.split(":", 1)
+        if prefix != "p":
+            raise ValueError
+        return int(value)
+    except ValueError:
+        raise ValueError("INVALID_CURSOR")
 
 
 class ProductService:
-    def __init__(self, product_repo):
+    def __init__(self, product_repo, *, count_strategy: str = "exact", count_cache=None, detail_cache=None):
+        """
+        Args:
+            count_strategy: 목록 total 계산 방식 ("exact" | "estimated" | "cached" | "has_more")
+            count_cache: "cached" 전략에서 쓰는 get/set 캐시 (없으면 exact 로 동작)
+            detail_cache: 상세 응답 캐시 (VersionedCache, 없으면 매번 조회)
+        """
+        if count_strategy not in COUNT_STRATEGIES:
+            raise ValueError("INVALID_COUNT_STRATEGY")
         self.product_repo = product_repo
+        self.count_strategy = count_strategy
+        self.count_cache = count_cache
+        self.detail_cache = detail_cache
 
     def list_products(
         self,
@@ -15,24 +45,203 @@ class ProductService:
         q: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
+        cursor: Optional[str] = None,
+        version: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        # 페이징 안전장치 (기존 로직 유지)
-        if offset < 0:
-            offset = 0
-        if limit <= 0:
-            limit = 20
-
+        """
+        - cursor 없음: offset 방식 (기존 호환)
+        - cursor 있음: keyset 방식 (product_id > cursor 위치, offset 무시) -> 깊은 페이지도 첫 페이지와 같은 비용
+        - 두 방식 모두 다음 페이지가 있으면 next_cursor 반환 (limit+1 개 조회로 판단, 관련도 순 검색은 제외)
+        - total 은 count_strategy 로 계산 (offset 방식의 마지막 페이지는 count 쿼리 없이 정확히 계산)
+        - version(list_version 결과)을 넘기면 그 total 을 재사용 -> count 쿼리 없음
+        """
+        limit, offset, after = self._paging(limit=limit, offset=offset, cursor=cursor)
         items, total = self.product_repo.list_products(
             category=category,
             q=q,
-            limit=limit,
+            limit=limit + 1,
             offset=offset,
+            after=after,
+            with_count=self.count_strategy == "exact" and version is None,
         )
+        page = self._page(items, total, q=q, limit=limit, offset=offset, after=after)
+        if page["total"] is None:
+            page["total"], page["total_estimated"] = (
+                (version["total"], version["total_estimated"]) if version is not None
+                else self._count(category=category, q=q)
+            )
+        return page
 
-        return {"total": total, "items": items, "limit": limit, "offset": offset}
+    async def alist_products(
+        self,
+        *,
+        category: Optional[str] = None,
+        q: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        version: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """list_products 의 async 버전 (AsyncProductRepository 주입 시)"""
+        limit, offset, after = self._paging(limit=limit, offset=offset, cursor=cursor)
+        items, total = await self.product_repo.list_products(
+            category=category,
+            q=q,
+            limit=limit + 1,
+            offset=offset,
+            after=after,
+            with_count=self.count_strategy == "exact" and version is None,
+        )
+        page = self._page(items, total, q=q, limit=limit, offset=offset, after=after)
+        if page["total"] is None:
+            page["total"], page["total_estimated"] = (
+                (version["total"], version["total_estimated"]) if version is not None
+                else await self._acount(category=category, q=q)
+            )
+        return page
+
+    def list_version(self, *, category: Optional[str] = None, q: Optional[str] = None) -> Dict[str, Any]:
+        """
+        목록 검증자 (페이지 조회 전 ETag / 304 판단용)
+        - updated_at: 필터 범위 max(updated_at) -> Last-Modified
+        - total: count_strategy 로 계산 ("exact" 는 같은 집계 쿼리의 count(*)) -> list_products(version=) 가 재사용
+        """
+        exact = self.count_strategy == "exact"
+        updated_at, total = self.product_repo.list_version(category=category, q=q, with_count=exact)
+        estimated = False
+        if not exact:
+            total, estimated = self._count(category=category, q=q)
+        return {"updated_at": updated_at, "total": total, "total_estimated": estimated}
+
+    async def alist_version(self, *, category: Optional[str] = None, q: Optional[str] = None) -> Dict[str, Any]:
+        """list_version 의 async 버전"""
+        exact = self.count_strategy == "exact"
+        updated_at, total = await self.product_repo.list_version(category=category, q=q, with_count=exact)
+        estimated = False
+        if not exact:
+            total, estimated = await self._acount(category=category, q=q)
+        return {"updated_at": updated_at, "total": total, "total_estimated": estimated}
+
+    @staticmethod
+    def _paging(*, limit: int, offset: int, cursor: Optional[str]) -> Tuple[int, int, Optional[int]]:
+        """(limit, offset, after) - 페이징 안전장치 (기존 로직 유지), cursor 가 있으면 offset 무시"""
+        if offset < 0:
+            offset = 0
+        if limit <= 0:
+            limit = 20
+
+        after = decode_cursor(cursor) if cursor else None
+        if after is not None:
+            offset = 0
+        return limit, offset, after
+
+    def _page(
+        self,
+        items: List[dict],
+        total: Optional[int],
+        *,
+        q: Optional[str],
+        limit: int,
+        offset: int,
+        after: Optional[int],
+    ) -> Dict[str, Any]:
+        """limit+1 개 조회 결과 -> 응답 dict (total 을 여기서 정할 수 없으면 None, 호출 쪽에서 _count)"""
+        has_more = len(items) > limit
+        items = items[:limit]
+        # 관련도 순 검색 결과는 product_id 순이 아니므로 keyset cursor 없음 (offset 으로 다음 페이지)
+        ranked = self.product_repo.is_ranked(q=q, after=after)
+        next_cursor = encode_cursor(items[-1]["product_id"]) if has_more and items and not ranked else None
+
+        if total is None and after is None and not has_more and (items or offset == 0):
+            # offset 방식 마지막 페이지: 앞 페이지 수 + 이번 페이지 = 정확한 total
+            total = offset + len(items)
+
+        return {
+            "total": total,
+            "total_estimated": False,
+            "has_more": has_more,
+            "items": items,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": next_cursor,
+        }
+
+    def _count(self, *, category: Optional[str], q: Optional[str]) -> Tuple[Optional[int], bool]:
+        """(total, 추정치 여부) - has_more 전략이면 (None, False)"""
+        if self.count_strategy == "has_more":
+            return None, False
+        if self.count_strategy == "estimated":
+            return self.product_repo.estimate_count(category=category, q=q), True
+
+        if self.count_cache is None:
+            return self.product_repo.count_products(category=category, q=q), False
+        # ilike 검색이므로 대소문자/앞뒤 공백이 다른 검색어는 같은 키
+        key = (category or "", (q or "").strip().lower())
+        total = self.count_cache.get(key)
+        if total is None:
+            total = self.product_repo.count_products(category=category, q=q)
+            self.count_cache.set(key, total)
+        return total, False
+
+    async def _acount(self, *, category: Optional[str], q: Optional[str]) -> Tuple[Optional[int], bool]:
+        """_count 의 async 버전"""
+        if self.count_strategy == "has_more":
+            return None, False
+        if self.count_strategy == "estimated":
+            return await self.product_repo.estimate_count(category=category, q=q), True
+
+        if self.count_cache is None:
+            return await self.product_repo.count_products(category=category, q=q), False
+        key = (category or "", (q or "").strip().lower())
+        total = self.count_cache.get(key)
+        if total is None:
+            total = await self.product_repo.count_products(category=category, q=q)
+            self.count_cache.set(key, total)
+        return total, False
 
     def get_product_detail(self, *, product_id: str) -> dict:
         product = self.product_repo.get_by_id(product_id)
         if product is None:
             raise ValueError("PRODUCT_NOT_FOUND")
-        return product
\ No newline at end of file
+        return product
+
+    def get_product_detail_versioned(self, *, product_id: str) -> Tuple[dict, Any]:
+        """
+        (상세, updated_at) - 상세 페이지 ETag / Last-Modified 용
+        - detail_cache 가 fresh 면 DB 조회 없음
+        - fresh 가 지났으면 updated_at 1컬럼만 확인 후 바뀐 경우에만 상세 재조회
+        """
+        cache = self.detail_cache
+        key = str(product_id).strip()
+        key = str(int(key)) if key.isdigit() else key
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None and cached[2]:
+            return cached[1], cached[0]
+
+        updated_at = self.get_product_version(product_id=product_id)
+        if cached is not None and cached[0] == updated_at:
+            cache.touch(key)
+            return cached[1], updated_at
+
+        detail = self.get_product_detail(product_id=product_id)
+        if cache is not None:
+            cache.set(key, updated_at, detail)
+        return detail, updated_at
+
+    async def aget_product_detail(self, *, product_id: str) -> dict:
+        """get_product_detail 의 async 버전 (AsyncProductRepository 주입 시)"""
+        product = await self.product_repo.get_by_id(product_id)
+        if product is None:
+            raise ValueError("PRODUCT_NOT_FOUND")
+        return product
+
+    def get_products_detail(self, *, product_ids: List[str]) -> Dict[str, dict]:
+        """{product_id: detail} (없는 상품은 빠짐)"""
+        return self.product_repo.get_many(product_ids)
+
+    def get_product_version(self, *, product_id: str):
+        """상품 updated_at (판단 캐시 키용)"""
+        updated_at = self.product_repo.get_updated_at(product_id)
+        if updated_at is None:
+            raise ValueError("PRODUCT_NOT_FOUND")
+        return updated_at
@@ -15,3 +15,9 @@ class UserService:
         if self.user_repo.get_by_id(user_id) is None:
             raise ValueError("USER_NOT_FOUND")
         return self.health_repo.get_by_user_id(user_id) or {}
+
+    # async 버전 (Async*Repository 주입 시)
+    async def aget_my_profile(self, *, user_id: int) -> dict:
+        if await self.user_repo.get_by_id(user_id) is None:
+            raise ValueError("USER_NOT_FOUND")
+        return await self.health_repo.get_by_user_id(user_id) or {}
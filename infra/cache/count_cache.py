@@ -0,0 +1,46 @@
+# 역할: 상품 목록 total 캐시 (count 전략 "cached")
+# - key = (category, 정규화한 검색어) -> count(*) 결과를 TTL 동안 재사용
+# - 프로세스 내 메모리 (워커마다 따로), 상품 추가/삭제는 최대 TTL 만큼 늦게 반영
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+from app.settings import settings
+
+
+class CountCache:
+    def __init__(self, ttl_s: float = 60.0, maxsize: int = 1024):
+        self.ttl_s = ttl_s
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Hashable, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is None or time.monotonic() - cached[1] > self.ttl_s:
+                self._items.pop(key, None)
+                self.stats["misses"] += 1
+                return None
+            self._items.move_to_end(key)
+            self.stats["hits"] += 1
+            return cached[0]
+
+    def set(self, key: Hashable, value: int) -> None:
+        with self._lock:
+            self._items[key] = (value, time.monotonic())
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+PRODUCT_COUNT_CACHE = CountCache(ttl_s=settings.PRODUCT_COUNT_CACHE_TTL_S)
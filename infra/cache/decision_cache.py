@@ -0,0 +1,157 @@
+# 역할: /api/v1/ai/analyze 판단 결과 캐시
+# - 판단은 (건강 프로필, 상품 영양/알러지 데이터, 규칙 버전)의 순수 함수
+#   -> key = (profile hash, product_id, product updated_at, ENGINE_VERSION)
+# - 1단계: 프로세스 내 LRU / 2단계(선택): 공유 테이블 ai_decision_cache (SQLite 파일 또는 Postgres)
+# - 유저별 프로필(+hash)도 메모 -> 반복 조회 시 DB 작업은 상품 updated_at 1컬럼 조회뿐
+#   (다른 워커 프로세스의 upsert 는 알 수 없으므로 profile_ttl_s 로 최대 지연을 제한)
+# - 무효화: HealthProfileRepository.upsert -> invalidate_user(user_id)
+#   (프로필이 바뀌면 hash 가 달라져 기존 키는 자연히 miss, 상품 수정은 updated_at 으로 miss)
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+
+from app.settings import settings
+
+# 규칙(RouterLogic / 임계값 / 응답 문구)이 바뀌면 올림 -> 이전 캐시 전부 miss
+ENGINE_VERSION = "analyze-rules-2"
+
+
+def profile_hash(profile: Optional[Dict[str, Any]]) -> str:
+    """프로필 내용 해시 (키 순서 무관, 날짜/Decimal/Enum 은 문자열로 직렬화)"""
+    raw = json.dumps(profile or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def decision_key(p_hash: str, product_id, updated_at, engine_version: str = ENGINE_VERSION) -> str:
+    version = updated_at.isoformat() if hasattr(updated_at, "isoformat") else str(updated_at)
+    return f"{engine_version}:{p_hash}:{product_id}:{version}"
+
+
+class SQLDecisionStore:
+    """공유 캐시 테이블 (SQLAlchemy URL: sqlite:///... 또는 postgresql+psycopg2://...)"""
+
+    def __init__(self, url: str):
+        self.engine = create_engine(url, future=True, pool_pre_ping=True)
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                """
+                CREATE TABLE IF NOT EXISTS ai_decision_cache (
+                    cache_key VARCHAR(200) PRIMARY KEY,
+                    profile_hash VARCHAR(32) NOT NULL,
+                    payload TEXT NOT NULL
+                )
+                """
+            ))
+
+    def get(self, key: str) -> Optional[dict]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text("SELECT payload FROM ai_decision_cache WHERE cache_key = :k"), {"k": key}
+            ).first()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, p_hash: str, value: dict) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO ai_decision_cache (cache_key, profile_hash, payload)
+                    VALUES (:k, :h, :v)
+                    ON CONFLICT (cache_key) DO UPDATE SET payload = excluded.payload
+                    """
+                ),
+                {"k": key, "h": p_hash, "v": json.dumps(value, ensure_ascii=False, default=str)},
+            )
+
+
+class DecisionCache:
+    def __init__(self, maxsize: int = 10000, store: Optional[SQLDecisionStore] = None, profile_ttl_s: float = 30.0):
+        self.maxsize = maxsize
+        self.store = store
+        self.profile_ttl_s = profile_ttl_s
+        self._lru: "OrderedDict[str, dict]" = OrderedDict()
+        self._profiles: Dict[int, Tuple[dict, str, float]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "store_hits": 0, "misses": 0}
+
+    # -------------------------
+    # 유저 프로필 메모
+    # -------------------------
+    def get_profile(self, user_id: int) -> Optional[Tuple[dict, str]]:
+        """(profile, profile_hash) 또는 None (TTL 지나면 None)"""
+        with self._lock:
+            cached = self._profiles.get(user_id)
+            if cached is None:
+                return None
+            if time.monotonic() - cached[2] > self.profile_ttl_s:
+                del self._profiles[user_id]
+                return None
+            return cached[0], cached[1]
+
+    def remember_profile(self, user_id: int, profile: dict) -> str:
+        p_hash = profile_hash(profile)
+        with self._lock:
+            self._profiles[user_id] = (profile, p_hash, time.monotonic())
+        return p_hash
+
+    def invalidate_user(self, user_id: int) -> None:
+        """프로필 변경 시 호출: 유저 프로필 메모 + 이전 프로필 hash 의 LRU 항목 제거"""
+        with self._lock:
+            cached = self._profiles.pop(user_id, None)
+            if cached is None:
+                return
+            marker = f":{cached[1]}:"
+            for key in [k for k in self._lru if marker in k]:
+                del self._lru[key]
+
+    # -------------------------
+    # 판단 결과
+    # -------------------------
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            value = self._lru.get(key)
+            if value is not None:
+                self._lru.move_to_end(key)
+                self.stats["hits"] += 1
+                return value
+
+        value = self.store.get(key) if self.store is not None else None
+        with self._lock:
+            if value is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["store_hits"] += 1
+            self._put(key, value)
+        return value
+
+    def set(self, key: str, p_hash: str, value: dict) -> None:
+        with self._lock:
+            self._put(key, value)
+        if self.store is not None:
+            self.store.set(key, p_hash, value)
+
+    def _put(self, key: str, value: dict) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self._profiles.clear()
+
+
+DECISION_CACHE = DecisionCache(
+    maxsize=settings.AI_DECISION_CACHE_SIZE,
+    store=SQLDecisionStore(settings.AI_DECISION_CACHE_URL) if settings.AI_DECISION_CACHE_URL else None,
+    profile_ttl_s=settings.AI_DECISION_PROFILE_TTL_S,
+)
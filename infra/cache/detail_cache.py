@@ -0,0 +1,62 @@
+# 역할: 상품 상세 응답 캐시 (프로세스 내, hot 상품용)
+# - 값은 (version = products.updated_at, 상세 dict) 로 저장
+# - fresh_s 이내: DB 조회 없이 그대로 사용
+# - fresh_s 이후: updated_at 1컬럼만 다시 확인 -> 같으면 재사용(touch), 다르면 상세 재조회
+#   -> 상품 수정은 최대 fresh_s 늦게 반영, 상세 매핑(전체 컬럼) 조회는 변경 시에만
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from app.settings import settings
+
+
+class VersionedCache:
+    def __init__(self, maxsize: int = 2048, fresh_s: float = 30.0):
+        self.maxsize = maxsize
+        self.fresh_s = fresh_s
+        self._items: "OrderedDict[Hashable, Tuple[Any, Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"fresh_hits": 0, "revalidated": 0, "misses": 0}
+
+    def get(self, key: Hashable) -> Optional[Tuple[Any, Any, bool]]:
+        """(version, value, fresh 여부) 또는 None"""
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is None:
+                self.stats["misses"] += 1
+                return None
+            self._items.move_to_end(key)
+            version, value, checked_at = cached
+            fresh = time.monotonic() - checked_at <= self.fresh_s
+            if fresh:
+                self.stats["fresh_hits"] += 1
+            return version, value, fresh
+
+    def set(self, key: Hashable, version: Any, value: Any) -> None:
+        with self._lock:
+            self._items[key] = (version, value, time.monotonic())
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def touch(self, key: Hashable) -> None:
+        """버전 재확인 결과 그대로일 때: fresh 시간만 갱신"""
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is not None:
+                self._items[key] = (cached[0], cached[1], time.monotonic())
+                self.stats["revalidated"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+PRODUCT_DETAIL_CACHE = VersionedCache(
+    maxsize=settings.PRODUCT_DETAIL_CACHE_SIZE,
+    fresh_s=settings.PRODUCT_DETAIL_CACHE_FRESH_S,
+)
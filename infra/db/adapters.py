@@ -9,6 +9,7 @@ from sqlalchemy import select
 from domain.models.product import Product
 from domain.models.user_health_profile import UserHealthProfile
 from domain.models.cart_item import CartItem
+from infra.db.repositories.product_repo import search_condition, search_rank
 
 
 class AgentDBAdapter:
@@ -80,14 +81,17 @@ class AgentDBAdapter:
     ) -> Dict[int, Dict[str, Any]]:
         """
         agent 입력을 줄이려고, 서버에서 후보를 줄여서 dict로 공급하는 버전.
+        - q: name/brand/원재료 trigram 검색, 관련도 순 (ProductRepository 와 같은 기준)
+        - category: category_id (숫자 문자열)
         """
         stmt = select(Product)
 
-        if category:
-            stmt = stmt.where(Product.category == category)
-        if q:
-            like = f"%{q.strip()}%"
-            stmt = stmt.where(Product.name.ilike(like) | Product.brand.ilike(like))
+        if category and str(category).isdigit():
+            stmt = stmt.where(Product.category_id == int(category))
+        if q and q.strip():
+            stmt = stmt.where(search_condition(q)).order_by(search_rank(q).desc(), Product.product_id)
+        else:
+            stmt = stmt.order_by(Product.product_id)
 
         stmt = stmt.limit(limit).offset(offset)
         rows = self.db.execute(stmt).scalars().all()
@@ -0,0 +1,106 @@
+# 역할: DB 없이 쓰는 상품 검색 인덱스 (문자 n-gram 역색인)
+# - 필드(name / brand / ingredients)별로 문자 bigram -> 문서 번호 posting list
+# - 검색: 검색어 bigram 들의 posting 교집합(후보) -> 부분 문자열 확인 (DB 의 ILIKE '%q%' 와 같은 결과)
+# - 랭킹: 필드 가중치(ProductRepository.SEARCH_WEIGHTS 와 같은 상품명 > 브랜드 > 원재료) x 일치 정도
+# - 한글은 띄어쓰기 없이 붙여 쓰는 경우가 많아 단어가 아니라 문자 단위 n-gram 사용
+
+from __future__ import annotations
+
+import heapq
+import unicodedata
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+NGRAM = 2
+
+
+def normalize(text) -> str:
+    """NFKC + 소문자 + 공백 제거 (ILIKE 처럼 대소문자 무시, 띄어쓰기 차이 무시)"""
+    if text is None:
+        return ""
+    if isinstance(text, (list, tuple)):
+        text = ",".join(str(x) for x in text)
+    return "".join(unicodedata.normalize("NFKC", str(text)).lower().split())
+
+
+def ngrams(text: str, n: int = NGRAM) -> Set[str]:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def match_score(query: str, text: str) -> float:
+    """
+    부분 문자열 일치 정도 (0~1): 필드에서 검색어가 차지하는 비율 + 앞부분 일치 가산
+    - "우유" 검색 시 "우유" (1.0) > "우유식빵" > "딸기우유" 순
+    """
+    if not query or query not in text:
+        return 0.0
+    coverage = len(query) / len(text)
+    return (0.5 if text.startswith(query) else 0.25) + 0.5 * coverage
+
+
+class NgramIndex:
+    def __init__(self, fields: Sequence[Tuple[str, float]]):
+        """
+        Args:
+            fields: (필드 이름, 랭킹 가중치) 목록. add() 에 넘기는 dict 의 키와 같아야 함
+        """
+        self.fields = list(fields)
+        self._texts: Dict[str, List[str]] = {name: [] for name, _ in self.fields}
+        self._postings: Dict[str, Dict[str, array]] = {name: defaultdict(lambda: array("i")) for name, _ in self.fields}
+        # 1글자 검색어용 (bigram 이 없으므로 문자 -> 문서)
+        self._chars: Dict[str, Dict[str, array]] = {name: defaultdict(lambda: array("i")) for name, _ in self.fields}
+        self.size = 0
+
+    def add(self, values: Dict[str, object]) -> int:
+        """문서 1개 추가 -> 문서 번호 (추가 순서, 0부터)"""
+        doc = self.size
+        for name, _ in self.fields:
+            text = normalize(values.get(name))
+            self._texts[name].append(text)
+            for gram in ngrams(text):
+                self._postings[name][gram].append(doc)
+            for ch in set(text):
+                self._chars[name][ch].append(doc)
+        self.size += 1
+        return doc
+
+    def _candidates(self, name: str, query: str) -> Set[int]:
+        table = self._chars[name] if len(query) < NGRAM else self._postings[name]
+        lists = [table.get(g) for g in ngrams(query)]
+        if not lists or any(p is None for p in lists):
+            return set()
+        lists.sort(key=len)
+        result = set(lists[0])
+        for p in lists[1:]:
+            result.intersection_update(p)
+            if not result:
+                break
+        return result
+
+    def search(self, query: str, docs: Optional[Set[int]] = None) -> Dict[int, float]:
+        """
+        검색어를 부분 문자열로 포함하는 문서 -> 점수 (필드별 가중치 x match_score 의 최댓값)
+        docs 가 있으면 그 안에서만 (카테고리 필터 등)
+        """
+        query = normalize(query)
+        if not query:
+            return {}
+
+        scores: Dict[int, float] = {}
+        for name, weight in self.fields:
+            texts = self._texts[name]
+            for doc in self._candidates(name, query):
+                if docs is not None and doc not in docs:
+                    continue
+                score = weight * match_score(query, texts[doc])
+                if score > scores.get(doc, 0.0):
+                    scores[doc] = score
+        return scores
+
+
+def top_k(scores: Dict[int, float], k: int, tiebreak) -> List[int]:
+    """점수 내림차순 상위 k 개 (동점은 tiebreak(doc) 오름차순) - 전체 정렬 없이 heap"""
+    return [doc for _, _, doc in heapq.nsmallest(k, ((-s, tiebreak(doc), doc) for doc, s in scores.items()))]
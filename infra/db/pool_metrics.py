@@ -0,0 +1,138 @@
+# 역할: DB 커넥션 풀 메트릭 (엔진별: primary / replica / async ...)
+# - checkout / 새 연결 / timeout 카운트 + checkout 대기 시간 히스토그램
+# - 현재 풀 상태(size / checked_out / overflow)는 조회 시점에 pool 에서 읽음
+# - 대기 시간은 pool._do_get (풀에서 연결 1개를 꺼내는 지점) 을 감싼 pool 클래스로 측정
+#   -> create_engine(poolclass=POOL_METRICS.pool_class(QueuePool, "primary"))
+#      engine.dispose() 로 풀이 다시 만들어져도 같은 클래스라 측정 유지
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Any, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0)
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engines: Dict[str, Any] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._checkouts: Dict[str, int] = defaultdict(int)
+            self._connects: Dict[str, int] = defaultdict(int)
+            self._timeouts: Dict[str, int] = defaultdict(int)
+            self._wait_counts: Dict[str, List[int]] = defaultdict(lambda: [0] * (len(WAIT_BUCKETS) + 1))
+            self._wait_sum: Dict[str, float] = defaultdict(float)
+            self._wait_max: Dict[str, float] = defaultdict(float)
+            self._peak_checked_out: Dict[str, int] = defaultdict(int)
+
+    # -------------------------
+    # 연결
+    # -------------------------
+    def pool_class(self, base, name: str):
+        """base(QueuePool / AsyncAdaptedQueuePool) 에 대기 시간 측정을 붙인 pool 클래스"""
+        metrics = self
+
+        def _do_get(pool):
+            t0 = time.perf_counter()
+            try:
+                conn = base._do_get(pool)
+            except PoolTimeoutError:
+                metrics._observe_wait(name, time.perf_counter() - t0, timeout=True)
+                raise
+            metrics._observe_wait(name, time.perf_counter() - t0, checked_out=pool.checkedout())
+            return conn
+
+        return type(f"Timed{base.__name__}", (base,), {"_do_get": _do_get})
+
+    def attach(self, name: str, engine) -> None:
+        """engine(sync 또는 AsyncEngine) 의 pool 이벤트 구독"""
+        sync_engine = getattr(engine, "sync_engine", engine)
+        with self._lock:
+            self._engines[name] = sync_engine
+
+        @event.listens_for(sync_engine, "checkout")
+        def _on_checkout(dbapi_conn, record, proxy):
+            with self._lock:
+                self._checkouts[name] += 1
+
+        @event.listens_for(sync_engine, "connect")
+        def _on_connect(dbapi_conn, record):
+            with self._lock:
+                self._connects[name] += 1
+
+    def _observe_wait(self, name: str, wait_s: float, *, checked_out: int = 0, timeout: bool = False) -> None:
+        with self._lock:
+            self._wait_counts[name][bisect_left(WAIT_BUCKETS, wait_s)] += 1
+            self._wait_sum[name] += wait_s
+            self._wait_max[name] = max(self._wait_max[name], wait_s)
+            self._peak_checked_out[name] = max(self._peak_checked_out[name], checked_out)
+            if timeout:
+                self._timeouts[name] += 1
+
+    # -------------------------
+    # 출력
+    # -------------------------
+    @staticmethod
+    def _pool_state(engine) -> Dict[str, int]:
+        pool = engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            out = {}
+            for name, engine in self._engines.items():
+                waits = sum(self._wait_counts[name])
+                out[name] = {
+                    **self._pool_state(engine),
+                    "peak_checked_out": self._peak_checked_out[name],
+                    "checkouts": self._checkouts[name],
+                    "connects": self._connects[name],
+                    "timeouts": self._timeouts[name],
+                    "wait_s_avg": round(self._wait_sum[name] / waits, 6) if waits else 0.0,
+                    "wait_s_max": round(self._wait_max[name], 6),
+                }
+            return out
+
+    def render_prometheus(self, prefix: str = "db_pool") -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        lines: List[str] = []
+        with self._lock:
+            states = {name: self._pool_state(engine) for name, engine in self._engines.items()}
+
+            for key in ("size", "checked_out", "checked_in", "overflow"):
+                lines.append(f"# TYPE {prefix}_{key} gauge")
+                lines.extend(f'{prefix}_{key}{{pool="{name}"}} {s[key]}' for name, s in states.items())
+
+            for key, series in (("checkouts", self._checkouts), ("connects", self._connects), ("timeouts", self._timeouts)):
+                lines.append(f"# TYPE {prefix}_{key}_total counter")
+                lines.extend(f'{prefix}_{key}_total{{pool="{name}"}} {series[name]}' for name in states)
+
+            lines.append(f"# HELP {prefix}_wait_seconds Time spent waiting for a pooled connection")
+            lines.append(f"# TYPE {prefix}_wait_seconds histogram")
+            for name in states:
+                acc = 0
+                for le, c in zip([*WAIT_BUCKETS, "+Inf"], self._wait_counts[name]):
+                    acc += c
+                    lines.append(f'{prefix}_wait_seconds_bucket{{pool="{name}",le="{le}"}} {acc}')
+                lines.append(f'{prefix}_wait_seconds_sum{{pool="{name}"}} {self._wait_sum[name]}')
+                lines.append(f'{prefix}_wait_seconds_count{{pool="{name}"}} {acc}')
+
+        return "\n".join(lines) + "\n"
+
+
+POOL_METRICS = PoolMetrics()
@@ -4,12 +4,22 @@
 
 from typing import List, Optional, Dict, Any
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import select, delete
 
 from domain.models.cart_item import CartItem
 
 
+def _to_dict(r: CartItem) -> dict:
+    return {
+        "item_id": r.item_id,
+        "user_id": r.user_id,
+        "product_id": r.product_id,
+        "analysis_snapshot": r.analysis_snapshot,
+    }
+
+
 class CartRepository:
     def __init__(self, db: Session):
         self.db = db
@@ -24,15 +34,7 @@ class CartRepository:
             .scalars()
             .all()
         )
-        return [
-            {
-                "item_id": r.item_id,
-                "user_id": r.user_id,
-                "product_id": r.product_id,
-                "analysis_snapshot": r.analysis_snapshot,
-            }
-            for r in rows
-        ]
+        return [_to_dict(r) for r in rows]
 
     def get_item(self, user_id: int, item_id: int) -> Optional[dict]:
         r = (
@@ -46,12 +48,7 @@ class CartRepository:
         )
         if r is None:
             return None
-        return {
-            "item_id": r.item_id,
-            "user_id": r.user_id,
-            "product_id": r.product_id,
-            "analysis_snapshot": r.analysis_snapshot,
-        }
+        return _to_dict(r)
 
     def create_item(
         self,
@@ -68,12 +65,7 @@ class CartRepository:
         self.db.commit()
         self.db.refresh(obj)
 
-        return {
-            "item_id": obj.item_id,
-            "user_id": obj.user_id,
-            "product_id": obj.product_id,
-            "analysis_snapshot": obj.analysis_snapshot,
-        }
+        return _to_dict(obj)
 
     def delete_item(self, user_id: int, item_id: int) -> bool:
         result = self.db.execute(
@@ -86,4 +78,58 @@ class CartRepository:
         if deleted == 0:
             return False
         self.db.commit()
-        return True
\ No newline at end of file
+        return True
+
+
+class AsyncCartRepository:
+    """CartRepository 의 AsyncSession 버전 (같은 쿼리, 같은 dict 모양)"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_items(self, user_id: int) -> List[dict]:
+        result = await self.db.execute(
+            select(CartItem)
+            .where(CartItem.user_id == user_id)
+            .order_by(CartItem.item_id.desc())
+        )
+        return [_to_dict(r) for r in result.scalars().all()]
+
+    async def get_item(self, user_id: int, item_id: int) -> Optional[dict]:
+        result = await self.db.execute(
+            select(CartItem).where(
+                CartItem.user_id == user_id,
+                CartItem.item_id == item_id,
+            )
+        )
+        r = result.scalar_one_or_none()
+        return None if r is None else _to_dict(r)
+
+    async def create_item(
+        self,
+        user_id: int,
+        product_id: str,
+        analysis_snapshot: Optional[Dict[str, Any]] = None,
+    ) -> dict:
+        obj = CartItem(
+            user_id=user_id,
+            product_id=product_id,
+            analysis_snapshot=analysis_snapshot,
+        )
+        self.db.add(obj)
+        await self.db.commit()
+        await self.db.refresh(obj)
+        return _to_dict(obj)
+
+    async def delete_item(self, user_id: int, item_id: int) -> bool:
+        result = await self.db.execute(
+            delete(CartItem).where(
+                CartItem.user_id == user_id,
+                CartItem.item_id == item_id,
+            )
+        )
+        deleted = result.rowcount or 0
+        if deleted == 0:
+            return False
+        await self.db.commit()
+        return True
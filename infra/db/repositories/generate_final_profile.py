@@ -1,4 +1,7 @@
 def generate_final_profile(user_id, user_diseases, user_weight):
+    # 체중 기반 기준(kg당 단백질/열량)용. 체중 미입력이면 0 -> 해당 기준은 평가에서 제외
+    weight = float(user_weight or 0)
+
     # 1. 질환별 임계값 설정 (Data Dictionary)
     # 수치 뒤의 'g', 'mg' 등의 단위는 계산 편의를 위해 생략합니다.
     disease_thresholds = {
@@ -1,8 +1,10 @@
 from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import select
 
 from domain.models.user_health_profile import UserHealthProfile
+from infra.cache.decision_cache import DECISION_CACHE
 
 # ✅ 지금 \d+로 확인된 컬럼들만 일단 반영
 PROFILE_FIELDS = {
@@ -40,4 +42,37 @@ class HealthProfileRepository:
                 setattr(row, k, v)
 
         self.db.commit()
-        return {k: getattr(row, k) for k in PROFILE_FIELDS}
\ No newline at end of file
+        # 프로필이 바뀌었으니 이 유저의 분석 판단 캐시(프로필 메모) 무효화
+        DECISION_CACHE.invalidate_user(user_id)
+        return {k: getattr(row, k) for k in PROFILE_FIELDS}
+
+
+class AsyncHealthProfileRepository:
+    """HealthProfileRepository 의 AsyncSession 버전"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_user_id(self, user_id: int) -> Optional[dict]:
+        stmt = select(UserHealthProfile).where(UserHealthProfile.user_id == user_id)
+        row = (await self.db.execute(stmt)).scalar_one_or_none()
+        if row is None:
+            return None
+        return {k: getattr(row, k) for k in PROFILE_FIELDS}
+
+    async def upsert(self, user_id: int, profile: dict) -> dict:
+        payload = {k: v for k, v in profile.items() if k in PROFILE_FIELDS}
+
+        stmt = select(UserHealthProfile).where(UserHealthProfile.user_id == user_id)
+        row = (await self.db.execute(stmt)).scalar_one_or_none()
+
+        if row is None:
+            row = UserHealthProfile(user_id=user_id, **payload)
+            self.db.add(row)
+        else:
+            for k, v in payload.items():
+                setattr(row, k, v)
+
+        await self.db.commit()
+        DECISION_CACHE.invalidate_user(user_id)
+        return {k: getattr(row, k) for k in PROFILE_FIELDS}
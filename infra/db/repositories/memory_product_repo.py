@@ -0,0 +1,242 @@
+# 역할: DB 없는(데모/오프라인) 상품 저장소
+# - ProductRepository 와 같은 계약: list_products(category, q, limit, offset, after, with_count) -> (items, total)
+#   + get_by_id / get_many / get_summaries / exists / get_updated_at / list_version / count_products / estimate_count / is_ranked
+# - 데이터: InMemoryStore.products 또는 FAKE_DB.json / JSON_DB.json 의 products (상세 dict 모양)
+# - 검색: NgramIndex (name / brand / ingredients, 상품명 > 브랜드 > 원재료 가중치)
+# - AsyncInMemoryProductRepository: 같은 저장소를 async def 라우트(AsyncProductRepository 계약)에서 사용
+
+from __future__ import annotations
+
+import ast
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from infra.db.memory_search import NgramIndex, top_k
+
+SEARCH_FIELDS = (("name", 1.0), ("brand", 0.8), ("ingredients", 0.5))
+
+SUMMARY_KEYS = ("product_id", "name", "category", "brand", "price", "image_url")
+
+DETAIL_DEFAULTS: Dict[str, Any] = {
+    "category": None, "brand": None, "price": None, "image_url": None, "description": None,
+    "ingredients": [], "allergy": None, "trace": None,
+    "calories": None, "sodium": None, "carbohydrate": None, "sugar": None, "fat": None,
+    "trans_fat": None, "saturated_fat": None, "cholesterol": None, "protein": None,
+    "phosphorus": None, "calcium": None, "potassium": None,
+    "inferred_types": [], "nutrients": {},
+}
+
+
+class _JsonLiterals(ast.NodeTransformer):
+    """JSON_DB.json 의 null / true / false -> 파이썬 상수"""
+
+    NAMES = {"null": None, "true": True, "false": False}
+
+    def visit_Name(self, node: ast.Name):
+        if node.id in self.NAMES:
+            return ast.copy_location(ast.Constant(self.NAMES[node.id]), node)
+        return node
+
+
+def load_products_file(path: str) -> List[dict]:
+    """
+    FAKE_DB.json / JSON_DB.json 에서 상품 목록 읽기
+    - 두 파일 모두 `이름 = {...}` 대입문 모음 (JSON 이 아니라 파이썬 리터럴, null 허용)
+    - `products = {...}` 또는 `FAKE_DB = {"products": {...}}` 형태를 찾음
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    for node in tree.body:
+        if not isinstance(node, ast.Assign) or not isinstance(node.targets[0], ast.Name):
+            continue
+        value = ast.literal_eval(_JsonLiterals().visit(node.value))
+        if node.targets[0].id == "products":
+            return list(value.values())
+        if isinstance(value, dict) and isinstance(value.get("products"), dict):
+            return list(value["products"].values())
+    raise ValueError("PRODUCTS_NOT_FOUND")
+
+
+def _sort_key(product_id: str) -> Tuple[int, Union[int, str]]:
+    # 숫자 id 는 숫자 순 (DB 의 product_id 순과 동일), 그 외는 뒤로
+    return (0, int(product_id)) if product_id.isdigit() else (1, product_id)
+
+
+class InMemoryProductRepository:
+    def __init__(self, products: Iterable[dict], *, loaded_at: Optional[datetime] = None):
+        """
+        Args:
+            products: 상세 dict 목록 (product_id 필수)
+            loaded_at: get_updated_at 이 돌려줄 버전 (판단 캐시 키용, 기본 = 생성 시각)
+        """
+        self.loaded_at = loaded_at or datetime.now(timezone.utc)
+        rows = sorted(
+            ({**p, "product_id": str(p["product_id"])} for p in products),
+            key=lambda p: _sort_key(p["product_id"]),
+        )
+
+        # 문서 번호 = product_id 정렬 순서 -> 번호 순서가 곧 목록 순서
+        self._rows: List[dict] = rows
+        self._doc_by_id: Dict[str, int] = {p["product_id"]: i for i, p in enumerate(rows)}
+        self._keys = [_sort_key(p["product_id"]) for p in rows]
+
+        self._by_category: Dict[str, List[int]] = {}
+        self.index = NgramIndex(SEARCH_FIELDS)
+        for doc, p in enumerate(rows):
+            self.index.add(p)
+            for key in (p.get("category"), p.get("category_id")):
+                if key is not None:
+                    self._by_category.setdefault(str(key), []).append(doc)
+
+    @classmethod
+    def from_file(cls, path: str) -> "InMemoryProductRepository":
+        return cls(load_products_file(path))
+
+    @classmethod
+    def from_store(cls, store) -> "InMemoryProductRepository":
+        """InMemoryStore.products ({key: product dict})"""
+        return cls(store.products.values())
+
+    # -------------------------
+    # 내부 유틸
+    # -------------------------
+    @staticmethod
+    def _parse_product_id(product_id: Union[str, int]) -> str:
+        # ProductRepository 와 같은 검증 (숫자 아니면 PRODUCT_ID_INVALID, "007" -> "7")
+        if not str(product_id).isdigit():
+            raise ValueError("PRODUCT_ID_INVALID")
+        return str(int(product_id))
+
+    def _summary(self, doc: int) -> dict:
+        p = self._rows[doc]
+        return {**{k: p.get(k) for k in SUMMARY_KEYS}, "updated_at": p.get("updated_at") or self.loaded_at}
+
+    def _detail(self, doc: int) -> dict:
+        p = self._rows[doc]
+        return {**DETAIL_DEFAULTS, **p, "updated_at": p.get("updated_at") or self.loaded_at}
+
+    def _category_docs(self, category: Optional[str]) -> Optional[List[int]]:
+        """카테고리 필터 대상 문서 (필터 없으면 None). category_id 또는 카테고리 이름 둘 다 허용"""
+        if not category:
+            return None
+        return self._by_category.get(category, [])
+
+    def _matches(self, category: Optional[str], q: Optional[str]) -> Tuple[Optional[List[int]], Dict[int, float]]:
+        """(카테고리 문서 목록 또는 None, 검색 점수) - 검색어 없으면 점수는 빈 dict"""
+        docs = self._category_docs(category)
+        if not (q and q.strip()):
+            return docs, {}
+        return docs, self.index.search(q, set(docs) if docs is not None else None)
+
+    # -------------------------
+    # ✅ 공개 메서드 (ProductRepository 와 같은 계약)
+    # -------------------------
+    @staticmethod
+    def is_ranked(*, q: Optional[str], after: Optional[int] = None) -> bool:
+        return bool(q and q.strip()) and after is None
+
+    def exists(self, product_id: Union[str, int]) -> bool:
+        return self._parse_product_id(product_id) in self._doc_by_id
+
+    def get_by_id(self, product_id: str) -> Optional[dict]:
+        doc = self._doc_by_id.get(self._parse_product_id(product_id))
+        return None if doc is None else self._detail(doc)
+
+    def get_updated_at(self, product_id: Union[str, int]):
+        return self.loaded_at if self.exists(product_id) else None
+
+    def get_many(self, product_ids: List[Union[str, int]]) -> Dict[str, dict]:
+        found = (self._doc_by_id.get(self._parse_product_id(x)) for x in product_ids)
+        return {self._rows[doc]["product_id"]: self._detail(doc) for doc in found if doc is not None}
+
+    def get_summaries(self, product_ids: List[Union[str, int]]) -> Dict[str, dict]:
+        found = (self._doc_by_id.get(self._parse_product_id(x)) for x in product_ids)
+        return {self._rows[doc]["product_id"]: self._summary(doc) for doc in found if doc is not None}
+
+    def list_products(
+        self,
+        *,
+        category: Optional[str] = None,
+        q: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        after: Optional[int] = None,
+        with_count: bool = True,
+    ) -> Tuple[List[dict], Optional[int]]:
+        docs, scores = self._matches(category, q)
+        searching = bool(q and q.strip())
+
+        if self.is_ranked(q=q, after=after):
+            page = top_k(scores, offset + limit, tiebreak=lambda d: d)[offset:]
+        else:
+            # 문서 번호 = product_id 순 -> 정렬 없이 자르기만
+            matched = sorted(scores) if searching else (docs if docs is not None else range(len(self._rows)))
+            # keyset: 정렬된 문서 목록에서 after 다음 위치를 이진 탐색
+            start = offset if after is None else bisect_right(matched, _sort_key(str(after)), key=self._keys.__getitem__)
+            page = list(matched[start:start + limit])
+
+        total = None
+        if with_count:
+            total = len(scores) if searching else (len(docs) if docs is not None else len(self._rows))
+        return [self._summary(d) for d in page], total
+
+    def list_version(
+        self, *, category: Optional[str] = None, q: Optional[str] = None, with_count: bool = False,
+    ) -> Tuple[Any, Optional[int]]:
+        docs, scores = self._matches(category, q)
+        matched = scores if q and q.strip() else (docs if docs is not None else range(len(self._rows)))
+        versions = [self._rows[d].get("updated_at") or self.loaded_at for d in matched]
+        return (max(versions) if versions else None), (len(versions) if with_count else None)
+
+    def count_products(self, *, category: Optional[str] = None, q: Optional[str] = None) -> int:
+        docs, scores = self._matches(category, q)
+        if q and q.strip():
+            return len(scores)
+        return len(docs) if docs is not None else len(self._rows)
+
+    def estimate_count(self, *, category: Optional[str] = None, q: Optional[str] = None) -> int:
+        # 메모리에서는 정확한 count 도 충분히 빠름
+        return self.count_products(category=category, q=q)
+
+
+class AsyncInMemoryProductRepository:
+    """
+    InMemoryProductRepository 의 async 인터페이스 (AsyncProductRepository 와 같은 계약)
+    - 메모리 조회라 I/O 대기가 없으므로 이벤트 루프에서 그대로 실행
+    """
+
+    def __init__(self, repo: InMemoryProductRepository):
+        self.repo = repo
+
+    is_ranked = staticmethod(InMemoryProductRepository.is_ranked)
+
+    async def exists(self, product_id: Union[str, int]) -> bool:
+        return self.repo.exists(product_id)
+
+    async def get_by_id(self, product_id: str) -> Optional[dict]:
+        return self.repo.get_by_id(product_id)
+
+    async def get_updated_at(self, product_id: Union[str, int]):
+        return self.repo.get_updated_at(product_id)
+
+    async def get_many(self, product_ids: List[Union[str, int]]) -> Dict[str, dict]:
+        return self.repo.get_many(product_ids)
+
+    async def get_summaries(self, product_ids: List[Union[str, int]]) -> Dict[str, dict]:
+        return self.repo.get_summaries(product_ids)
+
+    async def list_products(self, **kwargs) -> Tuple[List[dict], Optional[int]]:
+        return self.repo.list_products(**kwargs)
+
+    async def list_version(
+        self, *, category: Optional[str] = None, q: Optional[str] = None, with_count: bool = False,
+    ) -> Tuple[Any, Optional[int]]:
+        return self.repo.list_version(category=category, q=q, with_count=with_count)
+
+    async def count_products(self, *, category: Optional[str] = None, q: Optional[str] = None) -> int:
+        return self.repo.count_products(category=category, q=q)
+
+    async def estimate_count(self, *, category: Optional[str] = None, q: Optional[str] = None) -> int:
+        return self.repo.estimate_count(category=category, q=q)
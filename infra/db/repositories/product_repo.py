@@ -1,25 +1,69 @@
 
 from __future__ import annotations
 
+import json
 from typing import Optional, List, Dict, Any, Tuple, Union
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, or_, text
 from sqlalchemy import exists as sa_exists  
 
 from domain.models.product import Product
 
+# 테이블 전체 추정 행 수 (통계 없으면 -1, 테이블 없으면 NULL)
+RELTUPLES_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+
+def _plan_rows(plan) -> Optional[float]:
+    """EXPLAIN (FORMAT JSON) 결과 -> 최상위 노드 Plan Rows"""
+    if plan is None:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+# 목록(summary)에 필요한 컬럼만 projection -> ORM 객체 대신 가벼운 Row
+SUMMARY_COLUMNS = (Product.product_id, Product.name, Product.brand, Product.image_url, Product.updated_at)
+SUMMARY_KEYS = ("product_id", "name", "category", "brand", "price", "image_url", "updated_at")
+
+# 검색 컬럼별 랭킹 가중치 (상품명 > 브랜드 > 원재료)
+SEARCH_WEIGHTS = (
+    (Product.name, 1.0),
+    (Product.brand, 0.8),
+    (Product.rawmtrl, 0.5),
+)
+
+
+def search_condition(q: str):
+    """name / brand / rawmtrl ILIKE '%q%' (pg_trgm GIN 인덱스 사용, 마이그레이션 b4e7a2c91d35)"""
+    like = f"%{q.strip()}%"
+    return or_(*(column.ilike(like) for column, _ in SEARCH_WEIGHTS))
+
+
+def search_rank(q: str):
+    """관련도 = 컬럼별 word_similarity(q, column) x 가중치 중 최댓값 (0~1)"""
+    term = q.strip()
+    return func.greatest(
+        *(func.coalesce(func.word_similarity(term, column), 0) * weight for column, weight in SEARCH_WEIGHTS)
+    )
+
 
 class ProductRepository:
     """
     DB(Postgres) 기반
-    - list_products: 검색/카테고리/페이징 + total
+    - list_products: 검색/카테고리/페이징(offset 또는 keyset after) + total
     - get_by_id: 상세 1건
+    - get_many: 상세 여러 건 (IN 쿼리 1번)
+    - list_products / get_by_id 는 read_db(replica) 세션으로 조회 (없으면 primary)
     - 반환은 service에서 바로 스키마로 넣기 쉬운 dict 형태
     """
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, read_db: Optional[Session] = None):
         self.db = db
+        # 목록/상세 조회는 replica 로 (없으면 primary)
+        self.read_db = read_db if read_db is not None else db
 
     # -------------------------
     # 내부 유틸
@@ -36,7 +80,8 @@ class ProductRepository:
             raise ValueError("PRODUCT_ID_INVALID")
         return int(product_id)
 
-    def _to_summary_dict(self, p: Product) -> Dict[str, Any]:
+    def _to_summary_dict(self, p) -> Dict[str, Any]:
+        """Product 또는 SUMMARY_COLUMNS 로 조회한 Row -> 목록용 dict"""
         return {
             "product_id": str(p.product_id),
             "name": p.name,
@@ -44,6 +89,7 @@ class ProductRepository:
             "brand": p.brand,
             "price": None,      # DB에 price 없음
             "image_url": p.image_url,
+            "updated_at": p.updated_at,  # 목록 ETag / Last-Modified 용 (응답 스키마에는 없음)
         }
 
     def _to_detail_dict(self, p: Product) -> Dict[str, Any]:
@@ -77,8 +123,69 @@ class ProductRepository:
 
             "inferred_types": [],
             "nutrients": {},
+            "updated_at": p.updated_at,  # 상세에서 요약을 만들 때(RequestProductCache)도 버전 유지 (응답 스키마에는 없음)
         }
 
+    def _filters(self, category: Optional[str], q: Optional[str]) -> list:
+        filters = []
+
+        # category: 숫자면 category_id로 필터 (현재 DB 스펙 기준)
+        if category and category.isdigit():
+            filters.append(Product.category_id == int(category))
+
+        # 검색어: name/brand/원재료 (pg_trgm GIN 인덱스)
+        if q and q.strip():
+            filters.append(search_condition(q))
+
+        return filters
+
+    def _list_statements(
+        self,
+        *,
+        category: Optional[str],
+        q: Optional[str],
+        limit: int,
+        offset: int,
+        after: Optional[int] = None,
+    ):
+        """
+        list_products 용 (목록 쿼리, count 쿼리) - sync/async 공용
+        - after 가 있으면 keyset: product_id > after (PK 인덱스로 바로 시작 위치 탐색, offset 무시)
+        - 없으면 기존 offset 방식 (깊은 페이지일수록 offset 만큼 읽고 버림)
+        - 검색어(q)가 있고 after 가 없으면 관련도(search_rank) 순
+        """
+        filters = self._filters(category, q)
+        # 목록은 요약 컬럼만 (원재료/알러지 text, 영양성분 컬럼은 읽지 않음)
+        stmt = select(*SUMMARY_COLUMNS).where(*filters)
+        cnt_stmt = select(func.count()).select_from(Product).where(*filters)
+
+        if after is not None:
+            # count 에는 넣지 않음 (total 은 필터 전체 기준)
+            stmt = stmt.where(Product.product_id > after).order_by(Product.product_id).limit(limit)
+        elif self.is_ranked(q=q, after=after):
+            # 검색어가 있으면 관련도 순 (동점은 product_id 순)
+            stmt = stmt.order_by(search_rank(q).desc(), Product.product_id).limit(limit).offset(offset)
+        else:
+            stmt = stmt.order_by(Product.product_id).limit(limit).offset(offset)
+        return stmt, cnt_stmt
+
+    def _version_statement(self, *, category: Optional[str], q: Optional[str], with_count: bool):
+        """list_version 용 집계 1번: max(updated_at) [+ count(*)] (행/요약 컬럼은 읽지 않음)"""
+        cols = [func.max(Product.updated_at)]
+        if with_count:
+            cols.append(func.count())
+        return select(*cols).select_from(Product).where(*self._filters(category, q))
+
+    @staticmethod
+    def is_ranked(*, q: Optional[str], after: Optional[int] = None) -> bool:
+        """관련도 순 정렬 여부 (keyset cursor 는 product_id 순에서만 유효)"""
+        return bool(q and q.strip()) and after is None
+
+    def _explain_statement(self, filters: list, dialect) -> Tuple[str, dict]:
+        """필터만 적용한 목록 쿼리의 EXPLAIN (드라이버 paramstyle 그대로 실행)"""
+        compiled = select(Product.product_id).where(*filters).compile(dialect=dialect)
+        return f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+
     # -------------------------
     # ✅ 공개 메서드
     # -------------------------
@@ -91,11 +198,35 @@ class ProductRepository:
     def get_by_id(self, product_id: str) -> Optional[dict]:
         pid = self._parse_product_id(product_id)
         stmt = select(Product).where(Product.product_id == pid)
-        p = self.db.execute(stmt).scalars().first()
+        p = self.read_db.execute(stmt).scalars().first()
         if not p:
             return None
         return self._to_detail_dict(p)
 
+    def get_updated_at(self, product_id: Union[str, int]):
+        """상품 버전(updated_at) 1컬럼만 조회 (판단 캐시 키용). 없으면 None"""
+        pid = self._parse_product_id(product_id)
+        stmt = select(Product.updated_at).where(Product.product_id == pid)
+        return self.db.execute(stmt).scalar_one_or_none()
+
+    def get_many(self, product_ids: List[Union[str, int]]) -> Dict[str, dict]:
+        """여러 상품 상세를 IN (...) 쿼리 1번으로 조회 -> {product_id(str): detail}. 없는 id 는 빠짐"""
+        pids = list(dict.fromkeys(self._parse_product_id(x) for x in product_ids))
+        if not pids:
+            return {}
+        stmt = select(Product).where(Product.product_id.in_(pids))
+        rows = self.read_db.execute(stmt).scalars().all()
+        return {str(p.product_id): self._to_detail_dict(p) for p in rows}
+
+    def get_summaries(self, product_ids: List[Union[str, int]]) -> Dict[str, dict]:
+        """여러 상품 요약(목록용 컬럼만)을 IN 쿼리 1번으로 조회 -> {product_id(str): summary}"""
+        pids = list(dict.fromkeys(self._parse_product_id(x) for x in product_ids))
+        if not pids:
+            return {}
+        stmt = select(*SUMMARY_COLUMNS).where(Product.product_id.in_(pids))
+        rows = self.read_db.execute(stmt).all()
+        return {str(r.product_id): self._to_summary_dict(r) for r in rows}
+
     def list_products(
         self,
         *,
@@ -103,32 +234,205 @@ class ProductRepository:
         q: Optional[str] = None,
         limit: int = 20,
         offset: int = 0,
-    ) -> Tuple[List[dict], int]:
-        stmt = select(Product)
-        cnt_stmt = select(func.count()).select_from(Product)
+        after: Optional[int] = None,
+        with_count: bool = True,
+    ) -> Tuple[List[dict], Optional[int]]:
+        """with_count=False 면 count 쿼리 생략 (total=None, service 의 count 전략에서 따로 계산)"""
+        stmt, cnt_stmt = self._list_statements(category=category, q=q, limit=limit, offset=offset, after=after)
 
-        filters = []
+        rows = list(self.read_db.execute(stmt).all())
+        total = int(self.read_db.execute(cnt_stmt).scalar() or 0) if with_count else None
 
-        # category: 숫자면 category_id로 필터 (현재 DB 스펙 기준)
-        if category and category.isdigit():
-            filters.append(Product.category_id == int(category))
+        items = [self._to_summary_dict(p) for p in rows]
+        return items, total
+
+    def list_version(
+        self, *, category: Optional[str] = None, q: Optional[str] = None, with_count: bool = False,
+    ) -> Tuple[Any, Optional[int]]:
+        """
+        목록 검증자 (필터 범위의 max(updated_at), with_count 면 count(*)) - 페이지 조회 전 ETag / 304 판단용
+        - 상품 수정/추가는 updated_at 으로, 삭제는 count 로 잡힘
+        """
+        row = self.read_db.execute(self._version_statement(category=category, q=q, with_count=with_count)).one()
+        return row[0], (int(row[1]) if with_count else None)
+
+    def count_products(self, *, category: Optional[str] = None, q: Optional[str] = None) -> int:
+        """정확한 count(*) (필터 범위 전체 스캔 가능)"""
+        _, cnt_stmt = self._list_statements(category=category, q=q, limit=0, offset=0)
+        return int(self.read_db.execute(cnt_stmt).scalar() or 0)
 
-        # 검색어: name/brand
-        if q:
-            like = f"%{q.strip()}%"
-            filters.append(or_(Product.name.ilike(like), Product.brand.ilike(like)))
+    def estimate_count(self, *, category: Optional[str] = None, q: Optional[str] = None) -> int:
+        """
+        추정 count (스캔 없음)
+        - 필터 없음: pg_class.reltuples (마지막 ANALYZE/VACUUM 기준)
+        - 필터 있음: EXPLAIN 의 Plan Rows (플래너 통계 기반)
+        - 통계가 아직 없으면(-1 / None) 정확한 count 로 대체
+        """
+        filters = self._filters(category, q)
+        conn = self.read_db.connection()
+        if not filters:
+            estimate = conn.execute(RELTUPLES_SQL, {"table": Product.__tablename__}).scalar()
+        else:
+            sql, params = self._explain_statement(filters, conn.dialect)
+            estimate = _plan_rows(conn.exec_driver_sql(sql, params).scalar())
 
-        if filters:
-            for f in filters:
-                stmt = stmt.where(f)
-                cnt_stmt = cnt_stmt.where(f)
+        if estimate is None or estimate < 0:
+            return self.count_products(category=category, q=q)
+        return int(estimate)
 
-        stmt = stmt.order_by(Product.product_id).limit(limit).offset(offset)
 
-        rows = list(self.db.execute(stmt).scalars().all())
-        total = int(self.db.execute(cnt_stmt).scalar() or 0)
+class AsyncProductRepository(ProductRepository):
+    """
+    AsyncSession 기반 (async def 라우트용)
+    - 쿼리/dict 변환 helper 는 ProductRepository 와 공유, 공개 메서드만 async
+    """
+
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
+        self.db = db
+        self.read_db = read_db if read_db is not None else db
+
+    async def exists(self, product_id: Union[str, int]) -> bool:
+        pid = self._parse_product_id(product_id)
+        stmt = select(sa_exists().where(Product.product_id == pid))
+        return bool((await self.db.execute(stmt)).scalar())
+
+    async def get_by_id(self, product_id: str) -> Optional[dict]:
+        pid = self._parse_product_id(product_id)
+        stmt = select(Product).where(Product.product_id == pid)
+        p = (await self.read_db.execute(stmt)).scalars().first()
+        if not p:
+            return None
+        return self._to_detail_dict(p)
+
+    async def get_updated_at(self, product_id: Union[str, int]):
+        pid = self._parse_product_id(product_id)
+        stmt = select(Product.updated_at).where(Product.product_id == pid)
+        return (await self.db.execute(stmt)).scalar_one_or_none()
+
+    async def get_many(self, product_ids: List[Union[str, int]]) -> Dict[str, dict]:
+        pids = list(dict.fromkeys(self._parse_product_id(x) for x in product_ids))
+        if not pids:
+            return {}
+        stmt = select(Product).where(Product.product_id.in_(pids))
+        rows = (await self.read_db.execute(stmt)).scalars().all()
+        return {str(p.product_id): self._to_detail_dict(p) for p in rows}
+
+    async def get_summaries(self, product_ids: List[Union[str, int]]) -> Dict[str, dict]:
+        pids = list(dict.fromkeys(self._parse_product_id(x) for x in product_ids))
+        if not pids:
+            return {}
+        stmt = select(*SUMMARY_COLUMNS).where(Product.product_id.in_(pids))
+        rows = (await self.read_db.execute(stmt)).all()
+        return {str(r.product_id): self._to_summary_dict(r) for r in rows}
+
+    async def list_products(
+        self,
+        *,
+        category: Optional[str] = None,
+        q: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+        after: Optional[int] = None,
+        with_count: bool = True,
+    ) -> Tuple[List[dict], Optional[int]]:
+        stmt, cnt_stmt = self._list_statements(category=category, q=q, limit=limit, offset=offset, after=after)
+
+        rows = list((await self.read_db.execute(stmt)).all())
+        total = int((await self.read_db.execute(cnt_stmt)).scalar() or 0) if with_count else None
 
         items = [self._to_summary_dict(p) for p in rows]
         return items, total
-    
-   
\ No newline at end of file
+
+    async def list_version(
+        self, *, category: Optional[str] = None, q: Optional[str] = None, with_count: bool = False,
+    ) -> Tuple[Any, Optional[int]]:
+        stmt = self._version_statement(category=category, q=q, with_count=with_count)
+        row = (await self.read_db.execute(stmt)).one()
+        return row[0], (int(row[1]) if with_count else None)
+
+    async def count_products(self, *, category: Optional[str] = None, q: Optional[str] = None) -> int:
+        _, cnt_stmt = self._list_statements(category=category, q=q, limit=0, offset=0)
+        return int((await self.read_db.execute(cnt_stmt)).scalar() or 0)
+
+    async def estimate_count(self, *, category: Optional[str] = None, q: Optional[str] = None) -> int:
+        filters = self._filters(category, q)
+        conn = await self.read_db.connection()
+        if not filters:
+            estimate = (await conn.execute(RELTUPLES_SQL, {"table": Product.__tablename__})).scalar()
+        else:
+            sql, params = self._explain_statement(filters, conn.dialect)
+            estimate = _plan_rows((await conn.exec_driver_sql(sql, params)).scalar())
+
+        if estimate is None or estimate < 0:
+            return await self.count_products(category=category, q=q)
+        return int(estimate)
+
+
+_MISSING = object()
+
+
+class RequestProductCache:
+    """
+    요청 1건 동안 상품 조회 결과를 공유하는 identity cache (sync ProductRepository 래퍼)
+    - deps.get_product_repo 가 요청마다 1개 생성 -> 같은 요청의 ProductService / CartService / AnalysisService 가 공유
+    - get_by_id / get_many / get_summaries / exists / get_updated_at: 이미 본 id 는 쿼리 없이, 나머지만 IN 쿼리 1번
+    - 없는 상품(None)도 기억 -> 같은 요청에서 다시 조회하지 않음
+    - 그 외 메서드(list_products 등)는 그대로 위임
+    """
+
+    def __init__(self, repo: ProductRepository):
+        self.repo = repo
+        self._details: Dict[str, Optional[dict]] = {}
+        self._summaries: Dict[str, Optional[dict]] = {}
+        self._versions: Dict[str, Any] = {}
+
+    def __getattr__(self, name):
+        return getattr(self.repo, name)
+
+    @staticmethod
+    def _key(product_id: Union[str, int]) -> str:
+        key = str(product_id).strip()
+        return str(int(key)) if key.isdigit() else key
+
+    def get_many(self, product_ids: List[Union[str, int]]) -> Dict[str, dict]:
+        keys = list(dict.fromkeys(self._key(x) for x in product_ids))
+        missing = [k for k in keys if k not in self._details]
+        if missing:
+            found = self.repo.get_many(missing)
+            for k in missing:
+                self._details[k] = found.get(k)
+        return {k: self._details[k] for k in keys if self._details[k] is not None}
+
+    def get_by_id(self, product_id: str) -> Optional[dict]:
+        return self.get_many([product_id]).get(self._key(product_id))
+
+    def get_summaries(self, product_ids: List[Union[str, int]]) -> Dict[str, dict]:
+        keys = list(dict.fromkeys(self._key(x) for x in product_ids))
+        for k in keys:
+            # 상세를 이미 읽었으면 거기서 요약을 만듦
+            if k not in self._summaries and k in self._details:
+                detail = self._details[k]
+                self._summaries[k] = None if detail is None else {key: detail.get(key) for key in SUMMARY_KEYS}
+        missing = [k for k in keys if k not in self._summaries]
+        if missing:
+            found = self.repo.get_summaries(missing)
+            for k in missing:
+                self._summaries[k] = found.get(k)
+        return {k: self._summaries[k] for k in keys if self._summaries[k] is not None}
+
+    def exists(self, product_id: Union[str, int]) -> bool:
+        key = self._key(product_id)
+        for seen in (self._details, self._summaries):
+            if key in seen:
+                return seen[key] is not None
+        found = self.repo.exists(key)
+        if not found:
+            self._details[key] = self._summaries[key] = None
+        return found
+
+    def get_updated_at(self, product_id: Union[str, int]):
+        key = self._key(product_id)
+        version = self._versions.get(key, _MISSING)
+        if version is _MISSING:
+            version = self._versions[key] = self.repo.get_updated_at(key)
+        return version
@@ -1,31 +1,58 @@
 # infra/db/repositories/user_repo.py
 # 역할: users CRUD (DB Session 기반)
 # - 정책/업무 규칙은 service(AuthService)에서
-# infra/db/repositories/user_repo.py
-# 역할: users CRUD (DB Session 기반)
-# - 정책/업무 규칙은 service(AuthService)에서
+# - AsyncUserRepository: 같은 SQL 을 AsyncSession 으로 실행 (async def 라우트용)
 
 from typing import Optional, Any, Dict
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
+USER_COLUMNS = """
+    user_id, email, password_hash, created_at, updated_at,
+    is_sensitive_agreed, agreed_at, is_tos_agreed, is_privacy_agreed
+"""
+
+SELECT_BY_EMAIL = text(f"""
+    SELECT {USER_COLUMNS}
+    FROM users
+    WHERE email = :email
+    LIMIT 1
+""")
+
+SELECT_BY_ID = text(f"""
+    SELECT {USER_COLUMNS}
+    FROM users
+    WHERE user_id = :user_id
+    LIMIT 1
+""")
+
+INSERT_USER = text(f"""
+    INSERT INTO users (
+        email, password_hash, created_at, updated_at,
+        is_sensitive_agreed, agreed_at, is_tos_agreed, is_privacy_agreed
+    )
+    VALUES (
+        :email, :password_hash, :created_at, :updated_at,
+        :is_sensitive_agreed, :agreed_at, :is_tos_agreed, :is_privacy_agreed
+    )
+    RETURNING {USER_COLUMNS}
+""")
+
+
+def _row_to_dict(row) -> Optional[Dict[str, Any]]:
+    return None if row is None else dict(row._mapping)
+
 
 class UserRepository:
     def __init__(self, db: Session):
         self.db = db
 
     def _row_to_dict(self, row) -> Optional[Dict[str, Any]]:
-        return None if row is None else dict(row._mapping)
+        return _row_to_dict(row)
 
     def get_by_email(self, email: str) -> Optional[dict]:
-        q = text("""
-            SELECT user_id, email, password_hash, created_at, updated_at,
-                   is_sensitive_agreed, agreed_at, is_tos_agreed, is_privacy_agreed
-            FROM users
-            WHERE email = :email
-            LIMIT 1
-        """)
-        row = self.db.execute(q, {"email": email}).fetchone()
+        row = self.db.execute(SELECT_BY_EMAIL, {"email": email}).fetchone()
         return self._row_to_dict(row)
 
     # ✅ 기존 코드 호환 (username = email로 취급)
@@ -33,14 +60,7 @@ class UserRepository:
         return self.get_by_email(username)
 
     def get_by_id(self, user_id: int) -> Optional[dict]:
-        q = text("""
-            SELECT user_id, email, password_hash, created_at, updated_at,
-                   is_sensitive_agreed, agreed_at, is_tos_agreed, is_privacy_agreed
-            FROM users
-            WHERE user_id = :user_id
-            LIMIT 1
-        """)
-        row = self.db.execute(q, {"user_id": user_id}).fetchone()
+        row = self.db.execute(SELECT_BY_ID, {"user_id": user_id}).fetchone()
         return self._row_to_dict(row)
 
     def create(
@@ -58,19 +78,7 @@ class UserRepository:
         if self.get_by_email(email) is not None:
             raise ValueError("EMAIL_ALREADY_EXISTS")
 
-        q = text("""
-            INSERT INTO users (
-                email, password_hash, created_at, updated_at,
-                is_sensitive_agreed, agreed_at, is_tos_agreed, is_privacy_agreed
-            )
-            VALUES (
-                :email, :password_hash, :created_at, :updated_at,
-                :is_sensitive_agreed, :agreed_at, :is_tos_agreed, :is_privacy_agreed
-            )
-            RETURNING user_id, email, password_hash, created_at, updated_at,
-                      is_sensitive_agreed, agreed_at, is_tos_agreed, is_privacy_agreed
-        """)
-        row = self.db.execute(q, {
+        row = self.db.execute(INSERT_USER, {
             "email": email,
             "password_hash": password_hash,
             "created_at": created_at,
@@ -82,4 +90,50 @@ class UserRepository:
         }).fetchone()
 
         self.db.commit()
-        return self._row_to_dict(row)
\ No newline at end of file
+        return self._row_to_dict(row)
+
+
+class AsyncUserRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_email(self, email: str) -> Optional[dict]:
+        result = await self.db.execute(SELECT_BY_EMAIL, {"email": email})
+        return _row_to_dict(result.fetchone())
+
+    async def get_by_username(self, username: str) -> Optional[dict]:
+        return await self.get_by_email(username)
+
+    async def get_by_id(self, user_id: int) -> Optional[dict]:
+        result = await self.db.execute(SELECT_BY_ID, {"user_id": user_id})
+        return _row_to_dict(result.fetchone())
+
+    async def create(
+        self,
+        *,
+        email: str,
+        password_hash: str,
+        created_at,
+        updated_at,
+        is_sensitive_agreed: bool,
+        agreed_at,
+        is_tos_agreed: bool,
+        is_privacy_agreed: bool,
+    ) -> dict:
+        if await self.get_by_email(email) is not None:
+            raise ValueError("EMAIL_ALREADY_EXISTS")
+
+        result = await self.db.execute(INSERT_USER, {
+            "email": email,
+            "password_hash": password_hash,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "is_sensitive_agreed": is_sensitive_agreed,
+            "agreed_at": agreed_at,
+            "is_tos_agreed": is_tos_agreed,
+            "is_privacy_agreed": is_privacy_agreed,
+        })
+        row = result.fetchone()
+
+        await self.db.commit()
+        return _row_to_dict(row)
@@ -1,13 +1,62 @@
 # infra/db/session.py
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.settings import settings
+from infra.db.pool_metrics import POOL_METRICS
 
-engine = create_engine(settings.DATABASE_URL, future=True, pool_pre_ping=True)
+
+def _pool_options() -> dict:
+    # 풀 크기 / 대기 / 재사용 / ping 전략은 settings(DB_POOL_*) 에서
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_S,
+        "pool_recycle": settings.DB_POOL_RECYCLE_S,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _make_engine(url: str, name: str):
+    eng = create_engine(url, future=True, poolclass=POOL_METRICS.pool_class(QueuePool, name), **_pool_options())
+    POOL_METRICS.attach(name, eng)
+    return eng
+
+
+def _make_async_engine(url: str, name: str):
+    eng = create_async_engine(url, poolclass=POOL_METRICS.pool_class(AsyncAdaptedQueuePool, name), **_pool_options())
+    POOL_METRICS.attach(name, eng)
+    return eng
+
+
+engine = _make_engine(settings.DATABASE_URL, "primary")
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 
+# 읽기 전용 replica (설정 없으면 None -> 읽기도 primary 세션 사용)
+read_engine = _make_engine(settings.DATABASE_REPLICA_URL, "replica") if settings.DATABASE_REPLICA_URL else None
+
+ReadSessionLocal = (
+    sessionmaker(bind=read_engine, autocommit=False, autoflush=False, future=True) if read_engine is not None else None
+)
+
+# async 스택 (psycopg 3 async): async def 라우트에서 threadpool 없이 DB I/O 대기
+async_engine = _make_async_engine(settings.ASYNC_DATABASE_URL, "primary_async")
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+async_read_engine = (
+    _make_async_engine(settings.ASYNC_DATABASE_REPLICA_URL, "replica_async")
+    if settings.ASYNC_DATABASE_REPLICA_URL else None
+)
+
+AsyncReadSessionLocal = (
+    async_sessionmaker(bind=async_read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if async_read_engine is not None else None
+)
+
 def get_db():
     """
     FastAPI dependency
@@ -22,4 +71,34 @@ def get_db():
 
 def get_session():
     # 기존 get_db랑 완전 동일 (이름만 맞춰주는 용)
-    yield from get_db()
\ No newline at end of file
+    yield from get_db()
+
+def get_read_db():
+    """
+    FastAPI dependency (읽기 전용 replica 세션)
+    - replica 미설정이면 None -> repository 가 primary 세션으로 읽음
+    """
+    if ReadSessionLocal is None:
+        yield None
+        return
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    """
+    FastAPI dependency (AsyncSession)
+    - async def 라우트 + Async*Repository 조합에서 사용
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """get_read_db 의 async 버전 (replica 미설정이면 None)"""
+    if AsyncReadSessionLocal is None:
+        yield None
+        return
+    async with AsyncReadSessionLocal() as db:
+        yield db
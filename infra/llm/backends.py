@@ -0,0 +1,326 @@
+# 역할: 에이전트가 쓰는 LLM 호출부 추상화
+# - HFBackend: 프로세스 내 HF model.generate (ModelLoader 공유 모델)
+# - HTTPChatBackend: OpenAI 호환 /v1/chat/completions HTTP 클라이언트
+#   (keep-alive 커넥션 풀 + 요청 타임아웃 + 동시 요청 수 제한, 표준 라이브러리만 사용)
+# - 둘 다 chat(messages) -> str, with_structured_output(schema).invoke(messages) 를 제공
+#   (ProfileRetrieval 처럼 ChatOpenAI.with_structured_output 을 쓰던 코드가 그대로 동작)
+
+from __future__ import annotations
+
+import http.client
+import json
+import queue
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from app.settings import settings
+from infra.usage import record_tokens
+
+# langchain 메시지 type -> OpenAI role
+_ROLE_MAP = {"system": "system", "human": "user", "user": "user", "ai": "assistant", "assistant": "assistant"}
+
+
+def normalize_messages(messages) -> List[Dict[str, str]]:
+    """langchain 메시지 객체 / (role, content) 튜플 / dict / 문자열 -> [{"role", "content"}]"""
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+
+    out = []
+    for m in messages:
+        if isinstance(m, dict):
+            out.append({"role": m["role"], "content": m["content"]})
+        elif isinstance(m, (tuple, list)):
+            out.append({"role": _ROLE_MAP.get(m[0], m[0]), "content": m[1]})
+        else:
+            role = getattr(m, "type", None) or getattr(m, "role", "user")
+            out.append({"role": _ROLE_MAP.get(role, role), "content": m.content})
+    return out
+
+
+def extract_json(text: str) -> Dict[str, Any]:
+    """LLM 응답에서 JSON 추출 (코드블록/앞뒤 설명/트레일링 콤마 허용)"""
+    response_text = (text or "").strip()
+
+    if response_text.startswith("```"):
+        lines = response_text.split("\n")
+        if lines[0].startswith("```"):
+            lines = lines[1:]
+        if lines and lines[-1].strip() == "```":
+            lines = lines[:-1]
+        response_text = "\n".join(lines)
+
+    start_idx = response_text.find("{")
+    end_idx = response_text.rfind("}")
+    if start_idx == -1 or end_idx == -1:
+        raise ValueError("LLM_RESPONSE_NOT_JSON")
+
+    json_text = response_text[start_idx:end_idx + 1]
+    json_text = re.sub(r",\s*}", "}", json_text)
+    json_text = re.sub(r",\s*]", "]", json_text)
+    return json.loads(json_text)
+
+
+def _schema_json(schema) -> str:
+    if hasattr(schema, "model_json_schema"):
+        return json.dumps(schema.model_json_schema(), ensure_ascii=False)
+    return json.dumps(schema.schema(), ensure_ascii=False)
+
+
+def _parse_schema(schema, data: Dict[str, Any]):
+    # pydantic v2 / v1(langchain_core.pydantic_v1) 모두 지원
+    if hasattr(schema, "model_validate"):
+        return schema.model_validate(data)
+    return schema.parse_obj(data)
+
+
+class StructuredOutput:
+    """backend.with_structured_output(schema) 결과 (invoke -> schema 인스턴스)"""
+
+    def __init__(self, backend: "LLMBackend", schema):
+        self.backend = backend
+        self.schema = schema
+
+    def invoke(self, messages, **kwargs):
+        msgs = normalize_messages(messages)
+        instruction = (
+            "반드시 아래 JSON Schema 를 만족하는 JSON 객체 하나만 출력하세요. 다른 텍스트는 출력하지 마세요.\n"
+            f"{_schema_json(self.schema)}"
+        )
+        if msgs and msgs[0]["role"] == "system":
+            msgs[0] = {"role": "system", "content": f"{msgs[0]['content']}\n\n{instruction}"}
+        else:
+            msgs.insert(0, {"role": "system", "content": instruction})
+
+        text = self.backend.chat(msgs, json_mode=True, **kwargs)
+        return _parse_schema(self.schema, extract_json(text))
+
+
+class LLMBackend:
+    """모든 백엔드 공통 인터페이스"""
+
+    def chat(self, messages, *, json_mode: bool = False, **kwargs) -> str:
+        raise NotImplementedError
+
+    def invoke(self, messages, **kwargs) -> str:
+        return self.chat(messages, **kwargs)
+
+    def with_structured_output(self, schema) -> StructuredOutput:
+        return StructuredOutput(self, schema)
+
+    def close(self) -> None:
+        pass
+
+
+# -------------------------
+# 1) 프로세스 내 HF 백엔드
+# -------------------------
+class HFBackend(LLMBackend):
+    def __init__(self, agent_model, max_new_tokens: int = 512):
+        """
+        Args:
+            agent_model: ModelLoader.get_agent_model() 핸들 (공유 모델 + 생성 파라미터)
+        """
+        self.agent_model = agent_model
+        self.max_new_tokens = max_new_tokens
+
+    def chat(self, messages, *, json_mode: bool = False, **kwargs) -> str:
+        import torch
+
+        model = self.agent_model.model
+        tokenizer = self.agent_model.tokenizer
+        max_new_tokens = kwargs.pop("max_new_tokens", self.max_new_tokens)
+
+        inputs = tokenizer.apply_chat_template(
+            normalize_messages(messages),
+            tokenize=True,
+            add_generation_prompt=True,
+            return_tensors="pt",
+            return_dict=True,
+        ).to(model.device)
+
+        with torch.no_grad():
+            outputs = model.generate(
+                **inputs,
+                max_new_tokens=max_new_tokens,
+                **self.agent_model.generation_kwargs(**kwargs),
+            )
+        prompt_length = inputs["input_ids"].shape[-1]
+        record_tokens(prompt_length, outputs.shape[-1] - prompt_length)
+        return tokenizer.decode(outputs[0][prompt_length:], skip_special_tokens=True)
+
+
+# -------------------------
+# 2) OpenAI 호환 HTTP 백엔드
+# -------------------------
+class _ConnectionPool:
+    """host 단위 keep-alive HTTP 커넥션 풀 (LIFO: 최근 쓴 연결 재사용)"""
+
+    def __init__(self, base_url: str, max_connections: int, timeout: float):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=max_connections)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_connection()
+
+    def release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class HTTPChatBackend(LLMBackend):
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        *,
+        api_key: Optional[str] = None,
+        temperature: float = 0.0,
+        timeout: float = 30.0,
+        max_connections: int = 8,
+        max_concurrency: int = 8,
+        max_retries: int = 1,
+    ):
+        """
+        Args:
+            base_url: 예) "http://localhost:8001/v1"
+            timeout: 연결/읽기 타임아웃(초)
+            max_connections: 유지할 idle keep-alive 커넥션 수
+            max_concurrency: 동시에 진행 중인 요청 수 상한 (초과 시 대기)
+            max_retries: 끊긴 keep-alive 연결 재시도 횟수
+        """
+        self.model = model
+        self.api_key = api_key
+        self.temperature = temperature
+        self.max_retries = max_retries
+        self._pool = _ConnectionPool(base_url, max_connections, timeout)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+        # 지연 측정용 누적 통계
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "total_latency_s": 0.0, "tokens_in": 0, "tokens_out": 0}
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        url = f"{self._pool.base_path}{path}"
+
+        last_error: Optional[Exception] = None
+        for _ in range(self.max_retries + 1):
+            conn = self._pool.acquire()
+            try:
+                conn.request("POST", url, body=body, headers=self._headers())
+                resp = conn.getresponse()
+                data = resp.read()
+            except TimeoutError:
+                # 타임아웃은 재시도하지 않음 (지연만 두 배가 됨)
+                conn.close()
+                raise RuntimeError("LLM_HTTP_TIMEOUT")
+            except (http.client.HTTPException, ConnectionError, OSError) as e:
+                # 서버가 닫은 keep-alive 연결 -> 버리고 새 연결로 재시도
+                conn.close()
+                last_error = e
+                continue
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._pool.release(conn)
+
+            if resp.status >= 400:
+                raise RuntimeError(f"LLM_HTTP_ERROR: {resp.status} {data[:200]!r}")
+            return json.loads(data)
+
+        raise RuntimeError(f"LLM_HTTP_UNAVAILABLE: {last_error}")
+
+    def chat(self, messages, *, json_mode: bool = False, **kwargs) -> str:
+        payload = {
+            "model": self.model,
+            "messages": normalize_messages(messages),
+            "temperature": kwargs.pop("temperature", self.temperature),
+        }
+        if "max_new_tokens" in kwargs:
+            payload["max_tokens"] = kwargs.pop("max_new_tokens")
+        if json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        payload.update(kwargs)
+
+        with self._slots:
+            t0 = time.perf_counter()
+            try:
+                data = self._post("/chat/completions", payload)
+            except Exception:
+                with self._stats_lock:
+                    self.stats["errors"] += 1
+                raise
+
+        usage = data.get("usage") or {}
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["total_latency_s"] += time.perf_counter() - t0
+            self.stats["tokens_in"] += usage.get("prompt_tokens", 0)
+            self.stats["tokens_out"] += usage.get("completion_tokens", 0)
+        record_tokens(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+
+        return data["choices"][0]["message"]["content"]
+
+    def close(self) -> None:
+        self._pool.close()
+
+
+# -------------------------
+# 팩토리
+# -------------------------
+def get_backend(agent_name: str) -> LLMBackend:
+    """
+    settings.LLM_BACKEND 에 따라 에이전트용 백엔드 생성.
+    - "hf": ModelLoader 공유 모델 (temperature 는 에이전트 설정)
+    - "http": OpenAI 호환 서버 (vLLM/TGI/외부 API/테스트용 FakeChatServer)
+    """
+    from infra.llm.loader import get_agent_model_config
+
+    if settings.LLM_BACKEND == "http":
+        config = get_agent_model_config(agent_name)
+        return HTTPChatBackend(
+            settings.LLM_HTTP_BASE_URL,
+            settings.LLM_HTTP_MODEL or config["model_name"],
+            api_key=settings.LLM_HTTP_API_KEY,
+            temperature=config["temp"],
+            timeout=settings.LLM_HTTP_TIMEOUT_S,
+            max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+            max_concurrency=settings.LLM_HTTP_MAX_CONCURRENCY,
+        )
+
+    if settings.LLM_BACKEND == "hf":
+        from infra.llm.loader import ModelLoader
+        return HFBackend(ModelLoader.get_agent_model(agent_name))
+
+    raise ValueError(f"UNSUPPORTED_LLM_BACKEND: {settings.LLM_BACKEND}")
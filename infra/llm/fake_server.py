@@ -0,0 +1,128 @@
+# 역할: 테스트/튜닝용 로컬 OpenAI 호환 서버 (외부 API 없이 에이전트 지연 측정)
+# - POST {prefix}/chat/completions 만 지원
+# - 응답 내용은 responder(messages, payload) -> str 로 주입, latency_s 로 모델 지연 흉내
+# - HTTP/1.1 keep-alive 지원 -> HTTPChatBackend 커넥션 풀 재사용 여부도 확인 가능
+#
+# 사용 예)
+#   with FakeChatServer(responder=lambda msgs, _: '{"guidelines": [], "target_ingredients": []}') as server:
+#       backend = HTTPChatBackend(server.base_url, "fake-model")
+#       backend.chat([{"role": "user", "content": "hi"}])
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+Responder = Callable[[List[Dict[str, str]], Dict[str, Any]], str]
+
+
+def echo_responder(messages: List[Dict[str, str]], payload: Dict[str, Any]) -> str:
+    """기본 응답: json 모드면 빈 JSON, 아니면 마지막 user 메시지 echo"""
+    if (payload.get("response_format") or {}).get("type") == "json_object":
+        return "{}"
+    return messages[-1]["content"] if messages else ""
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # 기본 5 는 동시 접속 시 SYN 재전송(1s) 지연 유발
+
+
+class FakeChatServer:
+    def __init__(
+        self,
+        responder: Optional[Responder] = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_s: float = 0.0,
+        prefix: str = "/v1",
+    ):
+        self.responder = responder or echo_responder
+        self.latency_s = latency_s
+        self.prefix = prefix.rstrip("/")
+
+        # 관찰용 카운터 (요청 수 / 새 TCP 연결 수)
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+        self._httpd = _Server((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{self.prefix}"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+            disable_nagle_algorithm = True  # 헤더/바디 분리 write 시 delayed-ACK 40ms 지연 방지
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                if self.path != f"{server.prefix}/chat/completions":
+                    self._send(404, {"error": "not found"})
+                    return
+
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                messages = payload.get("messages", [])
+
+                with server._lock:
+                    server.requests += 1
+                if server.latency_s:
+                    time.sleep(server.latency_s)
+
+                content = server.responder(messages, payload)
+                prompt_tokens = sum(len(m.get("content", "")) for m in messages)
+                self._send(200, {
+                    "id": f"fake-{server.requests}",
+                    "object": "chat.completion",
+                    "model": payload.get("model"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                    # 토큰 수는 글자 수로 근사
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(content)},
+                })
+
+            def _send(self, status: int, body: Dict[str, Any]):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def start(self) -> "FakeChatServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-chat-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeChatServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
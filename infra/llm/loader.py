@@ -1,39 +1,312 @@
 # app/infra/llm/loader.py
+import resource
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
 import torch
 from transformers import AutoModelForCausalLM, AutoTokenizer
 
+from app.settings import settings
+
+# CPU 추론 모드에서 지원하는 양자화 방식
+# - "int8" / "int4": weight-only 양자화 (torchao 백엔드, 가중치만 저비트로 저장)
+# - "dynamic": 로드 후 nn.Linear 를 int8 동적 양자화 (추가 의존성 없음)
+CPU_QUANTIZATION_MODES = ("int8", "int4", "dynamic")
+
+_DTYPES = {
+    "float16": torch.float16,
+    "bfloat16": torch.bfloat16,
+    "float32": torch.float32,
+}
+
+
+def _resolve_dtype(dtype):
+    if isinstance(dtype, torch.dtype):
+        return dtype
+    if dtype not in _DTYPES:
+        raise ValueError(f"UNSUPPORTED_DTYPE: {dtype}")
+    return _DTYPES[dtype]
+
+
+def configure_cpu_threads(num_threads: int | None = None, num_interop_threads: int | None = None) -> None:
+    """
+    CPU 추론 스레드 수 설정.
+    - num_threads: 연산(intra-op) 스레드 수 (보통 물리 코어 수)
+    - num_interop_threads: 연산 간(inter-op) 병렬 스레드 수
+      (torch 는 첫 연산 이후 변경을 허용하지 않으므로 실패해도 무시)
+    """
+    if num_threads:
+        torch.set_num_threads(int(num_threads))
+    if num_interop_threads:
+        try:
+            torch.set_num_interop_threads(int(num_interop_threads))
+        except RuntimeError:
+            pass
+
+
+def _weight_only_quant_config(quantization: str):
+    """int8/int4 weight-only 양자화 설정 (transformers + torchao)"""
+    try:
+        from transformers import TorchAoConfig
+    except ImportError as e:
+        raise RuntimeError(
+            "int8/int4 weight-only 양자화에는 transformers>=4.45 와 torchao 가 필요합니다. "
+            "추가 의존성 없이 쓰려면 quantization='dynamic' 을 사용하세요."
+        ) from e
+
+    quant_type = "int8_weight_only" if quantization == "int8" else "int4_weight_only"
+    return TorchAoConfig(quant_type)
+
+
+@dataclass(frozen=True)
+class AgentModel:
+    """
+    에이전트가 사용하는 모델 핸들.
+    - model/tokenizer 는 ModelLoader 에 등록된 공유 인스턴스 (에이전트별 복사본 없음)
+    - temperature 등은 로드 옵션이 아니라 generate() 파라미터로만 다룸
+    """
+    agent_name: str
+    model: Any
+    tokenizer: Any
+    temperature: float
+    draft_model: Any = None
+
+    def generation_kwargs(self, **overrides) -> Dict[str, Any]:
+        kwargs = {
+            "temperature": self.temperature,
+            "do_sample": self.temperature > 0,
+            "pad_token_id": self.tokenizer.pad_token_id,
+            "eos_token_id": self.tokenizer.eos_token_id,
+        }
+        if self.draft_model is not None:
+            # speculative decoding 은 greedy 에서만 본 모델 단독 출력과 동일함을 보장
+            kwargs["assistant_model"] = self.draft_model
+            kwargs["do_sample"] = False
+        if not kwargs["do_sample"]:
+            kwargs.pop("temperature")
+        kwargs.update(overrides)
+        return kwargs
+
+
 class ModelLoader:
+    """
+    프로세스 전역 모델 레지스트리.
+    - 가중치는 (model_name, dtype, quantization) 단위로 1번만 로드
+    - 토크나이저는 model_name 단위로 1번만 로드 (dtype/양자화와 무관)
+    - register() 로 등록된 스펙은 load_registered() 로 한 번에 로드 (startup 용)
+    """
     _instances = {}
+    _tokenizers = {}
+    _registered = {}
+    _lock = threading.RLock()
+
+    @staticmethod
+    def _key(model_name: str, dtype, quantization: str | None):
+        return (model_name, str(dtype), quantization)
+
+    @classmethod
+    def get_tokenizer(cls, model_name: str):
+        with cls._lock:
+            if model_name not in cls._tokenizers:
+                cls._tokenizers[model_name] = AutoTokenizer.from_pretrained(
+                    model_name,
+                    trust_remote_code=True
+                )
+            return cls._tokenizers[model_name]
 
     @classmethod
-    def get_model_and_tokenizer(cls, model_name: str, device: str = "auto"):
+    def get_model_and_tokenizer(
+        cls,
+        model_name: str,
+        device: str = "auto",
+        *,
+        dtype="float16",
+        quantization: str | None = None,
+        num_threads: int | None = None,
+    ):
         """
-        모델 이름을 키로 사용하여 이미 로드된 모델이 있다면 재사용하고, 
+        (모델 이름, dtype, 양자화)를 키로 사용하여 이미 로드된 모델이 있다면 재사용하고,
         없다면 새로 로드하여 반환합니다.
+
+        - device="cpu" + quantization 지정 시 CPU 추론 모드로 로드합니다.
+          (int8/int4 weight-only 또는 dynamic int8)
+        - num_threads: CPU 추론 스레드 수 (None 이면 torch 기본값 유지)
         """
-        if model_name not in cls._instances:
-            print(f"--- [{model_name}] 모델을 로드합니다. ---")
-            
-            tokenizer = AutoTokenizer.from_pretrained(
-                model_name,
-                trust_remote_code=True
-            )
-            tokenizer = AutoTokenizer.from_pretrained(
-                model_name,
-                trust_remote_code=True
-            )
+        if quantization is not None:
+            if quantization not in CPU_QUANTIZATION_MODES:
+                raise ValueError(f"UNSUPPORTED_QUANTIZATION: {quantization}")
+            if device != "cpu":
+                raise ValueError("QUANTIZATION_REQUIRES_CPU_DEVICE")
+
+        if device == "cpu":
+            configure_cpu_threads(num_threads)
+
+        key = cls._key(model_name, dtype, quantization)
+        with cls._lock:
+            if key not in cls._instances:
+                print(f"--- [{model_name}] 모델을 로드합니다. (device={device}, dtype={dtype}, quantization={quantization}) ---")
+
+                tokenizer = cls.get_tokenizer(model_name)
+
+                torch_dtype = _resolve_dtype(dtype)
+                load_kwargs = {}
 
-            model = AutoModelForCausalLM.from_pretrained(
-                model_name,
-                torch_dtype=torch.float16,
-                device_map=device,
-                trust_remote_code=True
+                if device == "cpu":
+                    # CPU 에서 fp16 matmul 은 대부분 느리거나 미지원 -> bf16/fp32 로 로드
+                    if torch_dtype == torch.float16:
+                        torch_dtype = torch.bfloat16
+                    if quantization == "dynamic":
+                        # 동적 양자화는 fp32 nn.Linear 기준으로 동작
+                        torch_dtype = torch.float32
+                    elif quantization in ("int8", "int4"):
+                        load_kwargs["quantization_config"] = _weight_only_quant_config(quantization)
+                    load_kwargs["low_cpu_mem_usage"] = True
+
+                model = AutoModelForCausalLM.from_pretrained(
+                    model_name,
+                    torch_dtype=torch_dtype,
+                    device_map=device,
+                    trust_remote_code=True,
+                    **load_kwargs,
+                )
+
+                if quantization == "dynamic":
+                    model = torch.ao.quantization.quantize_dynamic(
+                        model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+
+                model.eval()
+
+                cls._instances[key] = (model, tokenizer)
+
+            return cls._instances[key]
+
+    # -------------------------
+    # 레지스트리 (에이전트 -> 공유 모델)
+    # -------------------------
+    @classmethod
+    def get_draft_model(
+        cls,
+        draft_model_name: str,
+        device: str = "auto",
+        *,
+        dtype="float16",
+        quantization: str | None = None,
+        num_assistant_tokens: int | None = None,
+    ):
+        """
+        speculative decoding 용 draft 모델 로드 (본 모델과 같은 레지스트리/중복 제거 사용).
+        draft 는 본 모델과 같은 토크나이저 계열이어야 함 (Qwen2.5-14B <-> Qwen2.5-0.5B/1.5B).
+        """
+        draft, _ = cls.get_model_and_tokenizer(
+            draft_model_name,
+            device=device,
+            dtype=dtype,
+            quantization=quantization,
+        )
+        if num_assistant_tokens:
+            draft.generation_config.num_assistant_tokens = int(num_assistant_tokens)
+        return draft
+
+    @classmethod
+    def register(cls, agent_name: str, *, speculative: bool = False, dtype: str | None = None) -> None:
+        """
+        에이전트 설정을 등록만 하고 로드는 미룸 (startup 에서 load_registered)
+        dtype: 지정하면 settings.LLM_DTYPE 대신 사용 (예: 노트북 스크립트의 bfloat16)
+        """
+        config = get_agent_model_config(agent_name)
+        config["speculative"] = speculative
+        if dtype is not None:
+            config["dtype"] = dtype
+        with cls._lock:
+            cls._registered[agent_name] = config
+
+    @classmethod
+    def registered_agents(cls) -> List[str]:
+        return list(cls._registered)
+
+    @classmethod
+    def get_agent_model(cls, agent_name: str, *, speculative: bool | None = None) -> AgentModel:
+        """
+        에이전트 이름으로 공유 모델 핸들 반환 (temperature 는 생성 파라미터).
+        speculative=True 면 settings.LLM_DRAFT_MODEL 을 draft 로 붙임 (opt-in).
+        """
+        config = cls._registered.get(agent_name) or get_agent_model_config(agent_name)
+        if speculative is None:
+            speculative = config.get("speculative", False)
+
+        model, tokenizer = cls.get_model_and_tokenizer(
+            config["model_name"],
+            device=config["device"],
+            dtype=config["dtype"],
+            quantization=config["quantization"],
+            num_threads=config["num_threads"],
+        )
+
+        draft_model = None
+        if speculative:
+            if not config.get("draft_model_name"):
+                raise ValueError("DRAFT_MODEL_NOT_CONFIGURED")
+            draft_model = cls.get_draft_model(
+                config["draft_model_name"],
+                device=config["device"],
+                dtype=config["dtype"],
+                quantization=config["quantization"],
+                num_assistant_tokens=config.get("num_assistant_tokens"),
             )
-            model.eval()
-            
-            cls._instances[model_name] = (model, tokenizer)
-        
-        return cls._instances[model_name]
+
+        return AgentModel(
+            agent_name=agent_name,
+            model=model,
+            tokenizer=tokenizer,
+            temperature=config["temp"],
+            draft_model=draft_model,
+        )
+
+    @classmethod
+    def load_registered(cls) -> Dict[str, AgentModel]:
+        """등록된 모든 에이전트 모델 로드 (중복 스펙은 1번만 로드됨)"""
+        return {name: cls.get_agent_model(name) for name in cls.registered_agents()}
+
+    @classmethod
+    def memory_report(cls) -> Dict[str, Any]:
+        """로드된 가중치 수/크기 + 프로세스 peak 메모리"""
+        models = []
+        for (model_name, dtype, quantization), (model, _) in cls._instances.items():
+            param_bytes = sum(p.numel() * p.element_size() for p in model.parameters())
+            models.append({
+                "model_name": model_name,
+                "dtype": dtype,
+                "quantization": quantization,
+                "param_mb": round(param_bytes / (1024 * 1024), 1),
+            })
+
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        report = {
+            "loaded_models": len(cls._instances),
+            "loaded_tokenizers": len(cls._tokenizers),
+            "models": models,
+            "peak_rss_mb": round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1),
+        }
+        if torch.cuda.is_available():
+            report["peak_cuda_mb"] = {
+                f"cuda:{i}": round(torch.cuda.max_memory_allocated(i) / (1024 * 1024), 1)
+                for i in range(torch.cuda.device_count())
+            }
+        return report
+
+    @classmethod
+    def report_peak_memory(cls) -> Dict[str, Any]:
+        report = cls.memory_report()
+        print(f"--- [ModelLoader] 모델 {report['loaded_models']}개 / 토크나이저 {report['loaded_tokenizers']}개 로드됨 ---")
+        for m in report["models"]:
+            print(f"    {m['model_name']} ({m['dtype']}, {m['quantization']}): {m['param_mb']} MB")
+        print(f"    peak RSS: {report['peak_rss_mb']} MB")
+        for dev, mb in report.get("peak_cuda_mb", {}).items():
+            print(f"    peak {dev}: {mb} MB")
+        return report
 
 def get_agent_model_config(agent_name: str):
     """
@@ -48,4 +321,15 @@ def get_agent_model_config(agent_name: str):
         "RESPagent": {"model_name": "Qwen/Qwen2.5-14B-Instruct", "temp": 0.8}, # 창의적 문장 생성
     }
     # 목록에 없는 에이전트는 기본 설정 반환
-    return configs.get(agent_name, {"model_name": "Qwen/Qwen2.5-14B-Instruct", "temp": 0.5})
\ No newline at end of file
+    config = dict(configs.get(agent_name, {"model_name": "Qwen/Qwen2.5-14B-Instruct", "temp": 0.5}))
+
+    # 로드 옵션(device/dtype/양자화/스레드)은 배포 환경(settings)을 따름
+    config.update({
+        "device": settings.LLM_DEVICE,
+        "dtype": settings.LLM_DTYPE,
+        "quantization": settings.LLM_QUANTIZATION,
+        "num_threads": settings.LLM_NUM_THREADS,
+        "draft_model_name": settings.LLM_DRAFT_MODEL,
+        "num_assistant_tokens": settings.LLM_NUM_ASSISTANT_TOKENS,
+    })
+    return config
@@ -0,0 +1,113 @@
+# 역할: 서버 시작 시 LLM 백그라운드 로드 + warm-up 생성
+# - from_pretrained / 커널 초기화 / 첫 generate 비용을 첫 요청이 아닌 startup 에서 지불
+# - 상태는 WARMUP(프로세스 전역)에 기록하고 /readyz 가 이를 읽음
+# - torch/transformers 는 스레드 안에서 import (LLM 미사용 배포에서는 import 비용 없음)
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+WARMUP_PROMPT = "안녕하세요"
+
+
+class WarmupState:
+    """
+    status 흐름: idle -> loading -> warming -> ready  (실패 시 failed)
+    - 등록된 에이전트가 없으면 start() 즉시 ready
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._done = threading.Event()  # ready / failed 가 되면 set
+        self.status = "idle"
+        self.error: Optional[str] = None
+        self.agents: List[str] = []
+        self.timings: Dict[str, float] = {}
+        self.memory: Dict[str, Any] = {}
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == "ready"
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "status": self.status,
+                "agents": list(self.agents),
+                "timings": dict(self.timings),
+                "error": self.error,
+            }
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """로드 + warm-up 이 끝날 때까지 대기 (끝났으면 True, 성공 여부는 is_ready)"""
+        return self._done.wait(timeout)
+
+    def _set(self, **kwargs) -> None:
+        with self._lock:
+            for k, v in kwargs.items():
+                setattr(self, k, v)
+
+    def start(self, agent_names: List[str], max_new_tokens: int = 8) -> None:
+        """백그라운드 스레드에서 로드 + warm-up 시작 (중복 호출 시 무시)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.agents = list(agent_names)
+            if not self.agents:
+                self.status = "ready"
+                self._done.set()
+                return
+            self.status = "loading"
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(max_new_tokens,),
+                name="llm-warmup",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self, max_new_tokens: int) -> None:
+        try:
+            import torch
+            from infra.llm.loader import ModelLoader
+
+            for name in self.agents:
+                ModelLoader.register(name)
+
+            t0 = time.perf_counter()
+            agent_models = ModelLoader.load_registered()
+            self._set(status="warming", timings={**self.timings, "load_s": round(time.perf_counter() - t0, 2)})
+
+            # 같은 가중치를 공유하는 에이전트는 1번만 warm-up
+            warmed = set()
+            t0 = time.perf_counter()
+            for agent_model in agent_models.values():
+                if id(agent_model.model) in warmed:
+                    continue
+                warmed.add(id(agent_model.model))
+
+                inputs = agent_model.tokenizer(WARMUP_PROMPT, return_tensors="pt").to(agent_model.model.device)
+                with torch.no_grad():
+                    agent_model.model.generate(
+                        **inputs,
+                        max_new_tokens=max_new_tokens,
+                        do_sample=False,
+                        pad_token_id=agent_model.tokenizer.pad_token_id,
+                    )
+
+            self._set(
+                status="ready",
+                timings={**self.timings, "warmup_s": round(time.perf_counter() - t0, 2)},
+                memory=ModelLoader.report_peak_memory(),
+            )
+            print(f"--- [Warmup] 준비 완료: {self.snapshot()} ---")
+
+        except Exception as e:
+            self._set(status="failed", error=f"{type(e).__name__}: {e}")
+            print(f"--- [Warmup] 실패: {self.error} ---")
+        finally:
+            self._done.set()
+
+
+WARMUP = WarmupState()
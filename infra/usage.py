@@ -0,0 +1,44 @@
+# 역할: 노드/요청 단위 자원 사용량 누적 (contextvar 기반)
+# - track() 블록 안에서 호출된 record_tokens / record_cpu 가 해당 블록의 Usage 에 더해짐
+# - executor 로 offload 된 작업도 contextvars.copy_context() 로 같은 Usage 를 공유
+# - 활성 블록이 없으면 아무것도 하지 않음 (트레이싱 off 시 비용 없음)
+
+from __future__ import annotations
+
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass
+class Usage:
+    tokens_in: int = 0
+    tokens_out: int = 0
+    cpu_s: float = 0.0
+
+
+_current: contextvars.ContextVar[Optional[Usage]] = contextvars.ContextVar("usage", default=None)
+
+
+@contextmanager
+def track() -> Iterator[Usage]:
+    usage = Usage()
+    token = _current.set(usage)
+    try:
+        yield usage
+    finally:
+        _current.reset(token)
+
+
+def record_tokens(tokens_in: int, tokens_out: int) -> None:
+    usage = _current.get()
+    if usage is not None:
+        usage.tokens_in += int(tokens_in)
+        usage.tokens_out += int(tokens_out)
+
+
+def record_cpu(cpu_s: float) -> None:
+    usage = _current.get()
+    if usage is not None:
+        usage.cpu_s += cpu_s
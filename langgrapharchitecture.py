@@ -24,29 +24,25 @@ gc.collect()
 torch.cuda.empty_cache()
 
 import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from infra.llm.loader import ModelLoader
 
 #모델로드 기본옵션 - 큐웬용
+# 모델 이름/dtype/양자화는 infra/llm/loader.py 의 get_agent_model_config + settings(LLM_*) 에서 관리
+# 같은 (model_name, dtype, quantization) 을 쓰는 에이전트는 가중치/토크나이저를 1벌만 공유함
 
-MODEL_NAME = "Qwen/Qwen2.5-14B-Instruct"
 #MODEL_NAME = "Qwen/Qwen2.5-32B-Instruct"
 #MODEL_NAME = "Qwen/Qwen2.5-72B-Instruct"
 #MODEL_NAME = "google/gemma-3-27b-it"
 #MODEL_NAME = "openai/gpt-oss-20b"
 
-tokenizer = AutoTokenizer.from_pretrained(
-    MODEL_NAME,
-    trust_remote_code=True
-)
+# 이 스크립트는 기존처럼 bfloat16 로 로드 (API 서버는 settings.LLM_DTYPE)
+for _agent_name in ["CHATagent", "USERagent", "RECOagent", "RESPagent"]:
+    ModelLoader.register(_agent_name, dtype="bfloat16")
 
-model = AutoModelForCausalLM.from_pretrained(
-    MODEL_NAME,
-    torch_dtype=torch.bfloat16,  #플롯 앞에 b추가
-    device_map="auto",
-    trust_remote_code=True
-)
+chat_model = ModelLoader.get_agent_model("CHATagent")
+model, tokenizer = chat_model.model, chat_model.tokenizer
 
-model.eval()
+ModelLoader.report_peak_memory()
 
 
 """# 🧾 데이터 스키마"""
@@ -654,7 +650,10 @@ from langgraph.graph import END
 
 useragent = ProfileRetrieval(retrieval_llm)
 
-chatagent = EvidenceGeneration(generation_llm)
+from ai.agents.chat_core_agent import EvidenceGeneration
+
+# 공유 모델(CHATagent) + 에이전트별 temperature 는 생성 파라미터로만 적용
+chatagent = EvidenceGeneration.from_agent_model(chat_model, final_profiles=final_profiles, products=products)
 
 recoagent = Recommendation(recommendation_llm)
 
@@ -665,7 +664,8 @@ respagent = ResponseGeneration(response_llm)
 """#### 에이전트별 모델 설정 모음"""
 
 # main.py 또는 graph.py 상단
-from langchain_openai import ChatOpenAI
+# LLM 호출부는 infra/llm/backends.py 로 통일 (settings.LLM_BACKEND: "hf" | "http")
+from infra.llm.backends import get_backend
 
 # 라우터 로직에서는 llm 사용 안하기로
 #router_llm = ChatOpenAI(
@@ -676,9 +676,9 @@ from langchain_openai import ChatOpenAI
 
 
 
-retrieval_llm = ChatOpenAI(model="gpt-4o", temperature=0)
-generate_llm = ChatOpenAI(model="gpt-4o", temperature=0)
-recommendation_llm = ChatOpenAI(model="gpt-4o", temperature=0)
+retrieval_llm = get_backend("USERagent")
+generate_llm = get_backend("CHATagent")
+recommendation_llm = get_backend("RECOagent")
 
 """#### 오케스트레이션 에이전트"""
 
@@ -1181,79 +1181,30 @@ def multiply(a: int, b: int) -> int:
 """
 
 ## 워크플로우 정의 및 노드&엣지 등록
+# 그래프 구조는 ai/orchestrator/graph.py 에서 관리
+# - 프로필 확보 후 임계값 체크 / LLM 알러지 분석 / 대체 후보 검색을 동시에 실행(fan-out)
+# - analysis_join 에서 합류 후 RouterLogic 으로 분기 -> 지연 = 세 단계의 최댓값
 
-from langgraph.graph import StateGraph
-
-workflow = StateGraph(overallState)
+from ai.orchestrator.graph import build_workflow
+from ai.orchestrator.tracing import TRACER, TRACE_HISTOGRAM
+from ai.orchestrator.checkpoint import analysis_thread_id, build_checkpointer
+from ai.orchestrator.runner import GraphRunner
 
 # orchestrator 로직 (policy.py 의 RouterLogic 인스턴스가 orchagent라고 가정)
-# 코드 상단에서 인스턴스가 없다면 아래와 같이 매핑합니다.
-# workflow.add_node("orch_agent", orchagent.run) 
-# 현재 노트북 코드에서는 orchagent 변수 할당이 주석처리되어 있으므로, 
-# 기존 초기화된 RouterLogic() 사용
 orchagent = RouterLogic()
 
-workflow.add_node("orch_agent", orchagent.run)
-
-workflow.add_node("user_agent", useragent.run)
-workflow.add_node("chat_agent", chatagent.evaluate_threshold)
-
-# user 님 요청사항: reco_agent 의 독자적 state 유지를 위해 중간 브릿지 래퍼 사용 
-# 이 코드는 recoagent 가 State 보존을 어떻게 할지에 따라 변경할 수 있으나,
-# 지금은 recoagent.run (또는 정의된 메인 진입점)을 호출한다고 가정합니다.
-# (만약 reco_node 함수가 별도로 정의되어 있다면 해당 함수를 사용하세요)
-workflow.add_node("reco_agent", recoagent.run if hasattr(recoagent, 'run') else lambda state: state)
-
-workflow.add_node("sub_reco_agent", subsagent.run if hasattr(subsagent, 'run') else lambda state: state)
-workflow.add_node("resp_agent", respagent.run if hasattr(respagent, 'run') else lambda state: state)
-
-workflow.add_edge(START, "orch_agent")
-workflow.add_edge("orch_agent", "user_agent")
-workflow.add_edge("user_agent", "orch_agent")
-
-workflow.add_edge("orch_agent", "chat_agent")
-workflow.add_edge("chat_agent", "orch_agent")
-
-workflow.add_edge("chat_agent", "reco_agent")
-
-workflow.add_edge("orch_agent", "reco_agent")
-workflow.add_edge("reco_agent", "sub_reco_agent")
-workflow.add_edge("sub_reco_agent", "reco_agent")
-workflow.add_edge("sub_reco_agent", "resp_agent")
-
-
-
-
-workflow.add_conditional_edges(
-    "orch_agent",               # 시작 노드
-    lambda x: x.get("next_step", "end"),   # 라우터의 결과값(next_step)을 읽어서
-    {                           # 실제 이동할 노드 매핑
-        "user_agent": "user_agent",
-        "chat_agent": "chat_agent",
-        "reco_agent": "reco_agent",
-        "sub_reco_agent": "sub_reco_agent",
-        "resp_agent": "resp_agent",
-        "end": END
-    }
+workflow = build_workflow(
+    useragent=useragent,
+    chatagent=chatagent,
+    recoagent=recoagent if hasattr(recoagent, 'run') else None,
+    subsagent=subsagent if hasattr(subsagent, 'run') else None,
+    respagent=respagent if hasattr(respagent, 'run') else None,
+    router=orchagent,
+    tracer=TRACER,  # 노드별 지연/토큰/state 크기 -> TRACE_HISTOGRAM.snapshot()
 )
 
-
-
-
-workflow.add_edge("orch_agent", END)
-workflow.add_edge("resp_agent", END)
-
-
-from typing import TypedDict, List
-
-
-
-
-
-
-
-
-app = workflow.compile()
+# settings.AGENT_CHECKPOINT_PATH 가 있으면 SQLite 체크포인트 (thread_id 로 재개/재사용)
+app = workflow.compile(checkpointer=build_checkpointer())
 
 """# 🔍 시각화"""
 
@@ -1271,8 +1222,12 @@ except Exception:
 # 초기 입력값 (빈 값으로 시작해도 됨)
 initial_input = {"user_id": "start_user"}
 
-# 그래프 실행
-final_state = app.invoke(initial_input)
+# 그래프 실행 (체크포인트가 있으면 thread_id 필수 -> GraphRunner 가 config 구성 + 재개/재사용 처리)
+runner = GraphRunner(app, tracer=TRACER)
+final_state = runner.run(
+    initial_input,
+    thread_id=analysis_thread_id(initial_input["user_id"], initial_input.get("product_id"), None),
+)
 
 # 최종 결과 확인
 print("\n--- 최종 상태 결과 ---")
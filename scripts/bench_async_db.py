@@ -0,0 +1,82 @@
+# 역할: 상품 조회 DB 경로 sync(threadpool) vs async(AsyncSession) 동시성 벤치마크
+# - sync : ProductRepository + ThreadPoolExecutor (FastAPI 기본 threadpool 40개 흉내)
+# - async: AsyncProductRepository + asyncio.gather, 동시성은 Semaphore 로 제한
+# - 요청 1건 = 세션 열기 -> get_by_id + list_products(첫 페이지) -> 세션 닫기 (실제 라우트와 같은 흐름)
+# - DATABASE_URL / ASYNC_DATABASE_URL (settings) 의 실제 Postgres 필요
+#
+# 사용 예)
+#   python -m scripts.bench_async_db --requests 2000 --concurrency 10 40 200
+#   python -m scripts.bench_async_db --product-id 1 --threads 40
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from infra.db.repositories.product_repo import AsyncProductRepository, ProductRepository
+from infra.db.session import AsyncSessionLocal, SessionLocal, async_engine, engine
+from scripts.bench_stats import latency_summary
+
+
+def _summary(mode, concurrency, latencies, wall):
+    return {"mode": mode, "concurrency": concurrency, **latency_summary(latencies, wall)}
+
+
+def run_sync(product_id, n_requests, concurrency, threads):
+    """동시 요청 concurrency 개가 threads 크기의 threadpool 을 나눠 씀"""
+
+    def one(_):
+        t0 = time.perf_counter()
+        db = SessionLocal()
+        try:
+            repo = ProductRepository(db)
+            repo.get_by_id(product_id)
+            repo.list_products(limit=20, offset=0)
+        finally:
+            db.close()
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(concurrency, threads)) as ex:
+        latencies = list(ex.map(one, range(n_requests)))
+    return _summary("sync", concurrency, latencies, time.perf_counter() - t0)
+
+
+async def run_async(product_id, n_requests, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            t0 = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                repo = AsyncProductRepository(db)
+                await repo.get_by_id(product_id)
+                await repo.list_products(limit=20, offset=0)
+            return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    latencies = await asyncio.gather(*(one() for _ in range(n_requests)))
+    result = _summary("async", concurrency, latencies, time.perf_counter() - t0)
+    await async_engine.dispose()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--product-id", default="1")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 40, 200])
+    parser.add_argument("--threads", type=int, default=40, help="sync 경로 threadpool 크기 (FastAPI 기본 40)")
+    args = parser.parse_args()
+
+    print(f"{'mode':>5} {'conc':>5} {'p50(ms)':>8} {'p95(ms)':>8} {'rps':>7}  pool")
+    for concurrency in args.concurrency:
+        r = run_sync(args.product_id, args.requests, concurrency, args.threads)
+        print(f"{r['mode']:>5} {r['concurrency']:>5} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['rps']:>7}  {engine.pool.status()}")
+
+        r = asyncio.run(run_async(args.product_id, args.requests, concurrency))
+        print(f"{r['mode']:>5} {r['concurrency']:>5} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['rps']:>7}")
+
+
+if __name__ == "__main__":
+    main()
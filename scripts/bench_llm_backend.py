@@ -0,0 +1,93 @@
+# 역할: HTTPChatBackend 지연/동시성 튜닝용 벤치마크 (외부 API 없이 FakeChatServer 사용)
+# - 서버 지연(latency_s)을 모델 응답 시간처럼 흉내 내고
+#   동시 요청 수 / 커넥션 풀 크기 조합별 p50/p95 지연과 처리량을 측정
+# - --base-url 을 주면 실제 OpenAI 호환 서버(vLLM 등)로 같은 측정 가능
+#
+# 사용 예)
+#   python -m scripts.bench_llm_backend --requests 200 --server-latency 0.05
+#   python -m scripts.bench_llm_backend --base-url http://localhost:8001/v1 --model Qwen/Qwen2.5-14B-Instruct
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from infra.llm.backends import HTTPChatBackend
+from infra.llm.fake_server import FakeChatServer
+from scripts.bench_stats import latency_summary
+
+STRUCTURED_REPLY = '{"guidelines": ["당류 섭취를 줄이세요"], "target_ingredients": ["당류", "나트륨"]}'
+
+MESSAGES = [
+    {"role": "system", "content": "당신은 임상 영양사입니다. 환자의 질병 정보를 바탕으로 식단 가이드와 주의 성분을 추출하세요."},
+    {"role": "user", "content": "환자 정보: 당뇨: 있음, 고혈압: 있음, 신장질환: 없음, 알러지: 없음"},
+]
+
+
+def run_case(base_url, model, n_requests, workers, max_connections, max_concurrency, timeout):
+    backend = HTTPChatBackend(
+        base_url, model,
+        timeout=timeout,
+        max_connections=max_connections,
+        max_concurrency=max_concurrency,
+    )
+
+    def one(_):
+        t0 = time.perf_counter()
+        backend.chat(MESSAGES, json_mode=True)
+        return time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        latencies = list(ex.map(one, range(n_requests)))
+    wall = time.perf_counter() - t0
+    backend.close()
+
+    return {
+        "workers": workers,
+        "max_connections": max_connections,
+        "max_concurrency": max_concurrency,
+        **latency_summary(latencies, wall),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default=None, help="없으면 로컬 FakeChatServer 사용")
+    parser.add_argument("--model", default="fake-model")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--server-latency", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    cases = [
+        # (workers, max_connections, max_concurrency)
+        (1, 1, 1),
+        (16, 1, 16),
+        (16, 16, 4),
+        (16, 16, 16),
+        (64, 32, 32),
+    ]
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = FakeChatServer(responder=lambda msgs, payload: STRUCTURED_REPLY, latency_s=args.server_latency).start()
+        base_url = server.base_url
+
+    try:
+        print(f"{'workers':>7} {'conns':>5} {'conc':>5} {'p50(ms)':>8} {'p95(ms)':>8} {'rps':>7}")
+        for workers, conns, conc in cases:
+            before = server.connections if server else 0
+            r = run_case(base_url, args.model, args.requests, workers, conns, conc, args.timeout)
+            opened = (server.connections - before) if server else "-"
+            print(
+                f"{r['workers']:>7} {r['max_connections']:>5} {r['max_concurrency']:>5} "
+                f"{r['p50_ms']:>8} {r['p95_ms']:>8} {r['rps']:>7}  (new TCP connections: {opened})"
+            )
+    finally:
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
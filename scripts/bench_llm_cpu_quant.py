@@ -0,0 +1,117 @@
+# 역할: CPU 추론 모드 벤치마크 (fp16/bf16 baseline vs int8/int4/dynamic 양자화)
+# - 모드마다 별도 프로세스에서 로드해야 RSS(최대 메모리)가 서로 섞이지 않음
+# - 출력: 모드별 load 시간, tokens/s, peak RSS(MB)
+#
+# 사용 예)
+#   python -m scripts.bench_llm_cpu_quant --model Qwen/Qwen2.5-0.5B-Instruct --threads 8
+#   python -m scripts.bench_llm_cpu_quant --modes bf16 dynamic --max-new-tokens 64
+
+import argparse
+import json
+import multiprocessing as mp
+import resource
+import sys
+import time
+
+PROMPT = "당뇨 환자가 과자를 고를 때 주의해야 할 영양성분을 JSON 으로 정리해줘."
+
+# 모드명 -> (dtype, quantization)
+MODES = {
+    "fp16": ("float16", None),
+    "bf16": ("bfloat16", None),
+    "int8": ("bfloat16", "int8"),
+    "int4": ("bfloat16", "int4"),
+    "dynamic": ("float32", "dynamic"),
+}
+
+
+def _peak_rss_mb() -> float:
+    # linux: KB 단위 / macOS: byte 단위
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _run_mode(mode: str, model_name: str, threads: int | None, max_new_tokens: int, repeats: int, out):
+    import torch
+    from infra.llm.loader import ModelLoader
+
+    dtype, quantization = MODES[mode]
+    t0 = time.perf_counter()
+    model, tokenizer = ModelLoader.get_model_and_tokenizer(
+        model_name,
+        device="cpu",
+        dtype=dtype,
+        quantization=quantization,
+        num_threads=threads,
+    )
+    load_s = time.perf_counter() - t0
+
+    messages = [{"role": "user", "content": PROMPT}]
+    inputs = tokenizer.apply_chat_template(
+        messages, tokenize=True, add_generation_prompt=True, return_tensors="pt", return_dict=True
+    )
+
+    # warm-up 1회 (첫 호출 커널 초기화 비용 제외)
+    with torch.no_grad():
+        model.generate(**inputs, max_new_tokens=4, do_sample=False)
+
+    total_tokens = 0
+    t0 = time.perf_counter()
+    with torch.no_grad():
+        for _ in range(repeats):
+            outputs = model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False)
+            total_tokens += outputs.shape[-1] - inputs["input_ids"].shape[-1]
+    gen_s = time.perf_counter() - t0
+
+    out.put({
+        "mode": mode,
+        "load_s": round(load_s, 2),
+        "tokens": total_tokens,
+        "tokens_per_s": round(total_tokens / gen_s, 2) if gen_s > 0 else None,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="Qwen/Qwen2.5-0.5B-Instruct")
+    parser.add_argument("--modes", nargs="+", default=["fp16", "bf16", "int8", "dynamic"], choices=list(MODES))
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--max-new-tokens", type=int, default=128)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    results = []
+    for mode in args.modes:
+        q = ctx.Queue()
+        p = ctx.Process(
+            target=_run_mode,
+            args=(mode, args.model, args.threads, args.max_new_tokens, args.repeats, q),
+        )
+        p.start()
+        p.join()
+        if p.exitcode != 0 or q.empty():
+            results.append({"mode": mode, "error": f"exitcode={p.exitcode}"})
+            continue
+        results.append(q.get())
+
+    baseline = next((r for r in results if r.get("mode") in ("bf16", "fp16") and "error" not in r), None)
+
+    print(f"{'mode':<8} {'load(s)':>8} {'tok/s':>8} {'RSS(MB)':>9} {'speedup':>8} {'mem':>6}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['mode']:<8} ERROR {r['error']}")
+            continue
+        speedup = r["tokens_per_s"] / baseline["tokens_per_s"] if baseline and baseline["tokens_per_s"] else None
+        mem = r["peak_rss_mb"] / baseline["peak_rss_mb"] if baseline else None
+        print(
+            f"{r['mode']:<8} {r['load_s']:>8} {r['tokens_per_s']:>8} {r['peak_rss_mb']:>9} "
+            f"{(f'{speedup:.2f}x' if speedup else '-'):>8} {(f'{mem:.2f}' if mem else '-'):>6}"
+        )
+
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# 역할: DB 없는 상품 검색(InMemoryProductRepository) 벤치마크
+# - JSON_DB.json 상품을 이름/원재료를 섞어 N개로 불려 인덱스를 만들고
+#   검색어별 list_products(q=..., limit=20) 지연(p50/p95)과 결과 수를 측정
+# - 비교용으로 같은 데이터에 대한 선형 스캔(부분 문자열 확인) 지연도 출력
+#
+# 사용 예)
+#   python -m scripts.bench_memory_search --products 100000 --repeat 20
+#   python -m scripts.bench_memory_search --path infra/db/FAKE_DB.json --queries 설화 우유 새우
+
+import argparse
+import random
+import time
+
+from infra.db.memory_search import normalize
+from infra.db.repositories.memory_product_repo import InMemoryProductRepository, load_products_file
+from scripts.bench_stats import time_repeat
+
+SUFFIXES = ["", " 오리지널", " 매운맛", " 라이트", " 미니", " 대용량", " 저당", " 구운", " 크림", " 치즈맛"]
+
+
+def synthesize(base, n, seed=0):
+    """base 상품을 섞어 n 개 생성 (이름/원재료 조합을 바꿔 posting 분포가 한쪽에 몰리지 않게)"""
+    rng = random.Random(seed)
+    vocab = sorted({ing for p in base for ing in p.get("ingredients") or []})
+    rows = []
+    for i in range(n):
+        p = dict(rng.choice(base))
+        p["product_id"] = str(300000000000 + i)
+        p["name"] = f"{p['name']}{rng.choice(SUFFIXES)} {i % 997}"
+        p["ingredients"] = rng.sample(vocab, k=min(len(vocab), rng.randint(4, 12)))
+        rows.append(p)
+    return rows
+
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", default="infra/db/JSON_DB.json")
+    parser.add_argument("--products", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--queries", nargs="+", default=["설화", "우유", "새우", "아몬드", "김", "허니버터칩", "없는상품"])
+    args = parser.parse_args()
+
+    rows = synthesize(load_products_file(args.path), args.products)
+
+    t0 = time.perf_counter()
+    repo = InMemoryProductRepository(rows)
+    print(f"index build: {len(rows)} products in {time.perf_counter() - t0:.2f}s")
+
+    texts = [(normalize(p["name"]), normalize(p["brand"]), normalize(p["ingredients"])) for p in rows]
+
+    def scan(q):
+        q = normalize(q)
+        return sum(1 for t in texts if any(q in f for f in t))
+
+    print(f"{'query':>10} {'hits':>7} {'p50(ms)':>8} {'p95(ms)':>8} {'scan(ms)':>9}")
+    for q in args.queries:
+        p50, p95, (_, total) = time_repeat(lambda: repo.list_products(q=q, limit=20), args.repeat)
+        scan_ms, _, _ = time_repeat(lambda: scan(q), max(1, args.repeat // 5))
+        print(f"{q:>10} {total:>7} {p50:>8.2f} {p95:>8.2f} {scan_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# 역할: 상품 목록 페이징 벤치마크 (offset vs keyset cursor)
+# - 같은 페이지를 offset 방식과 keyset(after=product_id) 방식으로 조회해 지연 비교
+# - keyset 은 페이지 깊이와 무관하게 PK 인덱스에서 바로 시작 -> 1페이지와 10,000페이지 지연이 거의 같음
+# - count(*) 는 두 방식 공통이므로 제외하고 목록 쿼리만 측정
+# - DATABASE_URL (settings) 의 실제 Postgres 필요 (깊은 페이지는 상품 수가 limit x page 이상이어야 의미 있음)
+#
+# 사용 예)
+#   python -m scripts.bench_product_pagination --pages 1 100 1000 10000 --limit 20 --repeat 20
+
+import argparse
+
+from sqlalchemy import select
+
+from domain.models.product import Product
+from infra.db.repositories.product_repo import ProductRepository
+from infra.db.session import SessionLocal
+from scripts.bench_stats import time_repeat
+
+
+def _time_ms(fn, repeat):
+    p50, _, _ = time_repeat(fn, repeat)
+    return round(p50, 2)
+
+
+def _cursor_for_page(db, page, limit):
+    """page 번째 페이지 직전 상품 id (측정 밖에서 한 번만 조회)"""
+    if page <= 1:
+        return None
+    stmt = select(Product.product_id).order_by(Product.product_id).offset((page - 1) * limit - 1).limit(1)
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1000, 10000])
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        repo = ProductRepository(db)
+
+        def fetch(**kw):
+            stmt, _ = repo._list_statements(category=None, q=None, limit=args.limit, **kw)
+            return db.execute(stmt).all()
+
+        print(f"{'page':>7} {'offset(ms)':>11} {'keyset(ms)':>11}")
+        for page in args.pages:
+            after = _cursor_for_page(db, page, args.limit)
+            if page > 1 and after is None:
+                print(f"{page:>7} {'-':>11} {'-':>11}  (상품 수 부족)")
+                continue
+
+            offset_ms = _time_ms(lambda: fetch(offset=(page - 1) * args.limit), args.repeat)
+            keyset_ms = _time_ms(lambda: fetch(offset=0, after=after), args.repeat)
+            print(f"{page:>7} {offset_ms:>11} {keyset_ms:>11}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
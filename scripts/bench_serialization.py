@@ -0,0 +1,65 @@
+# 역할: 상품 응답 직렬화 마이크로 벤치마크 (응답 크기별)
+# - before: response_model 재검증 (model_validate) -> jsonable_encoder -> json.dumps (FastAPI 기본 JSONResponse 경로)
+# - after : list_payload / detail_payload (스키마 필드만 선택) -> orjson.dumps (ORJSONResponse 경로)
+# - DB 없이 JSON_DB.json 상품을 불려 repository 가 돌려주는 것과 같은 모양의 dict 를 만들어 측정
+#
+# 사용 예)
+#   python -m scripts.bench_serialization --sizes 1 20 100 500 --repeat 200
+
+import argparse
+import json
+from datetime import datetime, timezone
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from api.schemas.products import ProductDetailResponse, ProductListResponse, detail_payload, list_payload
+from infra.db.repositories.memory_product_repo import InMemoryProductRepository, load_products_file
+from scripts.bench_stats import US, time_repeat
+
+
+def before(model, data):
+    # FastAPI: serialize_response(response_model 검증) -> jsonable_encoder -> JSONResponse.render
+    validated = model.model_validate(data)
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def after(payload_fn, data):
+    return orjson.dumps(payload_fn(data))
+
+
+def list_result(repo, n):
+    items, total = repo.list_products(limit=n)
+    return {
+        "total": total, "total_estimated": False, "has_more": total > n,
+        "limit": n, "offset": 0, "items": items, "next_cursor": None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", default="infra/db/JSON_DB.json")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 20, 100, 500])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    base = load_products_file(args.path)
+    need = max(args.sizes)
+    rows = [{**base[i % len(base)], "product_id": str(300000000000 + i)} for i in range(need)]
+    repo = InMemoryProductRepository(rows, loaded_at=datetime.now(timezone.utc))
+
+    print(f"{'response':>12} {'bytes':>8} {'before p50(us)':>15} {'after p50(us)':>14} {'after p95(us)':>14} {'speedup':>8}")
+
+    cases = [(f"list x{n}", ProductListResponse, list_payload, list_result(repo, n)) for n in args.sizes]
+    cases.append(("detail", ProductDetailResponse, detail_payload, repo.get_by_id(rows[0]["product_id"])))
+
+    for label, model, payload_fn, data in cases:
+        b50, _, body_before = time_repeat(lambda: before(model, data), args.repeat, US)
+        a50, a95, body_after = time_repeat(lambda: after(payload_fn, data), args.repeat, US)
+        # 두 경로가 같은 JSON 을 만드는지 확인 (키 순서/공백 무관)
+        assert json.loads(body_before) == json.loads(body_after), label
+        print(f"{label:>12} {len(body_after):>8} {b50:>15.1f} {a50:>14.1f} {a95:>14.1f} {b50 / a50:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# 역할: EvidenceGeneration 알러지 분석 프롬프트로 speculative decoding 벤치마크
+# - baseline: 본 모델 단독 greedy
+# - speculative: 본 모델 + draft 모델(assistant_model) greedy
+# - 출력: 토큰 동일 여부, draft 수락률(acceptance rate), 속도 향상(speedup)
+#
+# 수락률 계산: assisted generation 한 라운드마다 본 모델 forward 1회로 (수락 토큰 + 1)개를 확정
+#   -> 수락 토큰 수 = 생성 토큰 수 - 본 모델 forward 횟수
+#   -> 제안 토큰 수 = draft 모델 forward 횟수
+#
+# 사용 예)
+#   python -m scripts.bench_speculative_decoding \
+#       --model Qwen/Qwen2.5-14B-Instruct --draft Qwen/Qwen2.5-0.5B-Instruct --num-assistant-tokens 5
+
+import argparse
+import time
+
+import torch
+
+from ai.agents.chat_core_agent import EvidenceGeneration
+from infra.llm.loader import ModelLoader
+
+SAMPLES = {
+    "products": {
+        "2": {
+            "name": "고들빼기김치",
+            "ingredients": ["고들빼기", "멸치액", "염장새우", "양파", "혼합간장", "고춧가루", "마늘", "참깨", "물엿", "배즙", "당근"],
+            "allergy": "새우,대두,밀",
+            "trace": "밀, 땅콩, 복숭아, 토마토, 호두, 아황산류 혼입 가능",
+        },
+        "5": {
+            "name": "두마리목장 콜비치즈",
+            "ingredients": ["원유(국산)99.9%", "우유응고효소", "유산균", "식염", "안나토색소"],
+            "allergy": "우유함유",
+            "trace": "null",
+        },
+    },
+    "final_profiles": {
+        "0": {"restricted_ingredients": ["우유", "땅콩"], "sugar": 5.0},
+        "1": {"restricted_ingredients": ["새우"], "sodium": 2300.0},
+    },
+    "cases": [("0", "5"), ("1", "2"), ("0", "2")],
+}
+
+
+class ForwardCounter:
+    """모듈 forward 호출 횟수 카운터 (generate 내부 호출 포함)"""
+
+    def __init__(self, module):
+        self.count = 0
+        self._handle = module.register_forward_hook(self._hook)
+
+    def _hook(self, *_):
+        self.count += 1
+
+    def reset(self):
+        self.count = 0
+
+    def close(self):
+        self._handle.remove()
+
+
+def _generate(agent, messages, max_new_tokens, draft):
+    inputs = agent.tokenizer.apply_chat_template(
+        messages, tokenize=True, add_generation_prompt=True, return_tensors="pt", return_dict=True
+    ).to(agent.model.device)
+    kwargs = dict(max_new_tokens=max_new_tokens, do_sample=False, pad_token_id=agent.tokenizer.pad_token_id)
+    if draft is not None:
+        kwargs["assistant_model"] = draft
+
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    t0 = time.perf_counter()
+    with torch.no_grad():
+        out = agent.model.generate(**inputs, **kwargs)
+    if torch.cuda.is_available():
+        torch.cuda.synchronize()
+    elapsed = time.perf_counter() - t0
+
+    return out[0][inputs["input_ids"].shape[-1]:], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="Qwen/Qwen2.5-14B-Instruct")
+    parser.add_argument("--draft", default="Qwen/Qwen2.5-0.5B-Instruct")
+    parser.add_argument("--device", default="auto")
+    parser.add_argument("--dtype", default="bfloat16")
+    parser.add_argument("--num-assistant-tokens", type=int, default=5)
+    parser.add_argument("--max-new-tokens", type=int, default=256)
+    args = parser.parse_args()
+
+    model, tokenizer = ModelLoader.get_model_and_tokenizer(args.model, device=args.device, dtype=args.dtype)
+    draft = ModelLoader.get_draft_model(
+        args.draft, device=args.device, dtype=args.dtype, num_assistant_tokens=args.num_assistant_tokens
+    )
+    agent = EvidenceGeneration(
+        model, tokenizer,
+        final_profiles=SAMPLES["final_profiles"],
+        products=SAMPLES["products"],
+    )
+
+    target_counter = ForwardCounter(model)
+    draft_counter = ForwardCounter(draft)
+
+    # warm-up (커널 초기화 비용 제외)
+    warm_messages = agent.build_allergy_messages({"user_id": "0", "product_id": "5"})
+    _generate(agent, warm_messages, 8, None)
+    _generate(agent, warm_messages, 8, draft)
+
+    total_base = total_spec = 0.0
+    total_new = total_accepted = total_proposed = 0
+    all_equal = True
+
+    for user_id, product_id in SAMPLES["cases"]:
+        messages = agent.build_allergy_messages({"user_id": user_id, "product_id": product_id})
+
+        base_ids, base_s = _generate(agent, messages, args.max_new_tokens, None)
+
+        target_counter.reset()
+        draft_counter.reset()
+        spec_ids, spec_s = _generate(agent, messages, args.max_new_tokens, draft)
+
+        equal = torch.equal(base_ids.cpu(), spec_ids.cpu())
+        all_equal &= equal
+
+        new_tokens = spec_ids.shape[-1]
+        accepted = max(new_tokens - target_counter.count, 0)
+        proposed = draft_counter.count
+
+        total_base += base_s
+        total_spec += spec_s
+        total_new += new_tokens
+        total_accepted += accepted
+        total_proposed += proposed
+
+        print(
+            f"[user={user_id} product={product_id}] tokens={new_tokens} equal={equal} "
+            f"base={base_s:.2f}s spec={spec_s:.2f}s speedup={base_s / spec_s:.2f}x "
+            f"acceptance={accepted / proposed if proposed else 0:.2%} "
+            f"(target_fwd={target_counter.count}, draft_fwd={proposed})"
+        )
+
+    target_counter.close()
+    draft_counter.close()
+
+    print("\n=== 요약 ===")
+    print(f"greedy 출력 동일: {all_equal}")
+    print(f"생성 토큰 합계: {total_new}")
+    print(f"draft 수락률: {total_accepted / total_proposed if total_proposed else 0:.2%}")
+    print(f"speedup: {total_base / total_spec if total_spec else 0:.2f}x "
+          f"(baseline {total_base:.2f}s -> speculative {total_spec:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# 역할: 벤치마크 스크립트 공용 측정 helper (scripts/bench_*.py)
+# - percentile: nearest-rank 백분위 (샘플 정렬 후 가장 가까운 순위)
+# - time_repeat: fn 을 repeat 번 실행 -> (p50, p95, 마지막 결과), 단위는 scale 로 지정 (ms=1000, us=1_000_000)
+# - latency_summary: 동시성 벤치의 지연 샘플(초) + 전체 소요 -> p50_ms / p95_ms / rps
+
+import statistics
+import time
+
+MS = 1000
+US = 1_000_000
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    idx = min(len(values) - 1, int(round(q * (len(values) - 1))))
+    return values[idx]
+
+
+def time_repeat(fn, repeat, scale=MS):
+    samples = []
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - t0) * scale)
+    return statistics.median(samples), percentile(samples, 0.95), out
+
+
+def latency_summary(latencies, wall):
+    return {
+        "p50_ms": round(statistics.median(latencies) * MS, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * MS, 1),
+        "rps": round(len(latencies) / wall, 1),
+    }
@@ -0,0 +1,94 @@
+# 역할: 분석 그래프 입력 state 회귀 체크 (LLM / DB 없이)
+# - /analyze/graph 와 같은 모양의 입력(상품 상세 = product_data, 임계값 결과 포함)을 compile 된 그래프로 실행
+# - 실제 EvidenceGeneration.build_allergy_messages 를 쓰고 generate_text 만 가짜 응답으로 대체
+# - 확인: allergy_agent 가 product_data 를 받아 LLM 을 1번 호출하고 any_allergen 이 결과에 반영되는지
+#   (AnalysisState 에 없는 키는 LangGraph 가 입력에서 조용히 버림 -> 알러지 분석이 통째로 건너뛰어짐)
+#
+# 사용 예)
+#   python -m scripts.check_graph_state
+#   python -m scripts.check_graph_state --sync
+
+import argparse
+import asyncio
+import json
+
+from ai.agents.chat_core_agent import EvidenceGeneration
+from ai.orchestrator.graph import build_app
+
+PRODUCT = {
+    "product_id": "1",
+    "name": "바나나맛 우유",
+    "ingredients": ["원유", "설탕", "바나나농축과즙"],
+    "allergy": "우유 함유",
+}
+
+FAKE_RESPONSE = json.dumps({
+    "ingredient_analysis": [
+        {"ingredient": "원유", "is_allergen": True, "derived_from": "우유", "substitute": "두유"},
+    ],
+}, ensure_ascii=False)
+
+
+class _NoopProfile:
+    """입력에 플래그가 있어 user_agent 는 skip 됨 (호출되면 실패)"""
+
+    def run(self, state):
+        raise AssertionError("user_agent should be skipped")
+
+    async def arun(self, state):
+        raise AssertionError("user_agent should be skipped")
+
+
+class _RecordingChat(EvidenceGeneration):
+    """모델 없이 프롬프트만 기록하고 고정 JSON 응답"""
+
+    def __init__(self):
+        super().__init__(model=None, tokenizer=None)
+        self.calls = []
+
+    def generate_text(self, messages, max_new_tokens=512) -> str:
+        self.calls.append(messages)
+        return FAKE_RESPONSE
+
+
+def graph_input() -> dict:
+    # api.routes.ai.build_overall_state + AnalysisService.graph_inputs 와 같은 키
+    return {
+        "user_id": "1",
+        "product_id": PRODUCT["product_id"],
+        "name": PRODUCT["name"],
+        "user_profile": {"allergies": ["우유"]},
+        "product_data": PRODUCT,
+        "diabetes_flag": 0,
+        "hypertension_flag": 0,
+        "kidneydisease_flag": 0,
+        "allergy_flag": 1,
+        "next_step": "",
+        "final_answer": "",
+        "final_profile": {"user_id": "1", "restricted_ingredients": ["우유"]},
+        "any_exceed": False,
+        "exceeded_nutrients": [],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sync", action="store_true", help="app.invoke 로 실행 (기본은 서비스와 같은 app.ainvoke)")
+    args = parser.parse_args()
+
+    chat = _RecordingChat()
+    app = build_app(useragent=_NoopProfile(), chatagent=chat, use_async=not args.sync)
+    if args.sync:
+        final_state = app.invoke(graph_input())
+    else:
+        final_state = asyncio.run(app.ainvoke(graph_input()))
+
+    assert len(chat.calls) == 1, f"allergy LLM calls = {len(chat.calls)} (product_data 가 allergy_agent 에 전달되지 않음)"
+    prompt = json.dumps(chat.calls[0], ensure_ascii=False)
+    assert PRODUCT["allergy"] in prompt, "알러지 프롬프트에 상품 정보가 없음"
+    assert final_state.get("any_allergen") is True, f"any_allergen = {final_state.get('any_allergen')}"
+    print(f"✅ allergy_agent received product_data (llm_calls=1, allergen={final_state.get('allergen')})")
+
+
+if __name__ == "__main__":
+    main()